@@ -0,0 +1,8 @@
+from .asset_validator import AssetIssue, AssetReport, AssetValidator
+from .content_db import ContentDatabase, ContentHit
+from .content_path import ContentPath
+from .definitions import Contribution, Definition, DefinitionResolver
+from .dir_listing import DirListingCache, PathLookup
+from .filelist_check import FilelistChecker, FilelistIssue, FilelistReport
+from .overlap import ModOverlap, OverlapAnalyzer, OverlapReport
+from .vanilla_index import VanillaIndex
@@ -0,0 +1,218 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package import ModUnit
+from Code.xml_object import XMLBuilder, XMLElement
+
+from .content_path import UNKNOWN_MOD, ContentPath, Target
+from .dir_listing import FOUND, DirListingCache
+
+logger = logging.getLogger(__name__)
+
+# (reference, "file: <tag attribute>")
+_Reference = Tuple[str, str]
+# Files of a mod with their mtime and size
+_FilesKey = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass
+class AssetIssue:
+    # As written in the first place it was found
+    reference: str
+    # `dir_listing.MISSING`, `dir_listing.CASE_MISMATCH` or `UNKNOWN_MOD`
+    kind: str
+    # Where the file is on disk, for case mismatches
+    found: Optional[Path]
+    # "file: <tag attribute>" of every place the reference appears
+    sources: List[str]
+
+
+@dataclass
+class AssetReport:
+    mod_id: str
+    references: int
+    # Distinct files the references point to
+    targets: int
+    issues: List[AssetIssue]
+
+
+@dataclass
+class _Cached:
+    files: _FilesKey
+    # Directories read while checking, with their mtime
+    consulted: Dict[str, Optional[int]]
+    # `%ModDir:<mod>%` names used and the folder they resolved to
+    mod_dirs: Dict[str, Optional[str]]
+    report: AssetReport
+
+
+class AssetValidator:
+    """Finds texture, sound and other file references that point nowhere.
+
+    Every attribute of a mod's XML files whose value ends in an asset
+    extension is a reference, resolved with `ContentPath`. References are
+    deduplicated before they are looked up in `DirListingCache`. A mod's
+    report is kept until one of its XML files or one of the directories its
+    references went through changes.
+    """
+
+    ASSET_EXTENSIONS = (
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".dds",
+        ".bmp",
+        ".ogg",
+        ".wav",
+        ".webm",
+        ".mp4",
+        ".ttf",
+        ".otf",
+        ".xml",
+    )
+
+    _lock = threading.Lock()
+    _cache: Dict[str, _Cached] = {}
+
+    @classmethod
+    def validate(
+        cls, mods: List[ModUnit], installed: Optional[List[ModUnit]] = None
+    ) -> Dict[str, AssetReport]:
+        """Reports of `mods` by mod ID.
+
+        `installed` are the mods `%ModDir:<mod>%` may point to, `mods` when
+        not given.
+        """
+        game_path = ContentPath.game_path()
+        mod_dirs = ContentPath.mod_dirs(installed if installed is not None else mods)
+
+        DirListingCache.refresh()
+        reports: Dict[str, AssetReport] = {}
+        todo: List[Tuple[ModUnit, _FilesKey]] = []
+        for mod in mods:
+            files = cls._files_key(mod)
+            cached = cls._cache.get(str(mod.path))
+            if cached is not None and cls._is_valid(cached, files, mod_dirs):
+                reports[mod.id] = cached.report
+
+            else:
+                todo.append((mod, files))
+
+        tasks = [(mod, Path(path)) for mod, files in todo for path, _, _ in files]
+        with ThreadPoolExecutor() as executor:
+            parsed = list(executor.map(lambda task: cls._references(*task), tasks))
+
+        position = 0
+        for mod, files in todo:
+            references = [
+                reference
+                for file_references in parsed[position : position + len(files)]
+                for reference in file_references
+            ]
+            position += len(files)
+
+            cached = cls._check(mod, files, references, game_path, mod_dirs)
+            with cls._lock:
+                cls._cache[str(mod.path)] = cached
+
+            reports[mod.id] = cached.report
+
+        return reports
+
+    @staticmethod
+    def _files_key(mod: ModUnit) -> _FilesKey:
+        files = []
+        for path in mod.path.rglob("*.[Xx][Mm][Ll]"):
+            if path.name.lower() in AppConfig.xml_system_dirs:
+                continue
+
+            try:
+                stat = os.stat(path)
+
+            except OSError:
+                continue
+
+            files.append((str(path), stat.st_mtime_ns, stat.st_size))
+
+        return tuple(sorted(files))
+
+    @staticmethod
+    def _is_valid(cached: _Cached, files: _FilesKey, mod_dirs: Dict[str, str]) -> bool:
+        return cached.files == files and ContentPath.unchanged(
+            cached.consulted, cached.mod_dirs, mod_dirs
+        )
+
+    @classmethod
+    def _references(cls, mod: ModUnit, path: Path) -> List[_Reference]:
+        try:
+            root = XMLBuilder.load(path)
+
+        except Exception as err:
+            logger.warning(f"Error parsing file\n|Error: {err}\n|Path: {path}")
+            return []
+
+        if root is None:
+            return []
+
+        file = path.relative_to(mod.path).as_posix()
+        references = []
+        stack: List[XMLElement] = [root]
+        while stack:
+            element = stack.pop()
+            for key, value in element.attributes.items():
+                if value.lower().endswith(cls.ASSET_EXTENSIONS):
+                    references.append((value, f"{file}: <{element.tag} {key}>"))
+
+            stack.extend(reversed(list(element.iter_non_comment_childrens())))
+
+        return references
+
+    @classmethod
+    def _check(
+        cls,
+        mod: ModUnit,
+        files: _FilesKey,
+        references: List[_Reference],
+        game_path: Optional[Path],
+        mod_dirs: Dict[str, str],
+    ) -> _Cached:
+        # The same reference is usually written many times, resolve it once
+        by_value: Dict[str, List[str]] = {}
+        for value, source in references:
+            by_value.setdefault(value, []).append(source)
+
+        targets: Dict[Target, List[_Reference]] = {}
+        for value, sources in by_value.items():
+            target = ContentPath.target(value, mod.path, game_path, mod_dirs)
+            if target is not None:
+                targets.setdefault(target, []).extend(
+                    (value, source) for source in sources
+                )
+
+        consulted: Dict[str, Optional[int]] = {}
+        used_mod_dirs: Dict[str, Optional[str]] = {}
+        issues = []
+        for (base, relative, mod_name), found_at in targets.items():
+            if mod_name is not None:
+                used_mod_dirs[mod_name] = base
+
+            sources = [source for _, source in found_at]
+            if base is None:
+                issues.append(AssetIssue(found_at[0][0], UNKNOWN_MOD, None, sources))
+                continue
+
+            lookup = DirListingCache.lookup(Path(base), relative, consulted)
+            if lookup.status != FOUND:
+                issues.append(
+                    AssetIssue(found_at[0][0], lookup.status, lookup.path, sources)
+                )
+
+        issues.sort(key=lambda issue: (issue.kind, issue.reference.lower()))
+        report = AssetReport(mod.id, len(references), len(targets), issues)
+        return _Cached(files, consulted, used_mod_dirs, report)
@@ -0,0 +1,323 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package import ModUnit
+from Code.package.id_parser import extract_ids
+from Code.xml_object import XMLBuilder, XMLElement
+
+logger = logging.getLogger(__name__)
+
+# Bump when the tables or what is stored in them change
+SCHEMA_VERSION = 1
+
+# (mod id, mod name, file relative to the mod, tag, identifier, attributes,
+# words, kind)
+_Row = Tuple[str, str, str, str, str, str, str, str]
+
+
+@dataclass
+class ContentHit:
+    mod_id: str
+    mod_name: str
+    file: str
+    tag: str
+    identifier: str
+    # "key=value" pairs of `ContentDatabase.ATTRIBUTES`, space separated
+    attributes: str
+    # "add" or "override" for elements that define a content ID, else empty
+    kind: str
+
+
+class ContentDatabase:
+    """Full-text searchable elements of every mod's XML files.
+
+    Elements are stored in an SQLite FTS5 table with the mod, file, tag,
+    identifier, a few descriptive attributes and whether the element adds or
+    overrides a content ID. `update` compares the stat of every file with the
+    one stored at the last update and re-parses only what changed, the
+    database is kept in the hash folder between sessions.
+
+    `search` accepts FTS5 queries and a shorthand: `identifier="uranium"`
+    matches a column, `tags=weapon` one of the stored attributes, other
+    words are matched anywhere.
+    """
+
+    ATTRIBUTES = (
+        "tags",
+        "category",
+        "variantof",
+        "speciesname",
+        "name",
+        "nameidentifier",
+        "type",
+    )
+    COLUMNS = ("mod", "file", "tag", "identifier", "attributes", "words", "kind")
+    MAX_VALUE_LENGTH = 200
+    SEARCH_LIMIT = 500
+
+    _update_lock = threading.Lock()
+
+    @staticmethod
+    def get_database_path() -> Path:
+        return AppConfig.get_hash_path() / "content.sqlite"
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        path = cls.get_database_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=30)
+        # Searches keep working while an update writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            connection.executescript(
+                f"""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS elements;
+                CREATE TABLE files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mod_id TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE VIRTUAL TABLE elements USING fts5(
+                    mod, file, tag, identifier, attributes, words, kind,
+                    mod_id UNINDEXED, file_id UNINDEXED,
+                    tokenize="unicode61 tokenchars '=_-'"
+                );
+                PRAGMA user_version = {SCHEMA_VERSION};
+                """
+            )
+
+        return connection
+
+    @classmethod
+    def start(cls, mods: List[ModUnit]) -> None:
+        """Updates the database in the background."""
+        threading.Thread(target=cls.update, args=(list(mods),), daemon=True).start()
+
+    @classmethod
+    def update(cls, mods: List[ModUnit]) -> int:
+        """Brings the database up to date with `mods`, returns files re-parsed."""
+        with cls._update_lock:
+            start = time.perf_counter()
+            try:
+                connection = cls._connect()
+
+            except sqlite3.Error as err:
+                logger.error(f"Error opening content database\n|Error: {err}")
+                return 0
+
+            try:
+                changed = cls._update(connection, mods)
+
+            except sqlite3.Error as err:
+                logger.error(f"Error updating content database\n|Error: {err}")
+                return 0
+
+            finally:
+                connection.close()
+
+            logger.debug(
+                f"Content database updated, {changed} files re-parsed in {time.perf_counter() - start:.2f}s"
+            )
+            return changed
+
+    @classmethod
+    def _update(cls, connection: sqlite3.Connection, mods: List[ModUnit]) -> int:
+        known: Dict[str, Tuple[int, str, int, int]] = {
+            path: (file_id, mod_id, mtime_ns, size)
+            for file_id, path, mod_id, mtime_ns, size in connection.execute(
+                "SELECT id, path, mod_id, mtime_ns, size FROM files"
+            )
+        }
+
+        current: Dict[str, Tuple[ModUnit, Path, int, int]] = {}
+        for mod in mods:
+            for path in mod.path.rglob("*.[Xx][Mm][Ll]"):
+                if path.name.lower() in AppConfig.xml_system_dirs:
+                    continue
+
+                try:
+                    stat = os.stat(path)
+
+                except OSError:
+                    continue
+
+                current[str(path)] = (mod, path, stat.st_mtime_ns, stat.st_size)
+
+        def unchanged(path: str) -> bool:
+            if path not in known or path not in current:
+                return False
+
+            mod, _, mtime_ns, size = current[path]
+            return known[path][1:] == (mod.id, mtime_ns, size)
+
+        stale = [known[path][0] for path in known if not unchanged(path)]
+        todo = [entry for path, entry in current.items() if not unchanged(path)]
+
+        # Parsing runs in threads, sqlite is written from this one
+        with ThreadPoolExecutor() as executor:
+            parsed = list(
+                executor.map(lambda entry: cls._rows(entry[0], entry[1]), todo)
+            )
+
+        with connection:
+            connection.executemany(
+                "DELETE FROM elements WHERE file_id = ?", ((i,) for i in stale)
+            )
+            connection.executemany(
+                "DELETE FROM files WHERE id = ?", ((i,) for i in stale)
+            )
+            for (mod, path, mtime_ns, size), rows in zip(todo, parsed):
+                file_id = connection.execute(
+                    "INSERT INTO files (path, mod_id, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                    (str(path), mod.id, mtime_ns, size),
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO elements "
+                    "(mod_id, mod, file, tag, identifier, attributes, words, kind, "
+                    "file_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row + (file_id,) for row in rows),
+                )
+
+        return len(todo)
+
+    @classmethod
+    def _rows(cls, mod: ModUnit, path: Path) -> List[_Row]:
+        try:
+            root = XMLBuilder.load(path)
+            parsed = extract_ids(root, track_elements=True)
+
+        except Exception as err:
+            logger.warning(f"Error parsing file\n|Error: {err}\n|Path: {path}")
+            return []
+
+        if root is None:
+            return []
+
+        kinds: Dict[int, str] = {}
+        for definitions in (parsed.elements or {}).values():
+            for element, is_override in definitions:
+                kinds[id(element)] = "override" if is_override else "add"
+
+        file = path.relative_to(mod.path).as_posix()
+        rows = []
+        for element in cls._walk(root):
+            identifier = element.get_attribute_ignore_case("identifier", "")
+            pairs = [
+                (key, value.strip())
+                for key, values in cls._selected_attributes(element)
+                for value in values.split(",")
+                if value.strip()
+            ]
+            kind = kinds.get(id(element), "")
+            if identifier or pairs or kind:
+                rows.append(
+                    (
+                        mod.id,
+                        mod.name,
+                        file,
+                        element.tag,
+                        identifier[: cls.MAX_VALUE_LENGTH],
+                        " ".join(f"{key}={value}" for key, value in pairs),
+                        " ".join(value for _, value in pairs),
+                        kind,
+                    )
+                )
+
+        return rows
+
+    @classmethod
+    def _selected_attributes(cls, element: XMLElement) -> Iterator[Tuple[str, str]]:
+        for key, value in element.attributes.items():
+            key = key.lower()
+            if key in cls.ATTRIBUTES and len(value) <= cls.MAX_VALUE_LENGTH:
+                yield key, value
+
+    @staticmethod
+    def _walk(root: XMLElement) -> Iterator[XMLElement]:
+        stack = [root]
+        while stack:
+            element = stack.pop()
+            yield element
+            stack.extend(reversed(list(element.iter_non_comment_childrens())))
+
+    @classmethod
+    def to_fts_query(cls, query: str) -> str:
+        """Turns the search shorthand into an FTS5 query."""
+        terms = []
+        for token in re.findall(r'[^\s"=:()]+[=:]"[^"]*"|"[^"]*"|[()]|[^\s()]+', query):
+            match = re.fullmatch(r'([^\s"=:]+)([=:])"?([^"]*)"?', token)
+            if match:
+                key, _, value = match.groups()
+                value = value.replace('"', "")
+                if key.lower() in cls.COLUMNS:
+                    terms.append(f'{key.lower()}:"{value}"')
+
+                else:
+                    terms.append(f'attributes:"{key.lower()}={value}"')
+
+            elif token in ("AND", "OR", "NOT", "(", ")"):
+                terms.append(token)
+
+            elif token.replace('"', "").rstrip("*"):
+                word = token.replace('"', "")
+                if word.endswith("*"):
+                    terms.append(f'"{word.rstrip("*")}"*')
+
+                else:
+                    terms.append(f'"{word}"')
+
+        return " ".join(terms)
+
+    @classmethod
+    def _query(cls, sql: str, query: str, limit: int) -> List[tuple]:
+        fts_query = cls.to_fts_query(query)
+        if not fts_query:
+            return []
+
+        try:
+            connection = cls._connect()
+            try:
+                return connection.execute(sql, (fts_query, limit)).fetchall()
+
+            finally:
+                connection.close()
+
+        except sqlite3.Error as err:
+            logger.warning(f"Content search failed\n|Error: {err}\n|Query: {fts_query}")
+            return []
+
+    @classmethod
+    def search(cls, query: str, limit: Optional[int] = None) -> List[ContentHit]:
+        """Best matching elements for `query`, see the class docstring."""
+        rows = cls._query(
+            "SELECT mod_id, mod, file, tag, identifier, attributes, kind "
+            "FROM elements WHERE elements MATCH ? ORDER BY rank LIMIT ?",
+            query,
+            limit or cls.SEARCH_LIMIT,
+        )
+        return [ContentHit(*row) for row in rows]
+
+    @classmethod
+    def mods_matching(cls, query: str, limit: int = 100) -> List[Tuple[str, int]]:
+        """Mods with elements matching `query` and how many, most first."""
+        return cls._query(
+            "SELECT mod, count(*) FROM elements WHERE elements MATCH ? "
+            "GROUP BY mod_id ORDER BY count(*) DESC LIMIT ?",
+            query,
+            limit,
+        )
@@ -0,0 +1,96 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package import ModUnit
+
+from .dir_listing import DirListingCache
+
+# Lookup status of `%ModDir:<mod>%` paths to a mod that is not installed
+UNKNOWN_MOD = "unknown-mod"
+
+# (base folder, path below it, `%ModDir:<mod>%` name)
+Target = Tuple[Optional[str], str, Optional[str]]
+
+
+class ContentPath:
+    """Paths written in mod files, resolved the way the game does.
+
+    `%ModDir%` is the mod's own folder and `%ModDir:<name or Steam ID>%`
+    another installed mod's, anything else is relative to the game folder,
+    which covers `Content/...` and `LocalMods/...`.
+    """
+
+    MOD_DIR = re.compile(r"%ModDir(?::([^%]+))?%", re.IGNORECASE)
+
+    @staticmethod
+    def game_path() -> Optional[Path]:
+        if not AppConfig.get("barotrauma_dir", None):
+            return None
+
+        return AppConfig.get_game_path()
+
+    @staticmethod
+    def mod_dirs(mods: List[ModUnit]) -> Dict[str, str]:
+        """Folders of `mods` by lowercased name and by Steam ID."""
+        mod_dirs: Dict[str, str] = {}
+        for mod in mods:
+            mod_dirs[mod.name.lower()] = str(mod.path)
+            if mod.steam_id:
+                mod_dirs[mod.steam_id] = str(mod.path)
+
+        return mod_dirs
+
+    @classmethod
+    def target(
+        cls,
+        value: str,
+        mod_path: Path,
+        game_path: Optional[Path],
+        mod_dirs: Dict[str, str],
+    ) -> Optional[Target]:
+        """Where `value`, written in the mod at `mod_path`, points to.
+
+        The base folder is None for mods that are not installed. None for
+        paths that can not be checked: absolute ones, game relative ones
+        without a game folder and those with placeholders the game fills
+        in, like `[GENDER]`.
+        """
+        value = value.strip().replace("\\", "/")
+        if "[" in value:
+            return None
+
+        match = cls.MOD_DIR.match(value)
+        if match:
+            relative = value[match.end() :]
+            if match.group(1) is None:
+                return str(mod_path), relative, None
+
+            mod_name = match.group(1).lower()
+            return mod_dirs.get(mod_name), relative, mod_name
+
+        if "%" in value or game_path is None:
+            return None
+
+        if Path(value).is_absolute():
+            return None
+
+        return str(game_path), value, None
+
+    @staticmethod
+    def unchanged(
+        consulted: Dict[str, Optional[int]],
+        used_mod_dirs: Dict[str, Optional[str]],
+        mod_dirs: Dict[str, str],
+    ) -> bool:
+        """Whether lookups that read `consulted` and used `used_mod_dirs`
+        would still give the same result. Call `DirListingCache.refresh`
+        first.
+        """
+        return all(
+            mod_dirs.get(name) == path for name, path in used_mod_dirs.items()
+        ) and all(
+            DirListingCache.mtime(directory) == mtime_ns
+            for directory, mtime_ns in consulted.items()
+        )
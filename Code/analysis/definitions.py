@@ -0,0 +1,258 @@
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package import ModUnit
+from Code.package.id_parser import IDParserUnit, extract_ids
+from Code.xml_object import XMLBuilder, XMLComment, XMLElement
+
+from .vanilla_index import VanillaIndex
+
+logger = logging.getLogger(__name__)
+
+VANILLA_SOURCE = "Vanilla"
+
+
+@dataclass
+class Contribution:
+    # Mod name, `VANILLA_SOURCE` for the base game
+    source: str
+    path: Path
+    element: XMLElement
+    is_override: bool
+
+
+@dataclass
+class Definition:
+    content_id: str
+    # Final element, with the elements it is a variant of merged in
+    element: XMLElement
+    # The contribution the game uses
+    winner: Contribution
+    # Every definition of the ID, base game first, then in load order
+    contributions: List[Contribution]
+    # IDs the definition is a variant of, nearest first
+    variant_chain: List[str]
+
+    def dump(self) -> str:
+        return self.element.dump()
+
+
+def _copy(element: XMLElement) -> XMLElement:
+    copy = XMLElement(element.tag, dict(element.attributes))
+    copy.content = element.content
+    for child in element.childrens:
+        if isinstance(child, XMLComment):
+            copy.add_child(XMLComment(child.content))
+
+        else:
+            copy.add_child(_copy(child))
+
+    return copy
+
+
+def _merge_variant(base: XMLElement, variant: XMLElement) -> XMLElement:
+    """`variant` applied on top of `base`, like the game's `variantof`.
+
+    Attributes of the variant replace those of the base. Child elements are
+    paired by tag and position among the children with that tag and merged
+    the same way, unpaired children of either side are kept.
+    """
+    attributes = dict(base.attributes)
+    attributes.update(variant.attributes)
+    for key in [key for key in attributes if key.lower() == "variantof"]:
+        del attributes[key]
+
+    merged = XMLElement(variant.tag, attributes)
+    merged.content = variant.content or base.content
+
+    variant_children: Dict[str, List[XMLElement]] = {}
+    for child in variant.iter_non_comment_childrens():
+        variant_children.setdefault(child.tag.lower(), []).append(child)
+
+    used: Set[int] = set()
+    seen: Dict[str, int] = {}
+    for child in base.iter_non_comment_childrens():
+        tag = child.tag.lower()
+        position = seen.get(tag, 0)
+        seen[tag] = position + 1
+
+        candidates = variant_children.get(tag, ())
+        if position < len(candidates):
+            used.add(id(candidates[position]))
+            merged.add_child(_merge_variant(child, candidates[position]))
+
+        else:
+            merged.add_child(_copy(child))
+
+    for child in variant.iter_non_comment_childrens():
+        if id(child) not in used:
+            merged.add_child(_copy(child))
+
+    return merged
+
+
+class DefinitionResolver:
+    """Final definition of a content ID after every active mod is applied.
+
+    Loaded mods already know which IDs they add or override, so only those
+    mods are looked at, and in them only the files whose bytes mention the
+    ID are parsed, with `id_parser` tracking where each ID is defined. The
+    base game is searched the same way when `VanillaIndex` has the ID.
+    Definitions are cached per ID until the load order changes, parsed
+    files in a small LRU checked against their mtime.
+    """
+
+    MAX_PARSED_FILES = 64
+
+    _lock = threading.RLock()
+    _order_key: Optional[Tuple[str, ...]] = None
+    _definitions: Dict[str, Optional[Definition]] = {}
+    _mod_files: Dict[Path, List[Path]] = {}
+    _parsed: "OrderedDict[Path, Tuple[int, IDParserUnit]]" = OrderedDict()
+
+    @classmethod
+    def resolve(cls, content_id: str, mods: List[ModUnit]) -> Optional[Definition]:
+        """Definition of `content_id` with `mods` (in load order) active."""
+        with cls._lock:
+            order_key = tuple(mod.id for mod in mods)
+            if order_key != cls._order_key:
+                cls._order_key = order_key
+                cls._definitions.clear()
+                cls._mod_files.clear()
+
+            return cls._get(content_id, mods, set())
+
+    @classmethod
+    def _get(
+        cls, content_id: str, mods: List[ModUnit], resolving: Set[str]
+    ) -> Optional[Definition]:
+        if content_id not in cls._definitions:
+            cls._definitions[content_id] = cls._build(content_id, mods, resolving)
+
+        return cls._definitions[content_id]
+
+    @classmethod
+    def _build(
+        cls, content_id: str, mods: List[ModUnit], resolving: Set[str]
+    ) -> Optional[Definition]:
+        contributions = cls._contributions(content_id, mods)
+        if not contributions:
+            return None
+
+        # A later add of an existing ID is rejected by the game, an override
+        # replaces whatever was there
+        winner = contributions[0]
+        for contribution in contributions[1:]:
+            if contribution.is_override:
+                winner = contribution
+
+        element = winner.element
+        variant_chain = []
+        variant_of = element.get_attribute_ignore_case("variantof")
+        if variant_of:
+            prefix, _, _ = content_id.rpartition(".")
+            base_id = f"{prefix}.{variant_of}" if prefix else variant_of
+            base = None
+            if base_id in resolving:
+                logger.warning(f"Variant cycle at '{content_id}' -> '{base_id}'")
+
+            else:
+                base = cls._get(base_id, mods, resolving | {content_id})
+
+            if base is not None:
+                element = _merge_variant(base.element, element)
+                variant_chain = [base_id, *base.variant_chain]
+
+        return Definition(content_id, element, winner, contributions, variant_chain)
+
+    @classmethod
+    def _contributions(cls, content_id: str, mods: List[ModUnit]) -> List[Contribution]:
+        # IDs are "prefix.identifier", the identifier is what the files contain
+        identifier = content_id.rpartition(".")[2]
+        needle = re.compile(re.escape(identifier.encode("utf-8")), re.IGNORECASE)
+
+        contributions = []
+        vanilla_ids = VanillaIndex.get()
+        if vanilla_ids is not None and content_id in vanilla_ids:
+            game_path = AppConfig.get_game_path()
+            files = VanillaIndex.content_files(game_path) if game_path else None
+            contributions.extend(
+                cls._find(content_id, VANILLA_SOURCE, files or [], needle)
+            )
+
+        for mod in mods:
+            if content_id in mod.add_id or content_id in mod.override_id:
+                contributions.extend(
+                    cls._find(content_id, mod.name, cls._files_of(mod), needle)
+                )
+
+        return contributions
+
+    @classmethod
+    def _files_of(cls, mod: ModUnit) -> List[Path]:
+        files = cls._mod_files.get(mod.path)
+        if files is None:
+            files = sorted(
+                path
+                for path in mod.path.rglob("*.[Xx][Mm][Ll]")
+                if path.name.lower() not in AppConfig.xml_system_dirs
+            )
+            cls._mod_files[mod.path] = files
+
+        return files
+
+    @classmethod
+    def _find(
+        cls, content_id: str, source: str, files: List[Path], needle: re.Pattern
+    ) -> List[Contribution]:
+        found = []
+        for path in files:
+            try:
+                if not needle.search(path.read_bytes()):
+                    continue
+
+            except OSError as err:
+                logger.warning(f"Error reading file\n|Error: {err}\n|Path: {path}")
+                continue
+
+            parsed = cls._parse(path)
+            if parsed is None or parsed.elements is None:
+                continue
+
+            for element, is_override in parsed.elements.get(content_id, ()):
+                found.append(Contribution(source, path, element, is_override))
+
+        return found
+
+    @classmethod
+    def _parse(cls, path: Path) -> Optional[IDParserUnit]:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+
+        except OSError:
+            return None
+
+        cached = cls._parsed.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            cls._parsed.move_to_end(path)
+            return cached[1]
+
+        try:
+            parsed = extract_ids(XMLBuilder.load(path), track_elements=True)
+
+        except Exception as err:
+            logger.warning(f"Error parsing file\n|Error: {err}\n|Path: {path}")
+            return None
+
+        cls._parsed[path] = (mtime_ns, parsed)
+        while len(cls._parsed) > cls.MAX_PARSED_FILES:
+            cls._parsed.popitem(last=False)
+
+        return parsed
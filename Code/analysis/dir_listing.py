@@ -0,0 +1,132 @@
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+FOUND = "found"
+# Exists, but only with a different letter case, which breaks on Linux
+CASE_MISMATCH = "case"
+MISSING = "missing"
+
+# (mtime_ns, entry names, lowercased name -> entry name)
+_Listing = Tuple[int, FrozenSet[str], Dict[str, str]]
+
+
+@dataclass
+class PathLookup:
+    status: str
+    # Path on disk, with the letter case of the entries found
+    path: Optional[Path]
+
+
+class DirListingCache:
+    """Directory listings shared by the path checks.
+
+    Each directory is read once with `os.scandir` and looked up in memory
+    afterwards, which is much cheaper than an `exists()` per path and also
+    tells whether a path only exists with a different letter case.
+    `refresh` re-stats the cached directories and drops the ones whose
+    mtime changed, call it before a check pass rather than per lookup.
+    """
+
+    _lock = threading.Lock()
+    _listings: Dict[str, Optional[_Listing]] = {}
+
+    @classmethod
+    def refresh(cls) -> None:
+        with cls._lock:
+            directories = list(cls._listings.items())
+
+        stale = []
+        for directory, listing in directories:
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+
+            except OSError:
+                mtime_ns = None
+
+            if mtime_ns != (listing[0] if listing is not None else None):
+                stale.append(directory)
+
+        with cls._lock:
+            for directory in stale:
+                cls._listings.pop(directory, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._listings.clear()
+
+    @classmethod
+    def _listing(cls, directory: str) -> Optional[_Listing]:
+        if directory in cls._listings:
+            return cls._listings[directory]
+
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                names = frozenset(entry.name for entry in entries)
+
+        except OSError:
+            listing = None
+
+        else:
+            folded: Dict[str, str] = {}
+            for name in sorted(names):
+                folded.setdefault(name.lower(), name)
+
+            listing = (mtime_ns, names, folded)
+
+        with cls._lock:
+            cls._listings[directory] = listing
+
+        return listing
+
+    @classmethod
+    def mtime(cls, directory: str) -> Optional[int]:
+        """mtime of `directory` when it was listed, None if it is missing."""
+        listing = cls._listing(directory)
+        return listing[0] if listing is not None else None
+
+    @classmethod
+    def lookup(
+        cls,
+        base: Path,
+        relative: str,
+        consulted: Optional[Dict[str, Optional[int]]] = None,
+    ) -> PathLookup:
+        """Finds `relative` (separated by "/") below `base`.
+
+        Every directory read on the way is added to `consulted` with its
+        mtime, so a caller can tell later whether the result still holds.
+        """
+        current = str(base)
+        status = FOUND
+        for part in relative.split("/"):
+            if part in ("", "."):
+                continue
+
+            if part == "..":
+                current = os.path.dirname(current)
+                continue
+
+            listing = cls._listing(current)
+            if consulted is not None:
+                consulted[current] = listing[0] if listing is not None else None
+
+            if listing is None:
+                return PathLookup(MISSING, None)
+
+            _, names, folded = listing
+            if part not in names:
+                name = folded.get(part.lower())
+                if name is None:
+                    return PathLookup(MISSING, None)
+
+                status = CASE_MISMATCH
+                part = name
+
+            current = os.path.join(current, part)
+
+        return PathLookup(status, Path(current))
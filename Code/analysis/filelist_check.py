@@ -0,0 +1,157 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from Code.package import ModUnit
+from Code.xml_object import XMLBuilder
+
+from .content_path import UNKNOWN_MOD, ContentPath
+from .dir_listing import CASE_MISMATCH, FOUND, MISSING, DirListingCache
+
+logger = logging.getLogger(__name__)
+
+# Issue kind of a filelist.xml that is empty or can not be parsed
+INVALID = "invalid"
+
+
+@dataclass
+class FilelistIssue:
+    # Content type of the entry, like "Item" or "Text"
+    entry: str
+    path: str
+    # `dir_listing.MISSING`, `dir_listing.CASE_MISMATCH`, `UNKNOWN_MOD` or
+    # `INVALID`
+    kind: str
+    # Where the file is on disk, for case mismatches
+    found: Optional[Path]
+
+
+@dataclass
+class FilelistReport:
+    mod_id: str
+    entries: int
+    issues: List[FilelistIssue]
+
+    @property
+    def missing(self) -> List[FilelistIssue]:
+        """Issues the game refuses to load the package over."""
+        return [issue for issue in self.issues if issue.kind != CASE_MISMATCH]
+
+
+@dataclass
+class _Cached:
+    # mtime and size of filelist.xml
+    stat: Tuple[int, int]
+    # Directories read while checking, with their mtime
+    consulted: Dict[str, Optional[int]]
+    # `%ModDir:<mod>%` names used and the folder they resolved to
+    mod_dirs: Dict[str, Optional[str]]
+    report: FilelistReport
+
+
+class FilelistChecker:
+    """Checks that every file a mod's filelist.xml lists exists.
+
+    Entries are resolved with `ContentPath` and looked up in
+    `DirListingCache`, so each directory is read once however many entries
+    point into it, and a file that only exists with a different letter case
+    is told apart from a missing one. Mods are checked in parallel, a mod's
+    report is kept until its filelist.xml or a directory its entries went
+    through changes.
+    """
+
+    _lock = threading.Lock()
+    _cache: Dict[str, _Cached] = {}
+
+    @classmethod
+    def check(
+        cls, mods: List[ModUnit], installed: Optional[List[ModUnit]] = None
+    ) -> Dict[str, FilelistReport]:
+        """Reports of `mods` by mod ID.
+
+        `installed` are the mods `%ModDir:<mod>%` may point to, `mods` when
+        not given.
+        """
+        game_path = ContentPath.game_path()
+        mod_dirs = ContentPath.mod_dirs(installed if installed is not None else mods)
+
+        DirListingCache.refresh()
+        with ThreadPoolExecutor() as executor:
+            reports = list(
+                executor.map(lambda mod: cls._check(mod, game_path, mod_dirs), mods)
+            )
+
+        return {mod.id: report for mod, report in zip(mods, reports)}
+
+    @classmethod
+    def _check(
+        cls, mod: ModUnit, game_path: Optional[Path], mod_dirs: Dict[str, str]
+    ) -> FilelistReport:
+        path = mod.path / "filelist.xml"
+        try:
+            stat = os.stat(path)
+
+        except OSError:
+            return FilelistReport(
+                mod.id, 0, [FilelistIssue("contentpackage", path.name, MISSING, None)]
+            )
+
+        cached = cls._cache.get(str(mod.path))
+        if (
+            cached is not None
+            and cached.stat == (stat.st_mtime_ns, stat.st_size)
+            and ContentPath.unchanged(cached.consulted, cached.mod_dirs, mod_dirs)
+        ):
+            return cached.report
+
+        try:
+            root = XMLBuilder.load(path)
+
+        except Exception as err:
+            logger.warning(f"Error parsing file\n|Error: {err}\n|Path: {path}")
+            root = None
+
+        entries = 0
+        issues = []
+        if root is None:
+            # The game rejects the package, as it does for a missing file
+            issues.append(FilelistIssue("contentpackage", path.name, INVALID, None))
+
+        consulted: Dict[str, Optional[int]] = {}
+        used_mod_dirs: Dict[str, Optional[str]] = {}
+        # Entries commented out by toggle content are skipped by the game too
+        for entry in root.iter_non_comment_childrens() if root is not None else ():
+            file = entry.get_attribute_ignore_case("file")
+            if not file:
+                continue
+
+            entries += 1
+            target = ContentPath.target(file, mod.path, game_path, mod_dirs)
+            if target is None:
+                continue
+
+            base, relative, mod_name = target
+            if mod_name is not None:
+                used_mod_dirs[mod_name] = base
+
+            if base is None:
+                issues.append(FilelistIssue(entry.tag, file, UNKNOWN_MOD, None))
+                continue
+
+            lookup = DirListingCache.lookup(Path(base), relative, consulted)
+            if lookup.status != FOUND:
+                issues.append(
+                    FilelistIssue(entry.tag, file, lookup.status, lookup.path)
+                )
+
+        report = FilelistReport(mod.id, entries, issues)
+        with cls._lock:
+            cls._cache[str(mod.path)] = _Cached(
+                (stat.st_mtime_ns, stat.st_size), consulted, used_mod_dirs, report
+            )
+
+        return report
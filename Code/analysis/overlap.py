@@ -0,0 +1,269 @@
+import json
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain, combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from Code.package import ModUnit
+
+logger = logging.getLogger(__name__)
+
+
+def _to_bitset(indexes: Iterable[int], size: int) -> int:
+    # Setting bits one by one on an int copies it every time
+    buffer = bytearray((size + 7) // 8)
+    for index in indexes:
+        buffer[index >> 3] |= 1 << (index & 7)
+
+    return int.from_bytes(buffer, "little")
+
+
+def _bit_indexes(bits: int) -> List[int]:
+    return [index for index, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"]
+
+
+@dataclass
+class ModOverlap:
+    # In load order, `second` wins where both define the same content
+    first: ModUnit
+    second: ModUnit
+    # Content IDs both mods add or override
+    shared: int
+    # Both mods add the same ID
+    duplicate_adds: int
+    # One mod overrides an ID the other adds
+    overrides: int
+    # Both mods override the same ID
+    both_override: int
+
+
+class OverlapReport:
+    SORT_KEYS = ("shared", "duplicate_adds", "overrides", "both_override")
+
+    def __init__(
+        self,
+        mods: List[ModUnit],
+        pairs: List[ModOverlap],
+        total_ids: int,
+        shared_ids: int,
+    ) -> None:
+        self.mods = mods
+        self.pairs = pairs
+        self.total_ids = total_ids
+        # Content IDs touched by at least two mods
+        self.shared_ids = shared_ids
+
+    def sorted_by(self, key: str = "shared", reverse: bool = True) -> List[ModOverlap]:
+        if key not in self.SORT_KEYS:
+            raise ValueError(f"Unknown overlap sort key: {key}")
+
+        return sorted(
+            self.pairs,
+            key=lambda pair: (getattr(pair, key), pair.shared),
+            reverse=reverse,
+        )
+
+    def top(self, count: int, key: str = "shared") -> List[ModOverlap]:
+        return self.sorted_by(key)[:count]
+
+    @staticmethod
+    def ids(pair: ModOverlap) -> List[str]:
+        """Content IDs shared by the two mods of `pair`, sorted."""
+        first, second = pair.first, pair.second
+        return sorted(
+            (first.add_id | first.override_id) & (second.add_id | second.override_id)
+        )
+
+    def to_json(
+        self, limit: Optional[int] = None, max_ids: Optional[int] = None
+    ) -> Dict[str, Any]:
+        pairs = self.sorted_by()
+        if limit is not None:
+            pairs = pairs[:limit]
+
+        return {
+            "mods": len(self.mods),
+            "ids": self.total_ids,
+            "shared_ids": self.shared_ids,
+            "pair_count": len(self.pairs),
+            "pairs": [
+                {
+                    "first": {"id": pair.first.id, "name": pair.first.name},
+                    "second": {"id": pair.second.id, "name": pair.second.name},
+                    "shared": pair.shared,
+                    "duplicate_adds": pair.duplicate_adds,
+                    "overrides": pair.overrides,
+                    "both_override": pair.both_override,
+                    "ids": self.ids(pair)[:max_ids],
+                }
+                for pair in pairs
+            ],
+        }
+
+    def export(self, path: Path) -> bool:
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(self.to_json(), file, indent=4)
+
+        except Exception as err:
+            logger.error(f"Error writing overlap report\n|Error: {err}\n|Path: {path}")
+            return False
+
+        logger.info(f"Overlap report written\n|Path: {path}")
+        return True
+
+
+class OverlapAnalyzer:
+    """Finds which mods add or override the same content IDs.
+
+    Each ID is counted in one of two ways, depending on how many mods touch it:
+
+    - IDs touched by fewer than `DENSE_OWNERS` mods, nearly all of them, are
+      counted pair by pair from an inverted index. `Counter.update` over
+      `combinations` does the counting in C, and IDs only one mod touches
+      cost nothing.
+    - Popular IDs, such as vanilla items many mods override, get a bit each.
+      Every mod becomes bit-packed ints of its added and overridden popular
+      IDs, and each pair is one AND plus `int.bit_count` per category. For
+      these IDs counting pairs one by one would grow with the square of
+      their owners.
+
+    NumPy is not a dependency, Python ints serve as the bit vectors.
+    """
+
+    DENSE_OWNERS = 64
+
+    @staticmethod
+    def analyze(mods: List[ModUnit]) -> OverlapReport:
+        """Overlaps of `mods`, which are expected in load order."""
+        added_by: Dict[str, List[int]] = defaultdict(list)
+        overridden_by: Dict[str, List[int]] = defaultdict(list)
+        for index, mod in enumerate(mods):
+            for content_id in mod.add_id:
+                added_by[content_id].append(index)
+
+            for content_id in mod.override_id:
+                overridden_by[content_id].append(index)
+
+        # Mod indexes stay ascending, pairs always come out as (earlier, later)
+        touched_by = dict(added_by)
+        for content_id, owners in overridden_by.items():
+            adders = touched_by.get(content_id)
+            touched_by[content_id] = (
+                owners if adders is None else sorted(set(adders).union(owners))
+            )
+
+        sparse_ids = []
+        dense_ids = []
+        for content_id, owners in touched_by.items():
+            if len(owners) >= OverlapAnalyzer.DENSE_OWNERS:
+                dense_ids.append(content_id)
+
+            elif len(owners) > 1:
+                sparse_ids.append(content_id)
+
+        # One Counter call per category, the pairs are produced and counted in C
+        shared = Counter(
+            chain.from_iterable(
+                combinations(touched_by[content_id], 2) for content_id in sparse_ids
+            )
+        )
+        duplicate_adds = Counter(
+            chain.from_iterable(
+                combinations(added_by[content_id], 2)
+                for content_id in sparse_ids
+                if content_id in added_by
+            )
+        )
+        both_override = Counter(
+            chain.from_iterable(
+                combinations(overridden_by[content_id], 2)
+                for content_id in sparse_ids
+                if content_id in overridden_by
+            )
+        )
+        overrides = Counter(
+            chain.from_iterable(
+                {
+                    (min(a, b), max(a, b))
+                    for a in added_by[content_id]
+                    for b in overridden_by[content_id]
+                    if a != b
+                }
+                for content_id in sparse_ids
+                if content_id in added_by and content_id in overridden_by
+            )
+        )
+        shared_ids = len(sparse_ids) + len(dense_ids)
+
+        counts = {
+            pair: [
+                count,
+                duplicate_adds.get(pair, 0),
+                overrides.get(pair, 0),
+                both_override.get(pair, 0),
+            ]
+            for pair, count in shared.items()
+        }
+        if dense_ids:
+            OverlapAnalyzer._count_dense(
+                mods, dense_ids, touched_by, added_by, overridden_by, counts
+            )
+
+        pairs = [
+            ModOverlap(mods[first], mods[second], *pair_counts)
+            for (first, second), pair_counts in counts.items()
+        ]
+        logger.debug(
+            f"Overlap analysis: {len(mods)} mods, {len(touched_by)} IDs, "
+            f"{shared_ids} shared ({len(dense_ids)} dense), "
+            f"{len(pairs)} overlapping pairs"
+        )
+        return OverlapReport(mods, pairs, len(touched_by), shared_ids)
+
+    @staticmethod
+    def _count_dense(
+        mods: List[ModUnit],
+        dense_ids: List[str],
+        touched_by: Dict[str, List[int]],
+        added_by: Dict[str, List[int]],
+        overridden_by: Dict[str, List[int]],
+        counts: Dict[Tuple[int, int], List[int]],
+    ) -> None:
+        size = len(dense_ids)
+        adds: List[List[int]] = [[] for _ in mods]
+        overrides: List[List[int]] = [[] for _ in mods]
+        # Mods that share a dense ID with each mod, as a bitset over mod indexes
+        neighbours = [0] * len(mods)
+        for bit, content_id in enumerate(dense_ids):
+            for owner in added_by.get(content_id, ()):
+                adds[owner].append(bit)
+
+            for owner in overridden_by.get(content_id, ()):
+                overrides[owner].append(bit)
+
+            owners = touched_by[content_id]
+            owner_bits = _to_bitset(owners, len(mods))
+            for owner in owners:
+                neighbours[owner] |= owner_bits
+
+        add_bits = [_to_bitset(bits, size) for bits in adds]
+        override_bits = [_to_bitset(bits, size) for bits in overrides]
+        touched = [add | override for add, override in zip(add_bits, override_bits)]
+
+        for first, first_neighbours in enumerate(neighbours):
+            # Only later mods, every pair is visited once
+            for second in _bit_indexes(first_neighbours >> (first + 1)):
+                second += first + 1
+                pair_counts = counts.setdefault((first, second), [0, 0, 0, 0])
+                pair_counts[0] += (touched[first] & touched[second]).bit_count()
+                pair_counts[1] += (add_bits[first] & add_bits[second]).bit_count()
+                pair_counts[2] += (
+                    (override_bits[second] & add_bits[first])
+                    | (override_bits[first] & add_bits[second])
+                ).bit_count()
+                pair_counts[3] += (
+                    override_bits[first] & override_bits[second]
+                ).bit_count()
@@ -0,0 +1,217 @@
+import logging
+import os
+import re
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, FrozenSet, List, Optional, Set, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package.id_parser import extract_ids
+from Code.xml_object import XMLBuilder
+
+logger = logging.getLogger(__name__)
+
+
+class VanillaIndex:
+    """Content IDs the base game itself adds.
+
+    The `id_parser` rules are run once over every file of the Vanilla content
+    package, the result is kept in the hash folder as a zlib compressed,
+    sorted list of IDs per game version. Later sessions, and switching
+    between installs of known versions, only read that file.
+
+    `get` waits for the index, `get_nowait` is for the GUI thread and
+    returns None while it is loaded or built in the background, the ready
+    callbacks run once it is there.
+    """
+
+    PACKAGE_PATH = Path("Content") / "ContentPackages" / "Vanilla.xml"
+    # Content package entries whose files define no content IDs
+    SKIPPED_TYPES = ("text", "submarine", "outpost", "wreck", "beaconstation")
+
+    _lock = threading.Lock()
+    _key: Optional[str] = None
+    _ids: Optional[FrozenSet[str]] = None
+    # (path, mtime_ns, size) of the Vanilla.xml the key was read from
+    _key_source: Optional[Tuple[str, int, int]] = None
+    _key_of_source: Optional[str] = None
+    _ready_callbacks: List[Callable[[], None]] = []
+
+    @staticmethod
+    def _game_path() -> Optional[Path]:
+        if not AppConfig.get("barotrauma_dir", None):
+            return None
+
+        return AppConfig.get_game_path()
+
+    @classmethod
+    def get(cls) -> Optional[FrozenSet[str]]:
+        """Vanilla content IDs, None if the game or its Vanilla package is missing."""
+        game_path = cls._game_path()
+        if game_path is None:
+            return None
+
+        with cls._lock:
+            key = cls._version_key(game_path)
+            if key == cls._key:
+                return cls._ids
+
+            ids = None
+            if key is not None:
+                ids = cls._load(key)
+                if ids is None:
+                    ids = cls._build(game_path, key)
+
+            cls._key, cls._ids = key, ids
+
+        for callback in list(cls._ready_callbacks):
+            try:
+                callback()
+
+            except Exception as err:
+                logger.error(f"Error in vanilla index callback: {err}", exc_info=True)
+
+        return ids
+
+    @classmethod
+    def get_nowait(cls) -> Optional[FrozenSet[str]]:
+        """`get` without waiting: None while the index is loaded or built,
+        which is started in the background if needed.
+        """
+        game_path = cls._game_path()
+        if game_path is None:
+            return None
+
+        if not cls._lock.acquire(blocking=False):
+            return None
+
+        try:
+            if cls._version_key(game_path) == cls._key:
+                return cls._ids
+
+        finally:
+            cls._lock.release()
+
+        cls.start()
+        return None
+
+    @classmethod
+    def start(cls) -> None:
+        """Loads or builds the index in the background."""
+        threading.Thread(target=cls.get, daemon=True).start()
+
+    @classmethod
+    def add_ready_callback(cls, callback: Callable[[], None]) -> None:
+        """`callback` runs, in the loading thread, when the index changed."""
+        if callback not in cls._ready_callbacks:
+            cls._ready_callbacks.append(callback)
+
+    @classmethod
+    def _version_key(cls, game_path: Path) -> Optional[str]:
+        package_path = game_path / cls.PACKAGE_PATH
+        try:
+            stat = os.stat(package_path)
+
+        except OSError:
+            return None
+
+        # Only a changed Vanilla.xml is parsed again
+        source = (str(package_path), stat.st_mtime_ns, stat.st_size)
+        if source == cls._key_source:
+            return cls._key_of_source
+
+        package = XMLBuilder.load_header(package_path)
+        if package is None:
+            return None
+
+        version = package.attributes.get("gameversion")
+        if not version:
+            version = f"unknown-{stat.st_mtime_ns}-{stat.st_size}"
+
+        cls._key_source = source
+        cls._key_of_source = re.sub(r"[^\w.\-]", "_", version)
+        return cls._key_of_source
+
+    @staticmethod
+    def get_cache_path(key: str) -> Path:
+        return AppConfig.get_hash_path() / f"vanilla_ids_{key}.zlib"
+
+    @classmethod
+    def _load(cls, key: str) -> Optional[FrozenSet[str]]:
+        cache_path = cls.get_cache_path(key)
+        if not cache_path.exists():
+            return None
+
+        try:
+            data = zlib.decompress(cache_path.read_bytes()).decode("utf-8")
+
+        except Exception as err:
+            logger.warning(
+                f"Broken vanilla ID cache, rebuilding\n|Error: {err}\n|Path: {cache_path}"
+            )
+            return None
+
+        return frozenset(data.split("\n")) if data else frozenset()
+
+    @classmethod
+    def content_files(cls, game_path: Path) -> Optional[List[Path]]:
+        """XML files of the Vanilla package that can define content IDs."""
+        package = XMLBuilder.load(game_path / cls.PACKAGE_PATH)
+        if package is None:
+            return None
+
+        files = []
+        for entry in package.iter_non_comment_childrens():
+            file = entry.get_attribute_ignore_case("file")
+            if (
+                file
+                and entry.tag.lower() not in cls.SKIPPED_TYPES
+                and file.lower().endswith(".xml")
+            ):
+                files.append(game_path / file)
+
+        return files
+
+    @classmethod
+    def _build(cls, game_path: Path, key: str) -> Optional[FrozenSet[str]]:
+        files = cls.content_files(game_path)
+        if files is None:
+            return None
+
+        ids: Set[str] = set()
+
+        def parse(path: Path) -> None:
+            try:
+                parsed = extract_ids(XMLBuilder.load(path))
+
+            except Exception as err:
+                logger.warning(
+                    f"Error parsing vanilla file\n|Error: {err}\n|Path: {path}"
+                )
+                return
+
+            # set.update is atomic under the GIL
+            ids.update(parsed.add_id)
+            ids.update(parsed.override_id)
+
+        with ThreadPoolExecutor() as executor:
+            executor.map(parse, files)
+
+        cache_path = cls.get_cache_path(key)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(zlib.compress("\n".join(sorted(ids)).encode("utf-8")))
+            os.replace(tmp_path, cache_path)
+
+        except Exception as err:
+            logger.error(
+                f"Error writing vanilla ID cache\n|Error: {err}\n|Path: {cache_path}"
+            )
+
+        logger.info(
+            f"Vanilla content indexed, {len(ids)} IDs from {len(files)} files\n|Version: {key}"
+        )
+        return frozenset(ids)
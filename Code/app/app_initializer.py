@@ -5,6 +5,7 @@ import dearpygui.dearpygui as dpg
 from Code.app_vars import AppConfig
 from Code.dpg_tools import FontManager
 from Code.loc import Localization as loc
+from Code.profiler import StartupProfiler
 
 from .app_interface import AppInterface
 from .error_handler import ErrorHandler
@@ -13,11 +14,19 @@ from .error_handler import ErrorHandler
 class AppInitializer:
     @staticmethod
     def init():
-        AppInitializer._init_dpg()
-        AppInitializer._init_viewport()
-        AppInitializer._init_fronts()
+        with StartupProfiler.span("AppInitializer._init_dpg"):
+            AppInitializer._init_dpg()
+
+        with StartupProfiler.span("AppInitializer._init_viewport"):
+            AppInitializer._init_viewport()
+
+        with StartupProfiler.span("AppInitializer._init_fronts"):
+            AppInitializer._init_fronts()
+
         AppInitializer._init_error_handler()
-        AppInterface.initialize()
+
+        with StartupProfiler.span("AppInterface.initialize"):
+            AppInterface.initialize()
 
     @staticmethod
     def _init_dpg():
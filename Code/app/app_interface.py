@@ -1,17 +1,25 @@
 import json
 import logging
+import threading
 import webbrowser
 
 import dearpygui.dearpygui as dpg
-import requests
 
 import Code.dpg_tools as dpg_tools
+from Code.analysis import AssetValidator, ContentDatabase  # noqa: F401, for the debug console
 from Code.app_vars import AppConfig
-from Code.game import Game
+from Code.dpg_tools import LocRegistry
+from Code.game import Game, GameLauncher
 from Code.handlers import ModManager
 from Code.loc import Localization as loc
+from Code.profiler import StartupProfiler
 
+from .content_search_window import ContentSearchWindow
+from .definition_window import DefinitionWindow
+from .game_log_window import GameLogWindow
+from .log_analysis_window import LogAnalysisWindow
 from .mods_tab import ModsTab
+from .overlap_window import OverlapWindow
 from .settings_tab import SettingsTab
 
 logger = logging.getLogger(__name__)
@@ -20,10 +28,16 @@ logger = logging.getLogger(__name__)
 class AppInterface:
     @staticmethod
     def initialize():
-        AppInterface._create_viewport_menu_bar()
+        GameLogWindow.init()
+        with StartupProfiler.span("AppInterface._create_viewport_menu_bar"):
+            AppInterface._create_viewport_menu_bar()
+
         AppInterface._create_main_window()
-        SettingsTab.create()
-        ModsTab.create()
+        with StartupProfiler.span("SettingsTab.create"):
+            SettingsTab.create()
+
+        with StartupProfiler.span("ModsTab.create"):
+            ModsTab.create()
 
         dpg.set_value("main_tab_bar", "mod_tab")
 
@@ -53,22 +67,105 @@ class AppInterface:
     def _create_viewport_menu_bar():
         dpg.add_viewport_menu_bar(tag="main_view_bar")
 
-        dpg.add_menu_item(
-            label=loc.get_string("menu-bar-start-game"),
-            parent="main_view_bar",
-            callback=AppInterface.start_game,
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-start-game"),
+                parent="main_view_bar",
+                callback=AppInterface.start_game,
+            ),
+            "menu-bar-start-game",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-game-log"),
+                parent="main_view_bar",
+                callback=GameLogWindow.show,
+            ),
+            "menu-bar-game-log",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-log-analysis"),
+                parent="main_view_bar",
+                callback=LogAnalysisWindow.show,
+            ),
+            "menu-bar-log-analysis",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-overlaps"),
+                parent="main_view_bar",
+                callback=OverlapWindow.show,
+            ),
+            "menu-bar-overlaps",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-definition"),
+                parent="main_view_bar",
+                callback=DefinitionWindow.show,
+            ),
+            "menu-bar-definition",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("menu-bar-content-search"),
+                parent="main_view_bar",
+                callback=ContentSearchWindow.show,
+            ),
+            "menu-bar-content-search",
+        )
+
+        LocRegistry.bind(
+            dpg.add_menu_item(
+                label=loc.get_string("cac-window-name"),
+                parent="main_view_bar",
+                callback=AppInterface.create_cac_window,
+            ),
+            "cac-window-name",
         )
 
         dpg.add_menu_item(
-            label=loc.get_string("cac-window-name"),
             parent="main_view_bar",
-            callback=AppInterface.create_cac_window,
+            tag="version_menu_item",
+            callback=lambda: webbrowser.open(
+                "https://github.com/themanyfaceddemon/Barotrauma_Modding_Tool/releases/latest"
+            ),
+            enabled=False,
+        )
+        LocRegistry.set_func(
+            "version_menu_item",
+            lambda: (
+                loc.get_string("cur-version-latest")
+                + " "
+                + loc.get_string("base-unknown")
+            ),
+            "label",
         )
+        threading.Thread(target=AppInterface._check_latest_version, daemon=True).start()
+
+        if AppConfig.get("debug", False):
+            dpg.add_menu_item(
+                label="Console",
+                parent="main_view_bar",
+                callback=AppInterface._setup_console,
+            )
+
+    @staticmethod
+    def _check_latest_version():
+        # requests is only needed here, importing it lazily keeps startup fast
+        import requests
 
         is_latest = None
         try:
             response = requests.get(
-                "https://api.github.com/repos/themanyfaceddemon/Barotrauma_Modding_Tool/releases/latest"
+                "https://api.github.com/repos/themanyfaceddemon/Barotrauma_Modding_Tool/releases/latest",
+                timeout=10,
             )
             if response.status_code == 200:
                 latest_release = response.json()
@@ -78,29 +175,25 @@ class AppInterface:
             pass
 
         if is_latest is True:
-            label = loc.get_string("base-yes")
+            label_key = "base-yes"
 
         elif is_latest is False:
-            label = loc.get_string("base-no")
+            label_key = "base-no"
 
         else:
-            label = loc.get_string("base-unknown")
-
-        dpg.add_menu_item(
-            label=(loc.get_string("cur-version-latest") + " " + label),
-            parent="main_view_bar",
-            callback=lambda: webbrowser.open(
-                "https://github.com/themanyfaceddemon/Barotrauma_Modding_Tool/releases/latest"
-            ),
-            enabled=(is_latest is False),
-        )
-
-        if AppConfig.get("debug", False):
-            dpg.add_menu_item(
-                label="Console",
-                parent="main_view_bar",
-                callback=AppInterface._setup_console,
+            label_key = "base-unknown"
+
+        if dpg.does_item_exist("version_menu_item"):
+            LocRegistry.set_func(
+                "version_menu_item",
+                lambda: (
+                    loc.get_string("cur-version-latest")
+                    + " "
+                    + loc.get_string(label_key)
+                ),
+                "label",
             )
+            dpg.configure_item("version_menu_item", enabled=(is_latest is False))
 
     @staticmethod
     def _process_command(sender, app_data, user_data):
@@ -155,6 +248,10 @@ class AppInterface:
 
     @staticmethod
     def start_game():
+        if GameLauncher.is_running():
+            GameLogWindow.show()
+            return
+
         ModManager.save_mods()
 
         game_dir = AppConfig.get("barotrauma_dir", None)
@@ -164,12 +261,52 @@ class AppInterface:
 
         skip_intro = AppConfig.get("game_config_skip_intro", False)
         auto_install_lua = AppConfig.get("game_config_auto_lua", False)
+        progress = None
+        if auto_install_lua:
+            AppInterface._create_download_window()
+            progress = AppInterface._on_download_progress
+
         try:
-            Game.run_game(auto_install_lua, skip_intro)  # type: ignore
+            if Game.run_game(auto_install_lua, skip_intro, progress):  # type: ignore
+                GameLogWindow.show()
 
         except Exception as err:
             AppInterface.show_error(err)
 
+        finally:
+            if dpg.does_item_exist("download_window"):
+                dpg.delete_item("download_window")
+
+    @staticmethod
+    def _create_download_window():
+        if dpg.does_item_exist("download_window"):
+            dpg.delete_item("download_window")
+
+        with dpg.window(
+            label=loc.get_string("download-window-name"),
+            tag="download_window",
+            no_collapse=True,
+            no_close=True,
+            width=400,
+        ):
+            dpg.add_text(loc.get_string("download-lua-updater"))
+            dpg.add_progress_bar(tag="download_progress_bar", width=-1)
+
+    @staticmethod
+    def _on_download_progress(done: int, total):
+        if not dpg.does_item_exist("download_progress_bar"):
+            return
+
+        done_mb = done / 1024 / 1024
+        if total:
+            dpg.set_value("download_progress_bar", done / total)
+            overlay = f"{done_mb:.1f} / {total / 1024 / 1024:.1f} MB"
+
+        else:
+            overlay = f"{done_mb:.1f} MB"
+
+        dpg.configure_item("download_progress_bar", overlay=overlay)
+
     @staticmethod
     def show_error(message):
         with dpg.window(label="Error"):
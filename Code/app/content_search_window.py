@@ -0,0 +1,117 @@
+import threading
+import time
+
+import dearpygui.dearpygui as dpg
+
+from Code.analysis import ContentDatabase
+from Code.dpg_tools import LocRegistry
+from Code.handlers import ModManager
+from Code.loc import Localization as loc
+
+
+class ContentSearchWindow:
+    @classmethod
+    def show(cls) -> None:
+        if dpg.does_item_exist("content_search_window"):
+            dpg.focus_item("content_search_window")
+            return
+
+        with dpg.window(
+            label=loc.get_string("content-search-window-name"),
+            tag="content_search_window",
+            width=900,
+            height=500,
+            on_close=lambda: dpg.delete_item("content_search_window"),
+        ):
+            LocRegistry.bind("content_search_window", "content-search-window-name")
+            with dpg.group(horizontal=True):
+                dpg.add_input_text(
+                    tag="content_search_query",
+                    hint='tag:item tags=weapon identifier="uranium"',
+                    width=400,
+                    on_enter=True,
+                    callback=cls._start_search,
+                )
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("content-search"),
+                        callback=cls._start_search,
+                    ),
+                    "content-search",
+                )
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("content-search-rescan"),
+                        callback=cls._start_rescan,
+                    ),
+                    "content-search-rescan",
+                )
+
+            dpg.add_text(tag="content_search_status")
+            dpg.add_separator()
+            with dpg.table(
+                tag="content_search_table",
+                header_row=True,
+                resizable=True,
+                row_background=True,
+                borders_innerH=True,
+                borders_outerH=True,
+                scrollY=True,
+                policy=dpg.mvTable_SizingStretchProp,
+            ):
+                for key in (
+                    "content-search-column-mod",
+                    "content-search-column-file",
+                    "content-search-column-tag",
+                    "content-search-column-identifier",
+                    "content-search-column-attributes",
+                    "content-search-column-kind",
+                ):
+                    LocRegistry.bind(
+                        dpg.add_table_column(label=loc.get_string(key)), key
+                    )
+
+    @classmethod
+    def _start_search(cls) -> None:
+        query = dpg.get_value("content_search_query").strip()
+        if query:
+            threading.Thread(target=cls._search, args=(query,), daemon=True).start()
+
+    @classmethod
+    def _search(cls, query: str) -> None:
+        start = time.perf_counter()
+        hits = ContentDatabase.search(query)
+        elapsed_ms = round((time.perf_counter() - start) * 1000)
+        if not dpg.does_item_exist("content_search_window"):
+            return
+
+        LocRegistry.set(
+            "content_search_status",
+            "content-search-status",
+            count=len(hits),
+            ms=elapsed_ms,
+        )
+        dpg.delete_item("content_search_table", children_only=True, slot=1)
+        for hit in hits:
+            with dpg.table_row(parent="content_search_table"):
+                dpg.add_text(hit.mod_name)
+                dpg.add_text(hit.file)
+                dpg.add_text(hit.tag)
+                dpg.add_text(hit.identifier)
+                dpg.add_text(hit.attributes, wrap=0)
+                dpg.add_text(hit.kind)
+
+    @classmethod
+    def _start_rescan(cls) -> None:
+        LocRegistry.set("content_search_status", "content-search-scanning")
+        threading.Thread(target=cls._rescan, daemon=True).start()
+
+    @classmethod
+    def _rescan(cls) -> None:
+        changed = ContentDatabase.update(
+            ModManager.active_mods + ModManager.inactive_mods
+        )
+        if dpg.does_item_exist("content_search_window"):
+            LocRegistry.set(
+                "content_search_status", "content-search-scanned", count=changed
+            )
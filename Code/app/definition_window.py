@@ -0,0 +1,91 @@
+import threading
+
+import dearpygui.dearpygui as dpg
+
+from Code.analysis import DefinitionResolver
+from Code.dpg_tools import LocRegistry
+from Code.handlers import ModManager
+from Code.loc import Localization as loc
+
+
+class DefinitionWindow:
+    @classmethod
+    def show(cls) -> None:
+        if dpg.does_item_exist("definition_window"):
+            dpg.focus_item("definition_window")
+            return
+
+        with dpg.window(
+            label=loc.get_string("definition-window-name"),
+            tag="definition_window",
+            width=700,
+            height=500,
+            on_close=lambda: dpg.delete_item("definition_window"),
+        ):
+            LocRegistry.bind("definition_window", "definition-window-name")
+            with dpg.group(horizontal=True):
+                dpg.add_input_text(
+                    tag="definition_id",
+                    hint="item.railgun",
+                    width=300,
+                    on_enter=True,
+                    callback=cls._start_resolve,
+                )
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("definition-show"),
+                        callback=cls._start_resolve,
+                    ),
+                    "definition-show",
+                )
+
+            dpg.add_text(tag="definition_status", wrap=0)
+            dpg.add_text(tag="definition_sources", wrap=0, color=[169, 169, 169])
+            dpg.add_input_text(
+                tag="definition_text",
+                multiline=True,
+                readonly=True,
+                width=-1,
+                height=-1,
+            )
+
+    @classmethod
+    def _start_resolve(cls) -> None:
+        content_id = dpg.get_value("definition_id").strip()
+        if not content_id:
+            return
+
+        LocRegistry.set("definition_status", "definition-resolving")
+        threading.Thread(target=cls._resolve, args=(content_id,), daemon=True).start()
+
+    @classmethod
+    def _resolve(cls, content_id: str) -> None:
+        definition = DefinitionResolver.resolve(
+            content_id, list(ModManager.active_mods)
+        )
+        if not dpg.does_item_exist("definition_window"):
+            return
+
+        if definition is None:
+            LocRegistry.set("definition_status", "definition-not-found", id=content_id)
+            dpg.set_value("definition_sources", "")
+            dpg.set_value("definition_text", "")
+            return
+
+        LocRegistry.set(
+            "definition_status",
+            "definition-status",
+            id=content_id,
+            source=definition.winner.source,
+            path=str(definition.winner.path),
+        )
+        sources = [
+            f"{'override' if contribution.is_override else 'add'}: "
+            f"{contribution.source} ({contribution.path.name})"
+            for contribution in definition.contributions
+        ]
+        if definition.variant_chain:
+            sources.append("variantof: " + " -> ".join(definition.variant_chain))
+
+        dpg.set_value("definition_sources", "\n".join(sources))
+        dpg.set_value("definition_text", definition.dump())
@@ -0,0 +1,84 @@
+import time
+
+import dearpygui.dearpygui as dpg
+
+from Code.dpg_tools import LocRegistry
+from Code.game import GameLauncher
+from Code.loc import Localization as loc
+
+
+class GameLogWindow:
+    # Output can arrive line by line, the text widget is refreshed at most
+    # this often
+    REFRESH_INTERVAL = 0.25
+
+    _last_refresh: float = 0.0
+
+    @classmethod
+    def init(cls) -> None:
+        GameLauncher.add_output_callback(cls._on_output)
+        GameLauncher.add_exit_callback(cls._on_game_exit)
+
+    @classmethod
+    def show(cls) -> None:
+        if dpg.does_item_exist("game_log_window"):
+            dpg.focus_item("game_log_window")
+            cls.refresh()
+            return
+
+        with dpg.window(
+            label=loc.get_string("game-log-window-name"),
+            tag="game_log_window",
+            width=700,
+            height=400,
+            on_close=lambda: dpg.delete_item("game_log_window"),
+        ):
+            LocRegistry.bind("game_log_window", "game-log-window-name")
+            dpg.add_text(tag="game_log_state", color=(200, 200, 250))
+            dpg.add_input_text(
+                tag="game_log_text",
+                multiline=True,
+                readonly=True,
+                tracked=True,
+                track_offset=1.0,
+                width=-1,
+                height=-1,
+            )
+
+        cls.refresh()
+
+    @classmethod
+    def refresh(cls) -> None:
+        cls._last_refresh = time.perf_counter()
+        if not dpg.does_item_exist("game_log_window"):
+            return
+
+        LocRegistry.set_func("game_log_state", cls._state_text)
+        dpg.set_value(
+            "game_log_text",
+            "\n".join(
+                f"! {line}" if stream == "stderr" else line
+                for stream, line in GameLauncher.get_log()
+            ),
+        )
+
+    @staticmethod
+    def _state_text() -> str:
+        state = GameLauncher.get_state()
+        text = loc.get_string(
+            "game-log-state", state=loc.get_string(f"game-state-{state}")
+        )
+        exit_code = GameLauncher.get_exit_code()
+        if state == "exited" and exit_code is not None:
+            text += " " + loc.get_string("game-log-exit-code", code=exit_code)
+
+        return text
+
+    @classmethod
+    def _on_output(cls, _line) -> None:
+        if time.perf_counter() - cls._last_refresh >= cls.REFRESH_INTERVAL:
+            cls.refresh()
+
+    @classmethod
+    def _on_game_exit(cls, _exit_code: int) -> None:
+        cls.refresh()
@@ -0,0 +1,80 @@
+import threading
+
+import dearpygui.dearpygui as dpg
+
+from Code.dpg_tools import LocRegistry
+from Code.handlers import ModManager
+from Code.loc import Localization as loc
+from Code.logs import LogIndex
+
+
+class LogAnalysisWindow:
+    LINES_PER_MOD = 20
+
+    @classmethod
+    def show(cls) -> None:
+        if dpg.does_item_exist("log_analysis_window"):
+            dpg.focus_item("log_analysis_window")
+            return
+
+        with dpg.window(
+            label=loc.get_string("log-analysis-window-name"),
+            tag="log_analysis_window",
+            width=700,
+            height=450,
+            on_close=lambda: dpg.delete_item("log_analysis_window"),
+        ):
+            LocRegistry.bind("log_analysis_window", "log-analysis-window-name")
+            with dpg.group(horizontal=True):
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("log-analysis-refresh"),
+                        callback=cls._start_refresh,
+                    ),
+                    "log-analysis-refresh",
+                )
+                dpg.add_text(tag="log_analysis_status")
+
+            dpg.add_separator()
+            dpg.add_child_window(tag="log_analysis_results", border=False)
+
+        cls._start_refresh()
+
+    @classmethod
+    def _start_refresh(cls) -> None:
+        LocRegistry.set("log_analysis_status", "log-analysis-scanning")
+        threading.Thread(target=cls._refresh, daemon=True).start()
+
+    @classmethod
+    def _refresh(cls) -> None:
+        LogIndex.refresh()
+        referenced = LogIndex.referenced_mods(ModManager.active_mods)
+
+        if not dpg.does_item_exist("log_analysis_window"):
+            return
+
+        LocRegistry.set(
+            "log_analysis_status",
+            "log-analysis-status",
+            errors=LogIndex.hit_count(),
+            mods=len(referenced),
+        )
+
+        dpg.delete_item("log_analysis_results", children_only=True)
+        if not referenced:
+            LocRegistry.add_text("log-analysis-no-mods", parent="log_analysis_results")
+            return
+
+        for mod, hits in referenced:
+            with dpg.collapsing_header(
+                label=f"{mod.name} ({len(hits)})", parent="log_analysis_results"
+            ):
+                for hit in hits[: cls.LINES_PER_MOD]:
+                    dpg.add_text(hit.line, wrap=0, bullet=True)
+
+                if len(hits) > cls.LINES_PER_MOD:
+                    LocRegistry.set(
+                        dpg.add_text(color=[169, 169, 169]),
+                        "log-analysis-more",
+                        count=len(hits) - cls.LINES_PER_MOD,
+                    )
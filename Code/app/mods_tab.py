@@ -1,35 +1,56 @@
 import logging
+import threading
 
 import dearpygui.dearpygui as dpg
 
+from Code.analysis import AssetValidator, VanillaIndex
+from Code.analysis.content_path import UNKNOWN_MOD
+from Code.analysis.dir_listing import CASE_MISMATCH
 from Code.app_vars import AppConfig
+from Code.dpg_tools import LocRegistry
 from Code.handlers import ModManager
 from Code.loc import Localization as loc
 from Code.package import ModUnit
+from Code.profiler import StartupProfiler
 
 
 class ModsTab:
+    # Asset issues listed in the details window
+    MAX_ASSET_ISSUES = 50
+
     dragged_mod_id = None
     active_mod_search_text = ""
     inactive_mod_search_text = ""
+    # Set by the vanilla index thread, the lists are re-rendered by the GUI
+    vanilla_index_changed = False
 
     @staticmethod
     def create():
         with dpg.tab(
             label=loc.get_string("mod-tab-label"), parent="main_tab_bar", tag="mod_tab"
         ):
+            LocRegistry.bind("mod_tab", "mod-tab-label")
             with dpg.group(horizontal=True):
                 dpg.add_button(
                     label=loc.get_string("btn-sort-mods"),
                     callback=ModsTab.sort_active_mods,
                     tag="sort_button",
                 )
+                LocRegistry.bind("sort_button", "btn-sort-mods")
                 with dpg.tooltip("sort_button"):
-                    dpg.add_text(loc.get_string("btn-sort-mods-desc"))
+                    LocRegistry.bind(
+                        dpg.add_text(loc.get_string("btn-sort-mods-desc")),
+                        "btn-sort-mods-desc",
+                        "value",
+                    )
 
             with dpg.group(horizontal=True):
-                dpg.add_text(
-                    loc.get_string("label-directory-found"), color=(100, 150, 250)
+                LocRegistry.bind(
+                    dpg.add_text(
+                        loc.get_string("label-directory-found"), color=(100, 150, 250)
+                    ),
+                    "label-directory-found",
+                    "value",
                 )
                 dpg.add_text(
                     str(
@@ -38,30 +59,42 @@ class ModsTab:
                     tag="directory_status_text",
                     color=(200, 200, 250),
                 )
+                if AppConfig.get("barotrauma_dir") is None:
+                    LocRegistry.bind("directory_status_text", "base-not-set", "value")
 
             with dpg.group(horizontal=True):
-                dpg.add_text(
-                    loc.get_string("label-enable-cs-scripting"), color=(100, 150, 250)
+                LocRegistry.bind(
+                    dpg.add_text(
+                        loc.get_string("label-enable-cs-scripting"),
+                        color=(100, 150, 250),
+                    ),
+                    "label-enable-cs-scripting",
+                    "value",
                 )
                 dpg.add_text(
-                    loc.get_string("base-yes")
-                    if AppConfig.get("has_cs")
-                    else loc.get_string("base-no"),
                     tag="cs_scripting_status",
                     color=(0, 255, 0) if AppConfig.get("has_cs") else (255, 0, 0),
                 )
+                LocRegistry.set(
+                    "cs_scripting_status",
+                    "base-yes" if AppConfig.get("has_cs") else "base-no",
+                )
 
             with dpg.group(horizontal=True):
-                dpg.add_text(
-                    loc.get_string("label-lua-installed"), color=(100, 150, 250)
+                LocRegistry.bind(
+                    dpg.add_text(
+                        loc.get_string("label-lua-installed"), color=(100, 150, 250)
+                    ),
+                    "label-lua-installed",
+                    "value",
                 )
                 dpg.add_text(
-                    loc.get_string("base-yes")
-                    if AppConfig.get("has_lua")
-                    else loc.get_string("base-no"),
                     tag="lua_status",
                     color=(0, 255, 0) if AppConfig.get("has_lua") else (255, 0, 0),
                 )
+                LocRegistry.set(
+                    "lua_status", "base-yes" if AppConfig.get("has_lua") else "base-no"
+                )
 
             with dpg.group(horizontal=True):
                 dpg.add_text(loc.get_string("label-errors"), tag="error_count_text")
@@ -72,13 +105,20 @@ class ModsTab:
 
             with dpg.group(horizontal=True):
                 with dpg.group():
-                    dpg.add_text(loc.get_string("label-active-mods"))
+                    LocRegistry.bind(
+                        dpg.add_text(loc.get_string("label-active-mods")),
+                        "label-active-mods",
+                        "value",
+                    )
                     dpg.add_input_text(
                         tag="active_mod_search_tag",
                         hint=loc.get_string("input-hint-search"),
                         callback=ModsTab.on_search_changed,
                         user_data="active",
                     )
+                    LocRegistry.bind(
+                        "active_mod_search_tag", "input-hint-search", "hint"
+                    )
                     with dpg.child_window(
                         tag="active_mods_child",
                         drop_callback=ModsTab.on_mod_dropped,
@@ -88,13 +128,20 @@ class ModsTab:
                         pass
 
                 with dpg.group():
-                    dpg.add_text(loc.get_string("label-inactive-mods"))
+                    LocRegistry.bind(
+                        dpg.add_text(loc.get_string("label-inactive-mods")),
+                        "label-inactive-mods",
+                        "value",
+                    )
                     dpg.add_input_text(
                         tag="inactive_mod_search_tag",
                         hint=loc.get_string("input-hint-search"),
                         callback=ModsTab.on_search_changed,
                         user_data="inactive",
                     )
+                    LocRegistry.bind(
+                        "inactive_mod_search_tag", "input-hint-search", "hint"
+                    )
                     with dpg.child_window(
                         tag="inactive_mods_child",
                         drop_callback=ModsTab.on_mod_dropped,
@@ -103,7 +150,25 @@ class ModsTab:
                     ):
                         pass
 
-        ModsTab.render_mods()
+        with StartupProfiler.span("ModsTab.render_mods"):
+            ModsTab.render_mods()
+
+        # Override warnings name the base game once its IDs are indexed
+        VanillaIndex.add_ready_callback(ModsTab.on_vanilla_index_ready)
+
+    @staticmethod
+    def on_vanilla_index_ready():
+        # Runs in the index thread. Frame callbacks run on the same thread as
+        # every other GUI callback, so the re-render never overlaps one
+        ModsTab.vanilla_index_changed = True
+        dpg.set_frame_callback(
+            dpg.get_frame_count() + 1, ModsTab.render_if_vanilla_index_changed
+        )
+
+    @staticmethod
+    def render_if_vanilla_index_changed():
+        if ModsTab.vanilla_index_changed:
+            ModsTab.render_mods()
 
     @staticmethod
     def on_search_changed(sender, app_data, user_data):
@@ -117,6 +182,7 @@ class ModsTab:
 
     @staticmethod
     def render_mods():
+        ModsTab.vanilla_index_changed = False
         ModManager.process_errors()
         dpg.delete_item("active_mods_child", children_only=True)
         for mod in ModManager.active_mods:
@@ -124,17 +190,14 @@ class ModsTab:
                 ModsTab.add_movable_mod(mod, "active", "active_mods_child")
 
         dpg.delete_item("inactive_mods_child", children_only=True)
+        LocRegistry.prune()
         for mod in ModManager.inactive_mods:
             if ModsTab.inactive_mod_search_text in mod.name.lower():
                 ModsTab.add_movable_mod(mod, "inactive", "inactive_mods_child")
 
         error_count, warning_count = ModsTab.count_mods_with_issues()
-        dpg.set_value(
-            "error_count_text", loc.get_string("error-count", count=error_count)
-        )
-        dpg.set_value(
-            "warning_count_text", loc.get_string("warning-count", count=warning_count)
-        )
+        LocRegistry.set("error_count_text", "error-count", count=error_count)
+        LocRegistry.set("warning_count_text", "warning-count", count=warning_count)
 
     @staticmethod
     def add_movable_mod(mod: ModUnit, status: str, parent):
@@ -152,7 +215,7 @@ class ModsTab:
 
             with dpg.popup(parent=mod_name_tag):
                 with dpg.group(horizontal=True):
-                    dpg.add_text(loc.get_string("label-author"), color=[0, 102, 204])
+                    LocRegistry.add_text("label-author", color=[0, 102, 204])
                     dpg.add_text(
                         mod.metadata.author_name
                         if mod.metadata.author_name != "base-unknown"
@@ -160,7 +223,7 @@ class ModsTab:
                     )
 
                 with dpg.group(horizontal=True):
-                    dpg.add_text(loc.get_string("label-license"), color=[169, 169, 169])
+                    LocRegistry.add_text("label-license", color=[169, 169, 169])
                     dpg.add_text(
                         loc.get_string(mod.metadata.license)
                         if loc.has_string(mod.metadata.license)
@@ -169,19 +232,15 @@ class ModsTab:
                     )
 
                 with dpg.group(horizontal=True):
-                    dpg.add_text(
-                        loc.get_string("label-game-version"), color=[34, 139, 34]
-                    )
+                    LocRegistry.add_text("label-game-version", color=[34, 139, 34])
                     dpg.add_text(mod.metadata.game_version)
 
                 with dpg.group(horizontal=True):
-                    dpg.add_text(
-                        loc.get_string("label-mod-version"), color=[34, 139, 34]
-                    )
+                    LocRegistry.add_text("label-mod-version", color=[34, 139, 34])
                     dpg.add_text(mod.metadata.mod_version)
 
                 if mod.metadata.errors:
-                    dpg.add_text(loc.get_string("label-errors"), color=[255, 0, 0])
+                    LocRegistry.add_text("label-errors", color=[255, 0, 0])
                     for error in mod.metadata.errors[:3]:
                         error = (
                             loc.get_string(error) if loc.has_string(error) else error
@@ -189,14 +248,14 @@ class ModsTab:
                         dpg.add_text(error, wrap=0, bullet=True)
 
                     if len(mod.metadata.errors) > 3:
-                        dpg.add_text(
-                            loc.get_string("label-see-full-details"),
+                        LocRegistry.add_text(
+                            "label-see-full-details",
                             color=[255, 255, 0],
                             bullet=True,
                         )
 
                 if mod.metadata.warnings:
-                    dpg.add_text(loc.get_string("label-warnings"), color=[255, 255, 0])
+                    LocRegistry.add_text("label-warnings", color=[255, 255, 0])
                     for warning in mod.metadata.warnings[:3]:
                         warning = (
                             loc.get_string(warning)
@@ -206,15 +265,18 @@ class ModsTab:
                         dpg.add_text(warning, wrap=0, bullet=True)
 
                     if len(mod.metadata.warnings) > 3:
-                        dpg.add_text(
-                            loc.get_string("label-see-full-details"),
+                        LocRegistry.add_text(
+                            "label-see-full-details",
                             color=[255, 255, 0],
                             bullet=True,
                         )
 
-                dpg.add_button(
-                    label=loc.get_string("btn-show-full-details"),
-                    callback=lambda: ModsTab.show_details_window(mod),
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("btn-show-full-details"),
+                        callback=lambda: ModsTab.show_details_window(mod),
+                    ),
+                    "btn-show-full-details",
                 )
 
             with dpg.drag_payload(
@@ -248,18 +310,15 @@ class ModsTab:
             tag=window_tag,
             on_close=lambda: dpg.delete_item(window_tag),
         ):
+            LocRegistry.bind(window_tag, "label-mod-details-title", mod_name=mod.name)
             with dpg.group(horizontal=True):
                 with dpg.group():
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-mod-name"), color=[0, 102, 204]
-                        )
+                        LocRegistry.add_text("label-mod-name", color=[0, 102, 204])
                         dpg.add_text(mod.name)
 
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-author"), color=[0, 102, 204]
-                        )
+                        LocRegistry.add_text("label-author", color=[0, 102, 204])
                         dpg.add_text(
                             mod.metadata.author_name
                             if mod.metadata.author_name != "base-unknown"
@@ -267,9 +326,7 @@ class ModsTab:
                         )
 
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-license"), color=[169, 169, 169]
-                        )
+                        LocRegistry.add_text("label-license", color=[169, 169, 169])
                         dpg.add_text(
                             loc.get_string(mod.metadata.license)
                             if loc.has_string(mod.metadata.license)
@@ -278,30 +335,20 @@ class ModsTab:
                         )
 
                     with dpg.group(horizontal=True):
-                        dpg.add_text(loc.get_string("label-is-local-mod"))
-                        dpg.add_text(
-                            loc.get_string("base-yes")
-                            if mod.local
-                            else loc.get_string("base-no")
-                        )
+                        LocRegistry.add_text("label-is-local-mod")
+                        LocRegistry.add_text("base-yes" if mod.local else "base-no")
 
                 with dpg.group():
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-modloader-id"), color=[34, 139, 34]
-                        )
+                        LocRegistry.add_text("label-modloader-id", color=[34, 139, 34])
                         dpg.add_text(mod.id)
 
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-game-version"), color=[34, 139, 34]
-                        )
+                        LocRegistry.add_text("label-game-version", color=[34, 139, 34])
                         dpg.add_text(mod.metadata.game_version)
 
                     with dpg.group(horizontal=True):
-                        dpg.add_text(
-                            loc.get_string("label-mod-version"), color=[34, 139, 34]
-                        )
+                        LocRegistry.add_text("label-mod-version", color=[34, 139, 34])
                         dpg.add_text(mod.metadata.mod_version)
 
                 if AppConfig.get("debug", False):
@@ -312,14 +359,14 @@ class ModsTab:
             dpg.add_separator()
 
             if mod.metadata.errors:
-                dpg.add_text(loc.get_string("label-errors"), color=[255, 0, 0])
+                LocRegistry.add_text("label-errors", color=[255, 0, 0])
                 for error in mod.metadata.errors:
                     error = loc.get_string(error) if loc.has_string(error) else error
                     dpg.add_text(error, wrap=0, bullet=True)
                 dpg.add_separator()
 
             if mod.metadata.warnings:
-                dpg.add_text(loc.get_string("label-warnings"), color=[255, 255, 0])
+                LocRegistry.add_text("label-warnings", color=[255, 255, 0])
                 for warning in mod.metadata.warnings:
                     warning = (
                         loc.get_string(warning) if loc.has_string(warning) else warning
@@ -327,6 +374,57 @@ class ModsTab:
                     dpg.add_text(warning, wrap=0, bullet=True)
                 dpg.add_separator()
 
+            LocRegistry.add_text("label-asset-references", color=[0, 102, 204])
+            status = dpg.add_text(wrap=0)
+            LocRegistry.set(status, "asset-check-running")
+            issues = dpg.add_group()
+            threading.Thread(
+                target=ModsTab._check_assets, args=(mod, status, issues), daemon=True
+            ).start()
+
+    @staticmethod
+    def _check_assets(mod: ModUnit, status, issues) -> None:
+        report = AssetValidator.validate(
+            [mod], ModManager.active_mods + ModManager.inactive_mods
+        )[mod.id]
+        if not dpg.does_item_exist(issues):
+            return
+
+        LocRegistry.set(
+            status,
+            "asset-check-issues" if report.issues else "asset-check-ok",
+            references=report.references,
+            targets=report.targets,
+            issues=len(report.issues),
+        )
+        for issue in report.issues[: ModsTab.MAX_ASSET_ISSUES]:
+            if issue.kind == CASE_MISMATCH:
+                key, color = "asset-case-mismatch", [255, 255, 0]
+
+            elif issue.kind == UNKNOWN_MOD:
+                key, color = "asset-unknown-mod", [255, 0, 0]
+
+            else:
+                key, color = "asset-missing", [255, 0, 0]
+
+            item = dpg.add_text(wrap=0, bullet=True, color=color, parent=issues)
+            LocRegistry.set(
+                item,
+                key,
+                reference=issue.reference,
+                found=issue.found.name if issue.found else "",
+                source=issue.sources[0],
+                count=len(issue.sources),
+            )
+
+        hidden = len(report.issues) - ModsTab.MAX_ASSET_ISSUES
+        if hidden > 0:
+            LocRegistry.set(
+                dpg.add_text(color=[169, 169, 169], parent=issues),
+                "asset-more",
+                count=hidden,
+            )
+
     @staticmethod
     def on_mod_dropped(sender, app_data, user_data):
         drag_data = app_data
@@ -0,0 +1,164 @@
+import threading
+from typing import Optional
+
+import dearpygui.dearpygui as dpg
+
+from Code.analysis import OverlapAnalyzer, OverlapReport
+from Code.app_vars import AppConfig
+from Code.dpg_tools import LocRegistry
+from Code.handlers import ModManager
+from Code.loc import Localization as loc
+
+
+class OverlapWindow:
+    # Only the top pairs of the current sort are shown, the export has all
+    MAX_ROWS = 200
+    IDS_PER_TOOLTIP = 15
+    EXPORT_NAME = "overlap_report.json"
+
+    _report: Optional[OverlapReport] = None
+    _sort_key: str = "shared"
+    _descending: bool = True
+
+    @classmethod
+    def show(cls) -> None:
+        if dpg.does_item_exist("overlap_window"):
+            dpg.focus_item("overlap_window")
+            return
+
+        with dpg.window(
+            label=loc.get_string("overlap-window-name"),
+            tag="overlap_window",
+            width=800,
+            height=500,
+            on_close=cls._close,
+        ):
+            LocRegistry.bind("overlap_window", "overlap-window-name")
+            with dpg.group(horizontal=True):
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("overlap-refresh"),
+                        callback=cls._start_refresh,
+                    ),
+                    "overlap-refresh",
+                )
+                LocRegistry.bind(
+                    dpg.add_button(
+                        label=loc.get_string("overlap-export"),
+                        callback=cls._export,
+                    ),
+                    "overlap-export",
+                )
+                dpg.add_text(tag="overlap_status")
+
+            dpg.add_separator()
+            with dpg.table(
+                tag="overlap_table",
+                header_row=True,
+                sortable=True,
+                callback=cls._on_sort,
+                resizable=True,
+                row_background=True,
+                borders_innerH=True,
+                borders_outerH=True,
+                scrollY=True,
+                policy=dpg.mvTable_SizingStretchProp,
+            ):
+                for key, sort_key, no_sort in (
+                    ("overlap-column-first", None, True),
+                    ("overlap-column-second", None, True),
+                    ("overlap-column-shared", "shared", False),
+                    ("overlap-column-duplicate-adds", "duplicate_adds", False),
+                    ("overlap-column-overrides", "overrides", False),
+                    ("overlap-column-both-override", "both_override", False),
+                ):
+                    LocRegistry.bind(
+                        dpg.add_table_column(
+                            label=loc.get_string(key),
+                            user_data=sort_key,
+                            no_sort=no_sort,
+                        ),
+                        key,
+                    )
+
+        cls._start_refresh()
+
+    @classmethod
+    def _close(cls) -> None:
+        cls._report = None
+        dpg.delete_item("overlap_window")
+
+    @classmethod
+    def _start_refresh(cls) -> None:
+        LocRegistry.set("overlap_status", "overlap-analyzing")
+        threading.Thread(target=cls._refresh, daemon=True).start()
+
+    @classmethod
+    def _refresh(cls) -> None:
+        report = OverlapAnalyzer.analyze(list(ModManager.active_mods))
+        if not dpg.does_item_exist("overlap_window"):
+            return
+
+        cls._report = report
+        LocRegistry.set(
+            "overlap_status",
+            "overlap-status",
+            mods=len(report.mods),
+            ids=report.shared_ids,
+            pairs=len(report.pairs),
+        )
+        cls._render()
+
+    @classmethod
+    def _on_sort(cls, sender, sort_specs) -> None:
+        if not sort_specs:
+            return
+
+        column, direction = sort_specs[0]
+        sort_key = dpg.get_item_user_data(column)
+        if sort_key is None:
+            return
+
+        cls._sort_key = sort_key
+        cls._descending = direction < 0
+        cls._render()
+
+    @classmethod
+    def _render(cls) -> None:
+        dpg.delete_item("overlap_table", children_only=True, slot=1)
+        if cls._report is None:
+            return
+
+        pairs = cls._report.sorted_by(cls._sort_key, cls._descending)
+        for pair in pairs[: cls.MAX_ROWS]:
+            with dpg.table_row(parent="overlap_table"):
+                dpg.add_text(pair.first.name)
+                dpg.add_text(pair.second.name)
+                shared = dpg.add_text(str(pair.shared))
+                dpg.add_text(str(pair.duplicate_adds))
+                dpg.add_text(str(pair.overrides))
+                dpg.add_text(str(pair.both_override))
+
+            ids = cls._report.ids(pair)
+            with dpg.tooltip(shared):
+                for content_id in ids[: cls.IDS_PER_TOOLTIP]:
+                    dpg.add_text(content_id)
+
+                if len(ids) > cls.IDS_PER_TOOLTIP:
+                    LocRegistry.set(
+                        dpg.add_text(color=[169, 169, 169]),
+                        "overlap-more",
+                        count=len(ids) - cls.IDS_PER_TOOLTIP,
+                    )
+
+    @classmethod
+    def _export(cls) -> None:
+        if cls._report is None:
+            return
+
+        path = AppConfig.get_user_data_path() / cls.EXPORT_NAME
+        if cls._report.export(path):
+            LocRegistry.set("overlap_status", "overlap-exported", path=str(path))
+
+        else:
+            LocRegistry.set("overlap_status", "overlap-export-failed")
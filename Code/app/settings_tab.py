@@ -1,11 +1,13 @@
 import logging
 import threading
 from pathlib import Path
+from typing import List
 
 import dearpygui.dearpygui as dpg
 
 import Code.dpg_tools as dpg_tools
 from Code.app_vars import AppConfig
+from Code.dpg_tools import LocRegistry
 from Code.game import Game
 from Code.handlers import ModManager
 from Code.loc import Localization as loc
@@ -16,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 
 class SettingsTab:
+    LANGUAGES = ("eng", "rus", "ger")
+
     @classmethod
     def create(cls) -> None:
         with dpg.tab(
@@ -23,8 +27,9 @@ class SettingsTab:
             parent="main_tab_bar",
             tag="settings_tab",
         ):
-            dpg.add_text(
-                loc.get_string("label-barotrauma-path-settings"),
+            LocRegistry.bind("settings_tab", "settings-tab-label")
+            LocRegistry.add_text(
+                "label-barotrauma-path-settings",
                 color=(200, 200, 250),
                 wrap=0,
             )
@@ -35,36 +40,44 @@ class SettingsTab:
                 tag="barotrauma_input_path",
                 width=300,
             )
+            LocRegistry.bind(
+                "barotrauma_input_path", "hint-enter-barotrauma-path", "hint"
+            )
 
             with dpg.group(horizontal=True):
-                dpg.add_text(
-                    loc.get_string("label-current-path"), color=(100, 150, 250)
-                )
+                LocRegistry.add_text("label-current-path", color=(100, 150, 250))
                 dpg.add_text(
                     AppConfig.get("barotrauma_dir", loc.get_string("base-not-set")),  # type: ignore
                     tag="barotrauma_cur_path_text",
                     color=(200, 200, 250),
                 )
+                if AppConfig.get("barotrauma_dir") is None:
+                    LocRegistry.bind(
+                        "barotrauma_cur_path_text", "base-not-set", "value"
+                    )
 
             with dpg.group(horizontal=True):
-                dpg.add_text(loc.get_string("label-valid-path"), color=(100, 150, 250))
-                dpg.add_text(
-                    loc.get_string("label-not-defined"),
+                LocRegistry.add_text("label-valid-path", color=(100, 150, 250))
+                LocRegistry.add_text(
+                    "label-not-defined",
                     tag="barotrauma_cur_path_valid",
                     color=(255, 0, 0),
                 )
 
             dpg.add_separator()
-            dpg.add_button(
-                label=loc.get_string("btn-search-game-fold"),
-                callback=cls._find_game_window,
+            LocRegistry.bind(
+                dpg.add_button(
+                    label=loc.get_string("btn-search-game-fold"),
+                    callback=cls._find_game_window,
+                ),
+                "btn-search-game-fold",
             )
 
             dpg.add_separator()
             dpg.add_separator()
 
-            dpg.add_text(
-                loc.get_string("settings-app-checkboxs"),
+            LocRegistry.add_text(
+                "settings-app-checkboxs",
                 color=(200, 200, 250),
                 wrap=0,
             )
@@ -76,6 +89,9 @@ class SettingsTab:
                         default_value=AppConfig.get("game_config_auto_lua", False),  # type: ignore
                         callback=lambda s, a: AppConfig.set("game_config_auto_lua", a),
                     )
+                    LocRegistry.bind(
+                        "settings_install_lua", "setting-toggle-install-lua"
+                    )
 
                     dpg.add_checkbox(
                         label=loc.get_string("setting-toggle-skip-intro"),
@@ -85,38 +101,74 @@ class SettingsTab:
                             "game_config_skip_intro", a
                         ),
                     )
+                    LocRegistry.bind("settings_skip_intro", "setting-toggle-skip-intro")
 
                 with dpg.group():
-                    dpg.add_checkbox(
-                        label=loc.get_string("menu-toggle-experimental"),
-                        default_value=AppConfig.get("experimental", False),  # type: ignore
-                        callback=lambda s, a: AppConfig.set("experimental", a),
+                    LocRegistry.bind(
+                        dpg.add_checkbox(
+                            label=loc.get_string("menu-toggle-experimental"),
+                            default_value=AppConfig.get("experimental", False),  # type: ignore
+                            callback=lambda s, a: AppConfig.set("experimental", a),
+                        ),
+                        "menu-toggle-experimental",
                     )
             dpg.add_separator()
             dpg.add_separator()
 
-            dpg.add_text(
-                loc.get_string("settings-app-visual"),
+            LocRegistry.add_text(
+                "settings-app-visual",
                 color=(200, 200, 250),
                 wrap=0,
             )
-            loc_dict = {
-                "eng": loc.get_string("lang_code-eng"),
-                "rus": loc.get_string("lang_code-rus"),
-                "ger": loc.get_string("lang_code-ger"),
-            }
 
             dpg.add_combo(
-                items=list(loc_dict.values()),
+                items=cls._language_names(),
                 label=loc.get_string("menu-language"),
-                default_value=loc_dict[AppConfig.get("lang", "eng")],  # type: ignore
-                callback=lambda s, a: AppConfig.set(
-                    "lang", next(key for key, value in loc_dict.items() if value == a)
+                default_value=loc.get_string(
+                    f"lang_code-{AppConfig.get('lang', 'eng')}"
                 ),
+                tag="settings_language_combo",
+                callback=cls._on_language_selected,
             )
+            LocRegistry.bind("settings_language_combo", "menu-language")
 
         dpg_tools.rc_windows()
 
+    @classmethod
+    def _language_names(cls) -> List[str]:
+        return [loc.get_string(f"lang_code-{lang}") for lang in cls.LANGUAGES]
+
+    @classmethod
+    def _on_language_selected(cls, sender, app_data, user_data):
+        names = cls._language_names()
+        if app_data not in names:
+            return
+
+        lang = cls.LANGUAGES[names.index(app_data)]
+        if lang == AppConfig.get("lang", "eng"):
+            return
+
+        AppConfig.set("lang", lang)
+        threading.Thread(target=cls._switch_language, args=(lang,), daemon=True).start()
+
+    @classmethod
+    def _switch_language(cls, lang: str) -> None:
+        try:
+            loc.load_language(lang, preload=True)
+
+        except Exception as err:
+            logger.error(f"Failed to load language '{lang}': {err}")
+            return
+
+        LocRegistry.relabel()
+        dpg.set_viewport_title(loc.get_string("viewport-name"))
+        dpg.configure_item(
+            "settings_language_combo",
+            items=cls._language_names(),
+            default_value=loc.get_string(f"lang_code-{lang}"),
+        )
+        logger.debug(f"Language switched to '{lang}'")
+
     @staticmethod
     def _validate_barotrauma_path(sender, app_data, user_data):
         path = None
@@ -125,6 +177,7 @@ class SettingsTab:
 
             if path.exists() and (path / "config_player.xml").exists():
                 if dpg.does_item_exist("barotrauma_cur_path_valid"):
+                    LocRegistry.unbind("barotrauma_cur_path_valid")
                     dpg.set_value("barotrauma_cur_path_valid", "True")
                     dpg.configure_item("barotrauma_cur_path_valid", color=[0, 255, 0])
 
@@ -149,29 +202,28 @@ class SettingsTab:
             has_cs = AppConfig.get("has_cs")
             has_lua = AppConfig.get("has_lua")
 
-            dpg.set_value(
-                "cs_scripting_status",
-                loc.get_string("base-yes") if has_cs else loc.get_string("base-no"),
-            )
+            LocRegistry.set("cs_scripting_status", "base-yes" if has_cs else "base-no")
             dpg.configure_item(
                 "cs_scripting_status",
                 color=[0, 255, 0] if has_cs else [255, 0, 0],
             )
 
-            dpg.set_value(
-                "lua_status",
-                loc.get_string("base-yes") if has_lua else loc.get_string("base-no"),
-            )
+            LocRegistry.set("lua_status", "base-yes" if has_lua else "base-no")
             dpg.configure_item(
                 "lua_status", color=[0, 255, 0] if has_lua else [255, 0, 0]
             )
 
+            if AppConfig.get("barotrauma_dir") is not None:
+                LocRegistry.unbind("barotrauma_cur_path_text")
+                LocRegistry.unbind("directory_status_text")
+
             dpg.set_value("barotrauma_cur_path_text", path)
             dpg.set_value("directory_status_text", path)
 
             logging.debug(f"Path set for display: {path}")
 
         if dpg.does_item_exist("barotrauma_cur_path_valid"):
+            LocRegistry.unbind("barotrauma_cur_path_valid")
             dpg.set_value("barotrauma_cur_path_valid", "False")
             dpg.configure_item("barotrauma_cur_path_valid", color=[255, 0, 0])
         logger.error("Path validation failed and marked as invalid.")
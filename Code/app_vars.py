@@ -83,6 +83,10 @@ class AppConfig:
     def get_data_root_path(cls) -> Path:
         return cls._data_root
 
+    @classmethod
+    def get_user_data_path(cls) -> Path:
+        return cls._user_data_path
+
     @classmethod
     def get_game_path(cls) -> Optional[Path]:
         game_path = cls.user_config.get("barotrauma_dir")
@@ -158,4 +162,13 @@ class AppConfig:
         else:
             raise RuntimeError("Unknown operating system")
 
+        # Barotrauma copies subscribed items to WorkshopMods/Installed, without
+        # that folder fall back to the raw Steam workshop downloads
+        if not path_to_mod.exists():
+            from Code.steam import SteamLibrary
+
+            workshop_path = SteamLibrary.workshop_content_path()
+            if workshop_path is not None and workshop_path.exists():
+                path_to_mod = workshop_path
+
         AppConfig.set("steam_mod_dir", str(path_to_mod))
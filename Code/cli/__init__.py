@@ -0,0 +1 @@
+from .headless import HeadlessCommands
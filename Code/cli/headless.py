@@ -0,0 +1,218 @@
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from Code.analysis import OverlapAnalyzer, VanillaIndex
+from Code.app_vars import AppConfig
+from Code.handlers import ModManager
+from Code.logs import LogIndex
+from Code.package import ModUnit
+
+logger = logging.getLogger(__name__)
+
+
+class HeadlessCommands:
+    """Batch mod operations for machines without a GUI.
+
+    Every command adds a section to a JSON serializable report and the worst
+    outcome decides the process exit code, so the suite can be driven from cron
+    jobs and server scripts.
+    """
+
+    EXIT_OK = 0
+    EXIT_DIAGNOSTICS = 1
+    EXIT_SORT_FAILED = 2
+    EXIT_SETUP_FAILED = 3
+
+    COMMANDS = ("load", "sort", "diagnose", "filelists", "apply", "logs", "overlaps")
+
+    # Pairs and IDs per pair listed by the overlaps command
+    OVERLAP_PAIRS = 50
+    OVERLAP_IDS = 20
+
+    @staticmethod
+    def run(commands: List[str]) -> Tuple[int, Dict[str, Any]]:
+        report: Dict[str, Any] = {
+            "version": AppConfig.version,
+            "game_path": AppConfig.get("barotrauma_dir"),
+            "commands": {},
+        }
+        exit_code = HeadlessCommands.EXIT_OK
+
+        handlers: Dict[str, Callable[[], Tuple[int, Dict[str, Any]]]] = {
+            "load": HeadlessCommands.load,
+            "sort": HeadlessCommands.sort,
+            "diagnose": HeadlessCommands.diagnose,
+            "filelists": HeadlessCommands.filelists,
+            "apply": HeadlessCommands.apply,
+            "logs": HeadlessCommands.logs,
+            "overlaps": HeadlessCommands.overlaps,
+        }
+
+        # Every other command works on the loaded mod lists, so load always
+        # runs first. A report has one section per command, repeats are dropped
+        unique = list(dict.fromkeys(commands))
+        if len(unique) != len(commands):
+            logger.warning(f"Repeated commands are run once\n|Commands: {commands}")
+
+        commands = ["load", *(command for command in unique if command != "load")]
+
+        for command in commands:
+            start = time.perf_counter()
+            code, result = handlers[command]()
+            result["elapsed"] = round(time.perf_counter() - start, 4)
+            result["exit_code"] = code
+            report["commands"][command] = result
+            exit_code = max(exit_code, code)
+
+            if code == HeadlessCommands.EXIT_SETUP_FAILED:
+                logger.error(f"Command '{command}' failed, skipping the rest")
+                break
+
+        report["active_mods"] = [
+            HeadlessCommands._mod_info(mod) for mod in ModManager.active_mods
+        ]
+        report["exit_code"] = exit_code
+        return exit_code, report
+
+    @staticmethod
+    def load() -> Tuple[int, Dict[str, Any]]:
+        game_path = AppConfig.get_game_path()
+        if game_path is None:
+            return HeadlessCommands.EXIT_SETUP_FAILED, {"error": "Game path not set"}
+
+        if not (game_path / "config_player.xml").exists():
+            return HeadlessCommands.EXIT_SETUP_FAILED, {
+                "error": f"config_player.xml not found in {game_path}"
+            }
+
+        ModManager.load_mods()
+        ModManager.load_cslua_config()
+
+        return HeadlessCommands.EXIT_OK, {
+            "active": len(ModManager.active_mods),
+            "inactive": len(ModManager.inactive_mods),
+            "has_lua": AppConfig.get("has_lua", False),
+            "has_cs": AppConfig.get("has_cs", False),
+        }
+
+    @staticmethod
+    def sort() -> Tuple[int, Dict[str, Any]]:
+        before = [mod.id for mod in ModManager.active_mods]
+        if not ModManager.sort():
+            return HeadlessCommands.EXIT_SORT_FAILED, {
+                "error": "Unresolved conflicts, dependencies or cycles detected"
+            }
+
+        after = [mod.id for mod in ModManager.active_mods]
+        return HeadlessCommands.EXIT_OK, {
+            "changed": before != after,
+            "activated": [mod_id for mod_id in after if mod_id not in before],
+            "deactivated": [mod_id for mod_id in before if mod_id not in after],
+            "order": after,
+        }
+
+    @staticmethod
+    def diagnose() -> Tuple[int, Dict[str, Any]]:
+        # process_errors does not wait for the index, a batch run can
+        VanillaIndex.get()
+        ModManager.process_errors()
+
+        mods = {
+            mod.id: {
+                "name": mod.name,
+                "errors": list(mod.metadata.errors),
+                "warnings": list(mod.metadata.warnings),
+            }
+            for mod in ModManager.active_mods
+            if mod.metadata.errors or mod.metadata.warnings
+        }
+        error_count = sum(1 for info in mods.values() if info["errors"])
+        warning_count = sum(1 for info in mods.values() if info["warnings"])
+
+        return (
+            HeadlessCommands.EXIT_DIAGNOSTICS
+            if error_count
+            else HeadlessCommands.EXIT_OK,
+            {
+                "mods_with_errors": error_count,
+                "mods_with_warnings": warning_count,
+                "mods": mods,
+            },
+        )
+
+    @staticmethod
+    def filelists() -> Tuple[int, Dict[str, Any]]:
+        reports = ModManager.check_filelists()
+
+        mods = {
+            mod.id: {
+                "name": mod.name,
+                "entries": reports[mod.id].entries,
+                "issues": [
+                    {
+                        "entry": issue.entry,
+                        "path": issue.path,
+                        "kind": issue.kind,
+                        "found": str(issue.found) if issue.found else None,
+                    }
+                    for issue in reports[mod.id].issues
+                ],
+            }
+            for mod in ModManager.active_mods
+            if reports[mod.id].issues
+        }
+        broken = sum(1 for report in reports.values() if report.missing)
+
+        return (
+            HeadlessCommands.EXIT_DIAGNOSTICS if broken else HeadlessCommands.EXIT_OK,
+            {
+                "checked": len(reports),
+                "mods_with_missing_files": broken,
+                "mods": mods,
+            },
+        )
+
+    @staticmethod
+    def apply() -> Tuple[int, Dict[str, Any]]:
+        if not ModManager.save_mods():
+            return HeadlessCommands.EXIT_SETUP_FAILED, {
+                "error": "Failed to write config_player.xml"
+            }
+
+        return HeadlessCommands.EXIT_OK, {"written": len(ModManager.active_mods)}
+
+    @staticmethod
+    def logs() -> Tuple[int, Dict[str, Any]]:
+        new_errors = LogIndex.refresh()
+        referenced = LogIndex.referenced_mods(ModManager.active_mods)
+
+        return HeadlessCommands.EXIT_OK, {
+            "errors": LogIndex.hit_count(),
+            "new_errors": new_errors,
+            "mods": {
+                mod.id: {
+                    "name": mod.name,
+                    "hits": len(hits),
+                    "lines": [hit.line for hit in hits[:20]],
+                }
+                for mod, hits in referenced
+            },
+        }
+
+    @staticmethod
+    def overlaps() -> Tuple[int, Dict[str, Any]]:
+        report = OverlapAnalyzer.analyze(ModManager.active_mods)
+        return HeadlessCommands.EXIT_OK, report.to_json(
+            HeadlessCommands.OVERLAP_PAIRS, HeadlessCommands.OVERLAP_IDS
+        )
+
+    @staticmethod
+    def _mod_info(mod: ModUnit) -> Dict[str, Any]:
+        return {
+            "id": mod.id,
+            "name": mod.name,
+            "load_order": mod.load_order,
+            "path": mod.get_str_path(),
+            "local": mod.local,
+        }
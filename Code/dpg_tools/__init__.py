@@ -1,2 +1,3 @@
 from .center_win import rc_windows
 from .fonts_setup import FontManager
+from .loc_registry import LocRegistry
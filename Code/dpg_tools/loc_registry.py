@@ -0,0 +1,73 @@
+from functools import partial
+from typing import Any, Callable, Dict, Tuple, Union
+
+import dearpygui.dearpygui as dpg
+
+from Code.loc import Localization as loc
+
+Item = Union[int, str]
+
+
+class LocRegistry:
+    """Remembers which widget field was filled from which localization key.
+
+    After a language switch `relabel` re-renders only those fields instead of
+    rebuilding the widgets. Entries of deleted widgets are dropped by `prune`
+    (called when mod lists are re-rendered) or lazily by `relabel`.
+    """
+
+    _items: Dict[Item, Tuple[str, Callable[[], str]]] = {}
+
+    @classmethod
+    def bind(cls, item: Item, key: str, field: str = "label", **kwargs: Any) -> Item:
+        cls._items[item] = (field, partial(loc.get_string, key, **kwargs))
+        return item
+
+    @classmethod
+    def bind_func(
+        cls, item: Item, func: Callable[[], str], field: str = "label"
+    ) -> Item:
+        cls._items[item] = (field, func)
+        return item
+
+    @classmethod
+    def set(cls, item: Item, key: str, field: str = "value", **kwargs: Any) -> None:
+        cls.bind(item, key, field, **kwargs)
+        cls._apply(item, field, cls._items[item][1])
+
+    @classmethod
+    def set_func(
+        cls, item: Item, func: Callable[[], str], field: str = "value"
+    ) -> None:
+        cls.bind_func(item, func, field)
+        cls._apply(item, field, func)
+
+    @classmethod
+    def unbind(cls, item: Item) -> None:
+        cls._items.pop(item, None)
+
+    @classmethod
+    def add_text(cls, key: str, **kwargs: Any) -> Item:
+        return cls.bind(dpg.add_text(loc.get_string(key), **kwargs), key, "value")
+
+    @staticmethod
+    def _apply(item: Item, field: str, func: Callable[[], str]) -> None:
+        if field == "value":
+            dpg.set_value(item, func())
+
+        else:
+            dpg.configure_item(item, **{field: func()})
+
+    @classmethod
+    def prune(cls) -> None:
+        for item in [item for item in cls._items if not dpg.does_item_exist(item)]:
+            del cls._items[item]
+
+    @classmethod
+    def relabel(cls) -> None:
+        for item, (field, func) in list(cls._items.items()):
+            if not dpg.does_item_exist(item):
+                cls._items.pop(item, None)
+                continue
+
+            cls._apply(item, field, func)
@@ -1 +1,5 @@
+from .discovery import GameDiscovery
+from .downloader import Downloader, DownloadResult
 from .game import Game
+from .launcher import GameLauncher
+from .lua_state import LuaInstallState
@@ -0,0 +1,314 @@
+import logging
+import os
+import platform
+import string
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Iterable, List, Optional, Set
+
+from Code.app_vars import AppConfig
+from Code.steam import SteamLibrary
+
+from .executable import executable_name
+
+logger = logging.getLogger(__name__)
+
+
+class GameDiscovery:
+    """Finds Barotrauma installations.
+
+    Sources are tried from cheapest to most expensive: previously found paths,
+    known Steam library folders and finally a bounded parallel walk of every
+    drive / mount point. A candidate is only accepted when its executable
+    exists, which costs a single stat.
+    """
+
+    GAME_DIR_NAME = "barotrauma"
+    CACHE_KEY = "game_discovery_cache"
+
+    _IGNORED_DIRECTORIES = {
+        "appdata",
+        "temp",
+        "cache",
+        "logs",
+        "backup",
+        "bin",
+        "obj",
+        "history",
+        "httpcache",
+        "venv",
+        "tmp",
+        "programdata",
+        "node_modules",
+        "site-packages",
+        "__pycache__",
+    }
+
+    # Below these folders only the next part of a Steam library path is walked
+    _EXPECTED_STRUCTURE = {
+        ".steam": "steam",
+        "steam": "steamapps",
+        "steamapps": "common",
+        "common": GAME_DIR_NAME,
+    }
+
+    _LINUX_SYSTEM_DIRS = {
+        "/usr",
+        "/etc",
+        "/bin",
+        "/sys",
+        "/sbin",
+        "/proc",
+        "/dev",
+        "/run",
+        "/tmp",
+        "/var",
+        "/boot",
+        "/lib",
+        "/lib64",
+        "/opt",
+        "/lost+found",
+        "/snap",
+        "/srv",
+    }
+
+    @staticmethod
+    def find_games(time_budget: float = 60.0) -> List[Path]:
+        found = GameDiscovery._unique(
+            GameDiscovery._from_cache() + GameDiscovery._from_steam_libraries()
+        )
+        if not found:
+            found = GameDiscovery._walk_drives(time_budget)
+
+        if found:
+            GameDiscovery._remember(found)
+
+        return found
+
+    @staticmethod
+    def is_game_dir(path: Path) -> bool:
+        return (path / executable_name()).is_file()
+
+    @staticmethod
+    def _unique(paths: Iterable[Path]) -> List[Path]:
+        seen: Set[str] = set()
+        result = []
+        for path in paths:
+            key = os.path.normcase(os.path.realpath(path))
+            if key not in seen:
+                seen.add(key)
+                result.append(path)
+
+        return result
+
+    @staticmethod
+    def _from_cache() -> List[Path]:
+        cached = AppConfig.get(GameDiscovery.CACHE_KEY, []) or []
+        return [
+            Path(path)
+            for path in cached  # type: ignore
+            if GameDiscovery.is_game_dir(Path(path))
+        ]
+
+    @staticmethod
+    def _remember(paths: List[Path]) -> None:
+        cached = [str(path) for path in paths]
+        for path in AppConfig.get(GameDiscovery.CACHE_KEY, []) or []:  # type: ignore
+            if path not in cached:
+                cached.append(path)
+
+        AppConfig.set(GameDiscovery.CACHE_KEY, cached[:10])
+
+    @staticmethod
+    def _from_steam_libraries() -> List[Path]:
+        candidates = [SteamLibrary.game_path()] + [
+            library / "steamapps" / "common" / "Barotrauma"
+            for library in SteamLibrary.library_folders()
+        ]
+
+        found = []
+        for candidate in GameDiscovery._unique(filter(None, candidates)):
+            if GameDiscovery.is_game_dir(candidate):
+                logger.debug(f"Game found in Steam library: {candidate}")
+                found.append(candidate)
+
+        return found
+
+    @staticmethod
+    def drive_roots() -> List[Path]:
+        system = platform.system()
+        if system == "Windows":
+            return [
+                Path(f"{drive}:\\")
+                for drive in string.ascii_uppercase
+                if os.path.exists(f"{drive}:\\") and os.access(f"{drive}:\\", os.R_OK)
+            ]
+
+        mount_parents = (
+            ["/Volumes"] if system == "Darwin" else ["/mnt", "/media", "/run/media"]
+        )
+        roots = [Path.home()]
+        for parent in mount_parents:
+            try:
+                with os.scandir(parent) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            roots.append(Path(entry.path))
+
+            except OSError:
+                continue
+
+        return roots
+
+    @staticmethod
+    def _walk_drives(time_budget: float) -> List[Path]:
+        roots = GameDiscovery.drive_roots()
+        logger.debug(f"Found drives: {len(roots)}")
+
+        start_time = time.perf_counter()
+        walker = _WorkStealingWalker(roots, start_time + time_budget)
+        found = walker.run()
+        logger.debug(
+            f"Total time taken: {time.perf_counter() - start_time:.2f} seconds"
+            f" | Directories: {walker.visited} | Timed out: {walker.timed_out}"
+        )
+
+        return GameDiscovery._unique(found)
+
+    @staticmethod
+    def is_system_directory(path: str) -> bool:
+        if platform.system() == "Windows":
+            lowered = path.lower().rstrip("\\")
+            return lowered in (
+                "c:\\windows",
+                "c:\\program files",
+                "c:\\program files (x86)",
+            ) or lowered.startswith("c:\\windows\\")
+
+        return path in GameDiscovery._LINUX_SYSTEM_DIRS
+
+    @staticmethod
+    def should_ignore_directory(name: str, parent_name: str) -> bool:
+        name_lower = name.lower()
+
+        if name_lower != ".steam" and (
+            name_lower.startswith((".", "_", "$", "~"))
+            or name_lower in GameDiscovery._IGNORED_DIRECTORIES
+        ):
+            return True
+
+        expected_entry = GameDiscovery._EXPECTED_STRUCTURE.get(parent_name.lower())
+        return expected_entry is not None and name_lower != expected_entry
+
+
+class _WorkStealingWalker:
+    """Parallel directory walk with one deque per worker.
+
+    Workers take directories from the end of their own deque (depth first,
+    good locality) and steal from the front of other deques when they run out,
+    which hands over the oldest and usually largest subtrees.
+    """
+
+    def __init__(self, roots: List[Path], deadline: float, workers: int = 0) -> None:
+        self._workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self._deques: List[Deque[str]] = [deque() for _ in range(self._workers)]
+        self._locks = [threading.Lock() for _ in range(self._workers)]
+        self._pending_lock = threading.Lock()
+        self._pending = len(roots)
+        self._deadline = deadline
+        self._found: List[Path] = []
+        self._found_lock = threading.Lock()
+        self.visited = 0
+        self.timed_out = False
+
+        for index, root in enumerate(roots):
+            self._deques[index % self._workers].append(str(root))
+
+    def run(self) -> List[Path]:
+        threads = [
+            threading.Thread(
+                target=self._work, args=(index,), name=f"game-search-{index}"
+            )
+            for index in range(self._workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return self._found
+
+    def _take(self, index: int) -> Optional[str]:
+        with self._locks[index]:
+            if self._deques[index]:
+                return self._deques[index].pop()
+
+        for offset in range(1, self._workers):
+            victim = (index + offset) % self._workers
+            with self._locks[victim]:
+                if self._deques[victim]:
+                    return self._deques[victim].popleft()
+
+        return None
+
+    def _work(self, index: int) -> None:
+        while True:
+            if time.perf_counter() > self._deadline:
+                self.timed_out = True
+                return
+
+            path = self._take(index)
+            if path is None:
+                with self._pending_lock:
+                    if self._pending == 0:
+                        return
+
+                time.sleep(0.001)
+                continue
+
+            children = self._scan(path)
+            if children:
+                with self._locks[index]:
+                    self._deques[index].extend(children)
+
+            with self._pending_lock:
+                self._pending += len(children) - 1
+                self.visited += 1
+
+    def _scan(self, path: str) -> List[str]:
+        if GameDiscovery.is_system_directory(path):
+            return []
+
+        parent_name = os.path.basename(path.rstrip("\\/"))
+        children = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Uses the type from the directory listing, no extra stat
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+
+                    if GameDiscovery.should_ignore_directory(entry.name, parent_name):
+                        continue
+
+                    if entry.name.lower() == GameDiscovery.GAME_DIR_NAME:
+                        candidate = Path(entry.path)
+                        if GameDiscovery.is_game_dir(candidate):
+                            logger.debug(f"Match found: {candidate}")
+                            with self._found_lock:
+                                self._found.append(candidate)
+
+                        continue
+
+                    children.append(entry.path)
+
+        except PermissionError:
+            logger.debug(f"Access to directory {path} denied")
+
+        except OSError as err:
+            logger.debug(f"Error processing directory {path}: {err}")
+
+        return children
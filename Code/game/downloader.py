@@ -0,0 +1,328 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, Optional
+
+from Code.app_vars import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Called with (downloaded bytes, total bytes or None when unknown)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+@dataclass
+class DownloadResult:
+    path: Path
+    status: Literal["downloaded", "not_modified", "failed"]
+    size: int = 0
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+class Downloader:
+    """HTTP downloads that survive restarts and skip unchanged files.
+
+    Validators (ETag / Last-Modified), size and SHA-256 of every finished file
+    are kept in a sidecar JSON under the hash folder. An unchanged remote file
+    is answered with 304 and not downloaded again. Data is written to a `.part`
+    file which is resumed with a Range request after a broken connection and
+    moved over the target only when complete. A 416, or a 206 that does not
+    start where the part file ends, restarts the download from zero.
+    """
+
+    MIN_CHUNK = 64 * 1024
+    MAX_CHUNK = 4 * 1024 * 1024
+    # Chunk size is adapted so one chunk takes roughly this long to arrive
+    TARGET_CHUNK_TIME = 0.25
+
+    TIMEOUT = (10, 30)
+    RETRIES = 3
+
+    @staticmethod
+    def get_meta_path(url: str) -> Path:
+        name = hashlib.sha1(url.encode()).hexdigest()
+        return AppConfig.get_hash_path() / "downloads" / f"{name}.json"
+
+    @staticmethod
+    def _load_meta(url: str) -> Dict[str, Any]:
+        meta_path = Downloader.get_meta_path(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+
+            return meta if meta.get("url") == url else {}
+
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_meta(url: str, meta: Dict[str, Any]) -> None:
+        meta_path = Downloader.get_meta_path(url)
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = meta_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"url": url, **meta}, file, indent=4, sort_keys=True)
+
+            os.replace(tmp_path, meta_path)
+
+        except OSError as err:
+            logger.warning(
+                f"Failed to save download metadata: {err}\n|Path: {meta_path}"
+            )
+
+    @staticmethod
+    def _is_unchanged(path: Path, meta: Dict[str, Any]) -> bool:
+        """True when the file on disk is still the one described by `meta`."""
+        finished = meta.get("file")
+        if not finished:
+            return False
+
+        try:
+            stat = path.stat()
+
+        except OSError:
+            return False
+
+        return stat.st_size == finished.get(
+            "size"
+        ) and stat.st_mtime_ns == finished.get("mtime_ns")
+
+    @staticmethod
+    def download(
+        url: str,
+        path: Path,
+        progress: Optional[ProgressCallback] = None,
+        force: bool = False,
+    ) -> DownloadResult:
+        import requests
+
+        meta = Downloader._load_meta(url)
+        part_path = path.with_name(path.name + ".part")
+
+        for attempt in range(1, Downloader.RETRIES + 1):
+            try:
+                return Downloader._download_once(
+                    url, path, part_path, meta, progress, force
+                )
+
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as err:
+                logger.warning(
+                    f"Download interrupted ({attempt}/{Downloader.RETRIES}): {err}\n|Url: {url}"
+                )
+                # Keep validators of the partial file, so the next attempt resumes it
+                meta = Downloader._load_meta(url)
+                if attempt < Downloader.RETRIES:
+                    time.sleep(min(2**attempt, 10))
+
+            except requests.RequestException as err:
+                logger.error(f"Network error while downloading: {err}\n|Url: {url}")
+                return DownloadResult(path, "failed", error=str(err))
+
+            except OSError as err:
+                logger.error(f"Error writing download: {err}\n|Path: {path}")
+                return DownloadResult(path, "failed", error=str(err))
+
+        return DownloadResult(path, "failed", error="Too many interrupted attempts")
+
+    @staticmethod
+    def _download_once(
+        url: str,
+        path: Path,
+        part_path: Path,
+        meta: Dict[str, Any],
+        progress: Optional[ProgressCallback],
+        force: bool,
+    ) -> DownloadResult:
+        import requests
+
+        # Byte counts, the hash and Range offsets all refer to the bytes on
+        # the wire, which are only the file's bytes without content encoding
+        headers: Dict[str, str] = {"Accept-Encoding": "identity"}
+        finished = meta.get("file") or {}
+        if not force and Downloader._is_unchanged(path, meta):
+            if finished.get("etag"):
+                headers["If-None-Match"] = finished["etag"]
+
+            if finished.get("last_modified"):
+                headers["If-Modified-Since"] = finished["last_modified"]
+
+        partial = meta.get("part") or {}
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        validator = partial.get("etag") or partial.get("last_modified")
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            # Server sends the whole file instead if it changed since
+            headers["If-Range"] = validator
+
+        else:
+            offset = 0
+
+        with requests.get(
+            url, headers=headers, stream=True, timeout=Downloader.TIMEOUT
+        ) as response:
+            if response.status_code == 304:
+                logger.debug(f"Not modified, download skipped\n|Url: {url}")
+                return DownloadResult(
+                    path,
+                    "not_modified",
+                    finished.get("size", 0),
+                    finished.get("sha256"),
+                )
+
+            content_range = response.headers.get("Content-Range")
+            if response.status_code == 416 or (
+                response.status_code == 206
+                and Downloader._range_start(content_range) != offset
+            ):
+                if "Range" not in headers:
+                    logger.error(
+                        f"Unexpected {response.status_code} response without a Range request\n|Url: {url}"
+                    )
+                    return DownloadResult(
+                        path,
+                        "failed",
+                        error=f"Unexpected {response.status_code} response",
+                    )
+
+                # The part file is invalid for the current remote file, or the
+                # server sent another range than the one asked for
+                logger.debug(
+                    f"Part file dropped, downloading from the start\n"
+                    f"|Status: {response.status_code}\n|Range: {content_range}\n|Url: {url}"
+                )
+                part_path.unlink(missing_ok=True)
+                Downloader._save_meta(url, {"file": finished})
+                return Downloader._download_once(
+                    url, path, part_path, {"file": finished}, progress, force
+                )
+
+            response.raise_for_status()
+
+            encoding = response.headers.get("Content-Encoding", "identity").lower()
+            if encoding != "identity":
+                logger.error(
+                    f"Server ignored Accept-Encoding: identity ({encoding})\n|Url: {url}"
+                )
+                return DownloadResult(
+                    path, "failed", error=f"Unexpected content encoding: {encoding}"
+                )
+
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            resumed = response.status_code == 206 and offset > 0
+            if not resumed:
+                offset = 0
+
+            length = response.headers.get("Content-Length")
+            total = offset + int(length) if length and length.isdigit() else None
+
+            sha256 = hashlib.sha256()
+            if resumed:
+                with open(part_path, "rb") as file:
+                    for block in iter(lambda: file.read(Downloader.MAX_CHUNK), b""):
+                        sha256.update(block)
+
+                logger.debug(f"Resuming download at {offset} bytes\n|Url: {url}")
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            Downloader._save_meta(
+                url,
+                {
+                    "file": finished,
+                    "part": {"etag": etag, "last_modified": last_modified},
+                },
+            )
+
+            downloaded = offset
+            if progress is not None:
+                progress(downloaded, total)
+
+            with open(part_path, "ab" if resumed else "wb") as file:
+                for chunk in Downloader._iter_adaptive(response):
+                    file.write(chunk)
+                    sha256.update(chunk)
+                    downloaded += len(chunk)
+                    if progress is not None:
+                        progress(downloaded, total)
+
+                file.flush()
+                os.fsync(file.fileno())
+
+        if total is not None and downloaded != total:
+            raise requests.exceptions.ChunkedEncodingError(
+                f"Incomplete download: {downloaded} of {total} bytes"
+            )
+
+        os.replace(part_path, path)
+        stat = path.stat()
+        digest = sha256.hexdigest()
+        Downloader._save_meta(
+            url,
+            {
+                "file": {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "sha256": digest,
+                }
+            },
+        )
+        logger.debug(f"Downloaded {downloaded} bytes\n|Path: {path}")
+        return DownloadResult(path, "downloaded", downloaded, digest)
+
+    @staticmethod
+    def _range_start(content_range: Optional[str]) -> Optional[int]:
+        """First byte of a `Content-Range: bytes <start>-<end>/<size>` header."""
+        if not content_range:
+            return None
+
+        unit, _, byte_range = content_range.strip().partition(" ")
+        start = byte_range.split("-", 1)[0]
+        if unit.lower() != "bytes" or not start.isdigit():
+            return None
+
+        return int(start)
+
+    @staticmethod
+    def _iter_adaptive(response):
+        """Reads the body with a chunk size that follows the connection speed."""
+        import requests
+        from urllib3.exceptions import HTTPError
+
+        chunk_size = Downloader.MIN_CHUNK
+        raw = response.raw
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = raw.read(chunk_size, decode_content=False)
+
+            except HTTPError as err:
+                # Same exception type as requests' own iter_content would raise
+                raise requests.ConnectionError(err) from err
+
+            if not chunk:
+                return
+
+            yield chunk
+
+            elapsed = time.perf_counter() - start
+            if elapsed < Downloader.TARGET_CHUNK_TIME / 2:
+                chunk_size = min(chunk_size * 2, Downloader.MAX_CHUNK)
+
+            elif elapsed > Downloader.TARGET_CHUNK_TIME * 2:
+                chunk_size = max(chunk_size // 2, Downloader.MIN_CHUNK)
@@ -0,0 +1,16 @@
+import platform
+
+# Game executable relative to the game folder, by `platform.system()`
+EXECUTABLES = {
+    "Windows": "Barotrauma.exe",
+    "Darwin": "Barotrauma.app/Contents/MacOS/Barotrauma",
+    "Linux": "Barotrauma",
+}
+
+
+def executable_name() -> str:
+    exec_file = EXECUTABLES.get(platform.system())
+    if exec_file is None:
+        raise RuntimeError("Unknown operating system")
+
+    return exec_file
@@ -0,0 +1,176 @@
+import logging
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Callable, Deque, List, Literal, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+GameState = Literal["idle", "running", "exited", "failed"]
+# (stream name, line without the trailing newline)
+LogLine = Tuple[str, str]
+
+
+class GameLauncher:
+    """Runs the game in the background and keeps its console output.
+
+    stdout and stderr are read by two threads into a ring buffer of the last
+    `LOG_LINES` lines, a third thread waits for the process and then calls the
+    exit callbacks with the exit code.
+    """
+
+    LOG_LINES = 5000
+
+    _process: Optional[subprocess.Popen] = None
+    _state: GameState = "idle"
+    _exit_code: Optional[int] = None
+    _started_at: Optional[float] = None
+
+    _log: Deque[LogLine] = deque(maxlen=LOG_LINES)
+    _lock = threading.Lock()
+    _finished = threading.Event()
+
+    _exit_callbacks: List[Callable[[int], None]] = []
+    _output_callbacks: List[Callable[[LogLine], None]] = []
+
+    @classmethod
+    def launch(cls, args: List[str], cwd: Path) -> bool:
+        with cls._lock:
+            if cls._state == "running":
+                logger.warning("The game is already running")
+                return False
+
+            try:
+                process = subprocess.Popen(
+                    args,
+                    cwd=str(cwd),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    stdin=subprocess.DEVNULL,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    bufsize=1,
+                )
+
+            except OSError as err:
+                logger.error(f"Error running the game: {err}\n|Path: {args[0]}")
+                cls._state = "failed"
+                cls._exit_code = None
+                return False
+
+            cls._process = process
+            cls._state = "running"
+            cls._exit_code = None
+            cls._started_at = time.time()
+            cls._log.clear()
+            cls._finished.clear()
+
+        readers = [
+            threading.Thread(
+                target=cls._read_stream,
+                args=(process.stdout, "stdout"),
+                name="game-stdout",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=cls._read_stream,
+                args=(process.stderr, "stderr"),
+                name="game-stderr",
+                daemon=True,
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        threading.Thread(
+            target=cls._watch,
+            args=(process, readers),
+            name="game-watch",
+            daemon=True,
+        ).start()
+
+        logger.info(f"Game started, pid {process.pid}")
+        return True
+
+    @classmethod
+    def _read_stream(cls, stream: Optional[IO[str]], name: str) -> None:
+        if stream is None:
+            return
+
+        with stream:
+            for line in stream:
+                entry = (name, line.rstrip("\r\n"))
+                cls._log.append(entry)
+                for callback in list(cls._output_callbacks):
+                    callback(entry)
+
+    @classmethod
+    def _watch(cls, process: subprocess.Popen, readers: List[threading.Thread]) -> None:
+        exit_code = process.wait()
+        # Output written right before exit is still in the pipes
+        for reader in readers:
+            reader.join(timeout=5)
+
+        with cls._lock:
+            cls._state = "exited"
+            cls._exit_code = exit_code
+
+        logger.info(f"Game exited with code {exit_code}")
+
+        for callback in list(cls._exit_callbacks):
+            try:
+                callback(exit_code)
+
+            except Exception as err:
+                logger.error(f"Error in game exit callback: {err}", exc_info=True)
+
+        cls._finished.set()
+
+    @classmethod
+    def add_exit_callback(cls, callback: Callable[[int], None]) -> None:
+        if callback not in cls._exit_callbacks:
+            cls._exit_callbacks.append(callback)
+
+    @classmethod
+    def add_output_callback(cls, callback: Callable[[LogLine], None]) -> None:
+        if callback not in cls._output_callbacks:
+            cls._output_callbacks.append(callback)
+
+    @classmethod
+    def remove_output_callback(cls, callback: Callable[[LogLine], None]) -> None:
+        if callback in cls._output_callbacks:
+            cls._output_callbacks.remove(callback)
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._state == "running"
+
+    @classmethod
+    def get_state(cls) -> GameState:
+        return cls._state
+
+    @classmethod
+    def get_exit_code(cls) -> Optional[int]:
+        return cls._exit_code
+
+    @classmethod
+    def get_log(cls) -> List[LogLine]:
+        return list(cls._log)
+
+    @classmethod
+    def wait(cls, timeout: Optional[float] = None) -> Optional[int]:
+        """Blocks until the game and all exit callbacks are done."""
+        if cls._state != "running":
+            return cls._exit_code
+
+        cls._finished.wait(timeout)
+        return cls._exit_code
+
+    @classmethod
+    def terminate(cls) -> None:
+        process = cls._process
+        if process is not None and process.poll() is None:
+            process.terminate()
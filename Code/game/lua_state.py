@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from Code.app_vars import AppConfig
+
+from .executable import executable_name
+
+logger = logging.getLogger(__name__)
+
+
+class LuaInstallState:
+    """Remembers what the Luatrauma updater last patched.
+
+    For every game folder the release of the updater (SHA-256 of its binary)
+    and the size, mtime and SHA-256 of the patched game files are stored. The
+    updater only has to run again when one of them differs, a file whose stat
+    changed but whose content did not (Steam verify, copies) still counts as
+    unchanged.
+    """
+
+    PATCHED_FILES = ("Barotrauma.dll", "Barotrauma.deps.json")
+
+    _lock = threading.Lock()
+    _state: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    def get_state_path() -> Path:
+        return AppConfig.get_hash_path() / "lua_state.json"
+
+    @classmethod
+    def _load(cls) -> Dict[str, Any]:
+        if cls._state is None:
+            try:
+                with open(cls.get_state_path(), "r", encoding="utf-8") as file:
+                    cls._state = json.load(file)
+
+            except (OSError, ValueError):
+                cls._state = {}
+
+        return cls._state  # type: ignore
+
+    @classmethod
+    def _save(cls) -> None:
+        state_path = cls.get_state_path()
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = state_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(cls._state, file, indent=4, sort_keys=True)
+
+            os.replace(tmp_path, state_path)
+
+        except OSError as err:
+            logger.warning(
+                f"Failed to save Lua install state: {err}\n|Path: {state_path}"
+            )
+
+    @staticmethod
+    def _key(game_path: Path) -> str:
+        return os.path.normcase(str(game_path.resolve()))
+
+    @classmethod
+    def tracked_files(cls) -> List[str]:
+        return [*cls.PATCHED_FILES, executable_name()]
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                sha256.update(block)
+
+        return sha256.hexdigest()
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            stat = path.stat()
+
+        except OSError:
+            return None
+
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": LuaInstallState._hash_file(path),
+        }
+
+    @classmethod
+    def _file_unchanged(cls, path: Path, recorded: Optional[Dict[str, Any]]) -> bool:
+        try:
+            stat = path.stat()
+
+        except OSError:
+            return recorded is None
+
+        if recorded is None:
+            return False
+
+        if (stat.st_size, stat.st_mtime_ns) == (
+            recorded.get("size"),
+            recorded.get("mtime_ns"),
+        ):
+            return True
+
+        if stat.st_size != recorded.get("size"):
+            return False
+
+        # Touched but maybe not modified, only now is the file read
+        if cls._hash_file(path) != recorded.get("sha256"):
+            return False
+
+        recorded["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    @classmethod
+    def is_current(cls, game_path: Path, release: Optional[str]) -> bool:
+        """True when `release` of the updater was already applied to the
+        current game files."""
+        if release is None:
+            return False
+
+        with cls._lock:
+            entry = cls._load().get(cls._key(game_path))
+            if not entry or entry.get("release") != release:
+                return False
+
+            files = entry.get("files", {})
+            for name in cls.tracked_files():
+                if not cls._file_unchanged(game_path / name, files.get(name)):
+                    logger.debug(
+                        f"Patched game file changed\n|Path: {game_path / name}"
+                    )
+                    return False
+
+            # Keeps mtimes refreshed by `_file_unchanged`
+            cls._save()
+            return True
+
+    @classmethod
+    def record(cls, game_path: Path, release: Optional[str]) -> None:
+        files = {
+            name: cls._fingerprint(game_path / name) for name in cls.tracked_files()
+        }
+
+        with cls._lock:
+            state = cls._load()
+            entry = state.setdefault(cls._key(game_path), {})
+            entry["release"] = release
+            entry["files"] = files
+            cls._save()
+
+    @classmethod
+    def detect_lua(cls, game_path: Path) -> bool:
+        """Checks `Barotrauma.deps.json` for Luatrauma, memoized by file stat."""
+        deps_path = game_path / "Barotrauma.deps.json"
+        try:
+            stat = deps_path.stat()
+
+        except OSError:
+            return False
+
+        stamp = [stat.st_size, stat.st_mtime_ns]
+
+        with cls._lock:
+            entry = cls._load().setdefault(cls._key(game_path), {})
+            detected = entry.get("has_lua")
+            if detected is not None and detected.get("stat") == stamp:
+                return detected["value"]
+
+            with open(deps_path, "rb") as file:
+                has_lua = b"Luatrauma" in file.read()
+
+            entry["has_lua"] = {"stat": stamp, "value": has_lua}
+            cls._save()
+
+        return has_lua
@@ -0,0 +1,180 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (id that loads first, id that loads after it)
+Edge = Tuple[str, str]
+
+
+class DependencyGraph:
+    """Load order constraints between mods with an incrementally kept order.
+
+    Every node has a position and every edge points from a lower to a higher
+    position. Adding an edge that points backwards searches like Pearce-Kelly:
+    only nodes between the two positions are visited, forward from the edge's
+    target and backward from its source. The smaller of the two groups is then
+    moved as a block to the other end of that region, so nothing outside the
+    region moves and all other nodes keep their relative order.
+    """
+
+    def __init__(self) -> None:
+        self._succ: Dict[str, Set[str]] = {}
+        self._pred: Dict[str, Set[str]] = {}
+        self._ord: Dict[str, int] = {}
+        # Node at every position
+        self._at: List[str] = []
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._ord
+
+    @property
+    def edges(self) -> Set[Edge]:
+        return {(u, v) for u, targets in self._succ.items() for v in targets}
+
+    def order(self) -> List[str]:
+        return list(self._at)
+
+    def add_node(self, node: str) -> None:
+        """Adds a node after all others."""
+        if node in self._ord:
+            return
+
+        self._succ[node] = set()
+        self._pred[node] = set()
+        self._ord[node] = len(self._at)
+        self._at.append(node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self._ord:
+            return
+
+        for target in self._succ.pop(node):
+            self._pred[target].discard(node)
+
+        for source in self._pred.pop(node):
+            self._succ[source].discard(node)
+
+        position = self._ord.pop(node)
+        del self._at[position]
+        for later in self._at[position:]:
+            self._ord[later] -= 1
+
+    def remove_edge(self, u: str, v: str) -> None:
+        # Removing an edge never breaks the order
+        if u in self._succ:
+            self._succ[u].discard(v)
+
+        if v in self._pred:
+            self._pred[v].discard(u)
+
+    def add_edge(self, u: str, v: str) -> bool:
+        """Adds "u before v", False if it would close a cycle."""
+        if u == v:
+            return False
+
+        lower, upper = self._ord[v], self._ord[u]
+        if lower < upper:
+            forward = self._search_forward(v, upper)
+            if forward is None:
+                return False
+
+            backward = self._search_backward(u, lower)
+            self._reorder(lower, upper, backward, forward)
+
+        self._succ[u].add(v)
+        self._pred[v].add(u)
+        return True
+
+    def _search_forward(self, start: str, upper: int) -> Optional[List[str]]:
+        """Nodes reachable from `start` up to position `upper`.
+
+        None if the node at `upper` is reached, the new edge would be a cycle.
+        """
+        visited = {start}
+        stack = [start]
+        while stack:
+            for target in self._succ[stack.pop()]:
+                position = self._ord[target]
+                if position == upper:
+                    return None
+
+                if position < upper and target not in visited:
+                    visited.add(target)
+                    stack.append(target)
+
+        return list(visited)
+
+    def _search_backward(self, start: str, lower: int) -> List[str]:
+        visited = {start}
+        stack = [start]
+        while stack:
+            for source in self._pred[stack.pop()]:
+                if self._ord[source] > lower and source not in visited:
+                    visited.add(source)
+                    stack.append(source)
+
+        return list(visited)
+
+    def _reorder(
+        self, lower: int, upper: int, backward: List[str], forward: List[str]
+    ) -> None:
+        # The backward group has to end up before the forward group. No other
+        # node in the region is tied to them in a way that forbids moving
+        # either group past it, so the smaller one is moved
+        region = self._at[lower : upper + 1]
+        if len(backward) <= len(forward):
+            moved = set(backward)
+            region = [node for node in region if node in moved] + [
+                node for node in region if node not in moved
+            ]
+
+        else:
+            moved = set(forward)
+            region = [node for node in region if node not in moved] + [
+                node for node in region if node in moved
+            ]
+
+        self._at[lower : upper + 1] = region
+        for position, node in enumerate(region, lower):
+            self._ord[node] = position
+
+    def sync(self, order: List[str], edges: Iterable[Edge]) -> List[Edge]:
+        """Brings the graph to `order` and `edges`, moving as little as needed.
+
+        Positions are taken from `order`, the current (possibly hand-made)
+        list. Nodes and edges that are gone are dropped, edges that are new or
+        that the current order violates are inserted one by one. Returns the
+        edges that were rejected because they would close a cycle.
+        """
+        wanted = set(edges)
+        known = set(order)
+
+        for node in [node for node in self._ord if node not in known]:
+            self.remove_node(node)
+
+        for node in order:
+            self.add_node(node)
+
+        self._at = list(order)
+        self._ord = {node: position for position, node in enumerate(order)}
+
+        # The searches rely on every edge already pointing forward, so edges
+        # broken by manual moves are taken out and inserted again
+        for u, v in self.edges:
+            if (u, v) not in wanted or self._ord[u] > self._ord[v]:
+                self.remove_edge(u, v)
+
+        pending = [
+            (u, v)
+            for u, v in wanted
+            if u in self._ord and v in self._ord and v not in self._succ[u]
+        ]
+        pending.sort(key=lambda edge: (self._ord[edge[1]], self._ord[edge[0]]))
+
+        rejected = []
+        for u, v in pending:
+            if not self.add_edge(u, v):
+                rejected.append((u, v))
+
+        return rejected
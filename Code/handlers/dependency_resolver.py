@@ -0,0 +1,304 @@
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from Code.package.dataclasses import ModUnit
+
+from .condition_manager import process_condition
+
+logger = logging.getLogger(__name__)
+
+_CONDITION_ID_RE = re.compile(r"ifhas\(\s*['\"]?([^'\")]+?)['\"]?\s*\)")
+
+# (dependency id, condition)
+_Rule = Tuple[str, Optional[str]]
+
+
+@dataclass
+class _Closure:
+    # Mod id -> (the mod that requires it, every id it is active because of),
+    # (None, empty) for mods the user chose
+    members: Dict[str, Tuple[Optional[str], FrozenSet[str]]]
+    # (mod id, id of a required mod that is not installed)
+    missing: List[Tuple[str, str]]
+    conflicts: List[Tuple[str, str]]
+
+
+@dataclass
+class Resolution:
+    activate: List[str] = field(default_factory=list)
+    deactivate: List[str] = field(default_factory=list)
+    missing: List[Tuple[str, str]] = field(default_factory=list)
+    # Conflicts left when no consistent set was found
+    conflicts: List[Tuple[str, str]] = field(default_factory=list)
+    # Mod id -> why it is activated or deactivated
+    reasons: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.activate or self.deactivate)
+
+    def explain(self) -> List[str]:
+        lines = [self.reasons[mod_id] for mod_id in self.activate + self.deactivate]
+        lines.extend(
+            f"'{mod_id}' requires '{dep_id}', which is not installed"
+            for mod_id, dep_id in self.missing
+        )
+        lines.extend(self.reasons[f"{a}|{b}"] for a, b in self.conflicts)
+        return lines
+
+
+class DependencyResolver:
+    """Finds the mods that have to be active for the current selection to work.
+
+    Requirements (every dependency type except conflicts) are followed
+    transitively, conditional ones once their condition holds for the set
+    built so far. Conditions only test for active mods, so a set can only
+    gain requirements by growing and the closure is a simple fixpoint.
+
+    When the closure contains a conflict, as few of the mods chosen by the
+    user as possible are dropped: an iterative deepening search that only
+    branches on mods that actually pull in one side of a conflict, with the
+    closure of every tried selection memoized.
+    """
+
+    MAX_REMOVALS = 4
+    MAX_STATES = 2000
+
+    def __init__(self, mods: Iterable[ModUnit]) -> None:
+        self._names: Dict[str, str] = {}
+        self._requires: Dict[str, List[_Rule]] = {}
+        self._conflicts: Dict[str, List[_Rule]] = {}
+
+        for mod in mods:
+            self._names[mod.id] = mod.name
+            requires = self._requires.setdefault(mod.id, [])
+            conflicts = self._conflicts.setdefault(mod.id, [])
+            for dep in mod.metadata.dependencies:
+                if dep.type != "conflict":
+                    requires.append((dep.id, dep.condition))
+
+                elif dep.attributes.get("level", "error") != "warning":
+                    # Conflicts are symmetric, whichever mod declares them
+                    conflicts.append((dep.id, dep.condition))
+                    self._conflicts.setdefault(dep.id, []).append(
+                        (mod.id, dep.condition)
+                    )
+
+        self._closures: Dict[FrozenSet[str], _Closure] = {}
+
+    def name(self, mod_id: str) -> str:
+        return self._names.get(mod_id, mod_id)
+
+    def _closure(self, roots: List[str], dropped: FrozenSet[str]) -> _Closure:
+        closure = self._closures.get(dropped)
+        if closure is not None:
+            return closure
+
+        members: Dict[str, Tuple[Optional[str], FrozenSet[str]]] = {}
+        missing: List[Tuple[str, str]] = []
+        # Conditional requirements whose condition does not hold yet, under
+        # every id the condition mentions that is not active yet
+        waiting: Dict[str, List[Tuple[str, str, str]]] = {}
+        # Conditional requirements already met, parked copies are skipped
+        satisfied: Set[Tuple[str, str, str]] = set()
+        queue = deque()
+
+        def add(mod_id: str, required_by: Optional[str], causes: Iterable[str]) -> None:
+            if mod_id in members:
+                return
+
+            if mod_id not in self._requires:
+                missing.append((required_by or mod_id, mod_id))
+                return
+
+            members[mod_id] = (required_by, frozenset(causes))
+            queue.append(mod_id)
+
+        def check(owner: str, dep_id: str, condition: Optional[str]) -> None:
+            if not condition:
+                add(dep_id, owner, (owner,))
+                return
+
+            rule = (owner, dep_id, condition)
+            if rule in satisfied:
+                return
+
+            condition_ids = _CONDITION_ID_RE.findall(condition)
+            if process_condition(condition, active_mod_ids=members):
+                satisfied.add(rule)
+                add(dep_id, owner, (owner, *condition_ids))
+                return
+
+            # Re-checked whenever any of the mods it asks for becomes active,
+            # `ifhas(A)|ifhas(B)` may be met by either
+            for inactive_id in dict.fromkeys(condition_ids):
+                if inactive_id in members:
+                    continue
+
+                parked = waiting.setdefault(inactive_id, [])
+                if rule not in parked:
+                    parked.append(rule)
+
+        for root in roots:
+            if root not in dropped:
+                add(root, None, ())
+
+        while queue:
+            mod_id = queue.popleft()
+            for dep_id, condition in self._requires[mod_id]:
+                check(mod_id, dep_id, condition)
+
+            for owner, dep_id, condition in waiting.pop(mod_id, ()):
+                check(owner, dep_id, condition)
+
+        conflicts = []
+        for mod_id in members:
+            for other_id, condition in self._conflicts.get(mod_id, ()):
+                if (
+                    other_id in members
+                    and mod_id < other_id
+                    and (
+                        not condition
+                        or process_condition(condition, active_mod_ids=members)
+                    )
+                ):
+                    conflicts.append((mod_id, other_id))
+
+        closure = _Closure(members, missing, sorted(set(conflicts)))
+        self._closures[dropped] = closure
+        return closure
+
+    @staticmethod
+    def _causing_roots(closure: _Closure, mod_ids: Iterable[str]) -> Set[str]:
+        """Mods chosen by the user that lead to any of `mod_ids` being active."""
+        roots = set()
+        seen = set(mod_ids)
+        queue = deque(seen)
+        while queue:
+            mod_id = queue.popleft()
+            member = closure.members.get(mod_id)
+            if member is None:
+                continue
+
+            causes = member[1]
+
+            if not causes:
+                roots.add(mod_id)
+
+            for cause in causes:
+                if cause not in seen:
+                    seen.add(cause)
+                    queue.append(cause)
+
+        return roots
+
+    def _search(
+        self,
+        roots: List[str],
+        dropped: FrozenSet[str],
+        budget: int,
+        visited: Set[FrozenSet[str]],
+    ) -> Optional[FrozenSet[str]]:
+        if len(self._closures) > self.MAX_STATES:
+            return None
+
+        closure = self._closure(roots, dropped)
+        if not closure.conflicts:
+            return dropped
+
+        if budget == 0:
+            return None
+
+        # One side of the first conflict has to go, only mods that pull in
+        # either side are worth dropping. Later mods in the order go first
+        candidates = self._causing_roots(closure, closure.conflicts[0])
+        position = {root: index for index, root in enumerate(roots)}
+        for candidate in sorted(candidates, key=position.__getitem__, reverse=True):
+            attempt = dropped | {candidate}
+            if attempt in visited:
+                continue
+
+            visited.add(attempt)
+            result = self._search(roots, attempt, budget - 1, visited)
+            if result is not None:
+                return result
+
+        return None
+
+    def resolve(self, active_ids: List[str]) -> Resolution:
+        """Changes to `active_ids` (in load order) for a consistent selection."""
+        roots = [
+            mod_id for mod_id in dict.fromkeys(active_ids) if mod_id in self._names
+        ]
+        dropped: Optional[FrozenSet[str]] = None
+        for budget in range(self.MAX_REMOVALS + 1):
+            dropped = self._search(roots, frozenset(), budget, set())
+            if dropped is not None or len(self._closures) > self.MAX_STATES:
+                break
+
+        resolution = Resolution()
+        if dropped is None:
+            closure = self._closure(roots, frozenset())
+            resolution.conflicts = closure.conflicts
+            resolution.missing = closure.missing
+            for a, b in closure.conflicts:
+                resolution.reasons[f"{a}|{b}"] = (
+                    f"'{self.name(a)}' conflicts with '{self.name(b)}' "
+                    f"({self._chain(closure, a)}; {self._chain(closure, b)})"
+                )
+
+            logger.debug(
+                f"No consistent mod selection found, {len(self._closures)} selections tried"
+            )
+            return resolution
+
+        full = self._closure(roots, frozenset())
+        for mod_id in dropped:
+            partners = set()
+            for a, b in full.conflicts:
+                if mod_id in self._causing_roots(full, (a,)):
+                    partners.add(f"'{self.name(b)}'")
+
+                if mod_id in self._causing_roots(full, (b,)):
+                    partners.add(f"'{self.name(a)}'")
+
+            resolution.reasons[mod_id] = (
+                f"Deactivated '{self.name(mod_id)}': conflicts with "
+                f"{', '.join(sorted(partners))}"
+            )
+
+        resolution.deactivate = [mod_id for mod_id in roots if mod_id in dropped]
+
+        closure = self._closure(roots, dropped)
+        active = set(active_ids)
+        for mod_id in closure.members:
+            if mod_id not in active:
+                resolution.activate.append(mod_id)
+                resolution.reasons[mod_id] = (
+                    f"Activated '{self.name(mod_id)}': {self._chain(closure, mod_id)}"
+                )
+
+        resolution.missing = closure.missing
+        return resolution
+
+    def _chain(self, closure: _Closure, mod_id: str) -> str:
+        """Human readable path from a chosen mod to `mod_id`."""
+        names = []
+        seen = {mod_id}
+        member = closure.members.get(mod_id)
+        while member is not None and member[0] is not None and member[0] not in seen:
+            seen.add(member[0])
+            names.append(f"'{self.name(member[0])}'")
+            member = closure.members.get(member[0])
+
+        if not names:
+            return f"selected '{self.name(mod_id)}'"
+
+        return "required by " + " <- ".join(names)
@@ -1,17 +1,25 @@
 import atexit
 import logging
-from collections import defaultdict, deque
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
 from Code.app_vars import AppConfig
+from Code.game import GameLauncher, LuaInstallState
 from Code.loc import Localization as loc
 from Code.package.dataclasses import ModUnit
+from Code.profiler import StartupProfiler
 from Code.xml_object import XMLBuilder, XMLComment, XMLElement
 
 from .condition_manager import process_condition
+from .dependency_graph import DependencyGraph, Edge
+from .dependency_resolver import DependencyResolver
 from .parts_manager import PartsManager
+from .session_snapshot import SessionSnapshot
+
+if TYPE_CHECKING:
+    from Code.analysis import FilelistReport
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +28,32 @@ class ModManager:
     active_mods: List[ModUnit] = []
     inactive_mods: List[ModUnit] = []
 
+    # Toggle content may be applied on disk. Unknown after a crash, so True
+    # until the first rollback
+    _toggles_applied: bool = True
+    _toggles_lock = threading.Lock()
+
+    # Kept between sorts so an unchanged part of the order is not touched
+    _graph = DependencyGraph()
+
     @staticmethod
     def init():
-        ModManager.load_mods()
-        ModManager.load_cslua_config()
+        # Code.analysis pulls in sqlite3, the headless path does without it
+        from Code.analysis import ContentDatabase, VanillaIndex
+
+        with StartupProfiler.span("ModManager.load_mods"):
+            if not ModManager.restore_session():
+                ModManager.load_mods()
+
+        # Needed by process_errors, built once per game version
+        VanillaIndex.start()
+        # Only files changed since the last session are parsed again
+        ContentDatabase.start(ModManager.active_mods + ModManager.inactive_mods)
+
+        with StartupProfiler.span("ModManager.load_cslua_config"):
+            ModManager.load_cslua_config()
+
+        GameLauncher.add_exit_callback(ModManager._on_game_exit)
         atexit.register(ModManager._on_exit)
 
     @staticmethod
@@ -34,13 +64,37 @@ class ModManager:
 
         ModManager.active_mods.clear()
         ModManager.inactive_mods.clear()
-        ModManager.load_active_mods(game_path / "config_player.xml")
+        with StartupProfiler.span("ModManager.load_active_mods"):
+            ModManager.load_active_mods(game_path / "config_player.xml")
+
         inactive_mods_dir = AppConfig.get("steam_mod_dir", None)
         if inactive_mods_dir:
             inactive_mods_dir = Path(inactive_mods_dir)
-            ModManager.load_inactive_mods(inactive_mods_dir)
+            with StartupProfiler.span("ModManager.load_inactive_mods:steam"):
+                ModManager.load_inactive_mods(inactive_mods_dir)
+
+        with StartupProfiler.span("ModManager.load_inactive_mods:local"):
+            ModManager.load_inactive_mods((game_path / "LocalMods"))
 
-        ModManager.load_inactive_mods((game_path / "LocalMods"))
+    @staticmethod
+    def restore_session() -> bool:
+        """Takes the mods of the last session if nothing on disk changed since."""
+        snapshot = SessionSnapshot.restore()
+        if snapshot is None:
+            return False
+
+        active_mods, inactive_mods = snapshot
+        ModManager.active_mods.clear()
+        ModManager.active_mods.extend(active_mods)
+        ModManager.inactive_mods.clear()
+        ModManager.inactive_mods.extend(inactive_mods)
+        for index, mod in enumerate(ModManager.active_mods, start=1):
+            mod.load_order = index
+
+        logger.info(
+            f"Restored {len(active_mods)} active and {len(inactive_mods)} inactive mods from the last session"
+        )
+        return True
 
     @staticmethod
     def load_active_mods(path_to_config_player: Path):
@@ -152,10 +206,9 @@ class ModManager:
         # LUA
         lua_dep_path = game_path / "Barotrauma.deps.json"
         if lua_dep_path.exists():
-            with open(lua_dep_path, "r", encoding="utf-8") as file:
-                has_lua = "Luatrauma" in file.read()
-                AppConfig.set("has_lua", has_lua)
-                logger.debug(f"Lua support enabled: {has_lua}")
+            has_lua = LuaInstallState.detect_lua(game_path)
+            AppConfig.set("has_lua", has_lua)
+            logger.debug(f"Lua support enabled: {has_lua}")
 
         else:
             AppConfig.set("has_lua", False)
@@ -266,46 +319,47 @@ class ModManager:
             ModManager.inactive_mods.append(mod)
 
     @staticmethod
-    def save_mods() -> None:
+    def save_mods() -> bool:
         game_path = AppConfig.get("barotrauma_dir", None)
         if not game_path:
             logger.error("Game path not set!")
-            return
+            return False
 
         game_path = Path(game_path)
         if not game_path.exists():
             logger.error(f"Game path does not exist!\n|Path: {game_path}")
-            return
+            return False
 
         user_config_path = game_path / "config_player.xml"
         if not user_config_path.exists():
             logger.error(
                 f"config_player.xml does not exist!\n|Path: {user_config_path}"
             )
-            return
+            return False
 
         user_config_path = user_config_path.resolve()
         if not user_config_path.is_file():
             logger.error(f"Resolved path is not a valid file: {user_config_path}")
-            return
+            return False
 
-        xml_obj = XMLBuilder.load(user_config_path)
+        xml_obj = XMLBuilder.load(user_config_path, lossless=True)
         if xml_obj is None:
             logger.error(f"Invalid config_player.xml\n|Path: {user_config_path}")
-            return
+            return False
 
         regularpackages = next(
             (item for item in xml_obj.find_only_elements("regularpackages")), None
         )
         if regularpackages is None:
             logger.error("No 'regularpackages' element found in config_player.xml.")
-            return
+            return False
 
-        regularpackages.childrens.clear()
+        regularpackages.clear_childrens()
 
         active_mod_id = set([mod.id for mod in ModManager.active_mods])
         for mod in ModManager.active_mods:
             if mod.has_toggle_content:
+                ModManager._toggles_applied = True
                 PartsManager.do_chenges(mod, active_mod_id)
 
             mod_path = mod.get_str_path()
@@ -317,66 +371,121 @@ class ModManager:
         del active_mod_id
 
         XMLBuilder.save(xml_obj, user_config_path)
+        # After toggle content is applied, so the entries it disabled are skipped
+        ModManager.check_filelists()
+        return True
 
     @staticmethod
-    def _on_exit():
-        for mod in (
-            ModManager.active_mods + ModManager.inactive_mods
-        ):  # При неверном выходе пизда =)
-            game_path = AppConfig.get("barotrauma_dir", None)
-            if not game_path:
-                logger.error("Game path not set!")
-                return
-
-            game_path = Path(game_path)
-            if not game_path.exists():
-                logger.error(f"Game path does not exist!\n|Path: {game_path}")
-                return
-
-            user_config_path = game_path / "config_player.xml"
-            if not user_config_path.exists():
+    def check_filelists() -> Dict[str, "FilelistReport"]:
+        """Checks the filelist.xml of every active mod and logs the files
+        the game will fail to find.
+        """
+        from Code.analysis import FilelistChecker
+        from Code.analysis.dir_listing import CASE_MISMATCH
+
+        reports = FilelistChecker.check(
+            ModManager.active_mods,
+            ModManager.active_mods + ModManager.inactive_mods,
+        )
+        for mod in ModManager.active_mods:
+            report = reports[mod.id]
+            if report.missing:
                 logger.error(
-                    f"config_player.xml does not exist!\n|Path: {user_config_path}"
+                    f"Mod '{mod.name}' has a broken filelist.xml, the game will not load it\n"
+                    f"|Files: {', '.join(f'{issue.path} ({issue.kind})' for issue in report.missing)}\n"
+                    f"|Path: {mod.path}"
                 )
-                return
 
-            user_config_path = user_config_path.resolve()
-            if not user_config_path.is_file():
-                logger.error(f"Resolved path is not a valid file: {user_config_path}")
-                return
+            wrong_case = [
+                issue.path for issue in report.issues if issue.kind == CASE_MISMATCH
+            ]
+            if wrong_case:
+                logger.warning(
+                    f"Mod '{mod.name}' lists files with the wrong letter case\n"
+                    f"|Files: {', '.join(wrong_case)}\n"
+                    f"|Path: {mod.path}"
+                )
+
+        return reports
 
-            xml_obj = XMLBuilder.load(user_config_path)
-            if xml_obj is None:
-                logger.error(f"Invalid config_player.xml\n|Path: {user_config_path}")
+    @staticmethod
+    def rollback_toggles() -> None:
+        with ModManager._toggles_lock:
+            if not ModManager._toggles_applied:
                 return
 
-            regularpackages = next(
-                (item for item in xml_obj.find_only_elements("regularpackages")), None
+            for mod in ModManager.active_mods + ModManager.inactive_mods:
+                if mod.has_toggle_content:
+                    PartsManager.rollback_changes_no_thread(mod)
+
+            ModManager._toggles_applied = False
+
+    @staticmethod
+    def _on_game_exit(exit_code: int) -> None:
+        logger.debug(f"Rolling back toggle content after game exit ({exit_code})")
+        ModManager.rollback_toggles()
+
+    @staticmethod
+    def _on_exit():
+        # При неверном выходе пизда =)
+        if not ModManager.active_mods and not ModManager.inactive_mods:
+            return
+
+        game_path = AppConfig.get("barotrauma_dir", None)
+        if not game_path:
+            logger.error("Game path not set!")
+            return
+
+        game_path = Path(game_path)
+        if not game_path.exists():
+            logger.error(f"Game path does not exist!\n|Path: {game_path}")
+            return
+
+        user_config_path = game_path / "config_player.xml"
+        if not user_config_path.exists():
+            logger.error(
+                f"config_player.xml does not exist!\n|Path: {user_config_path}"
             )
-            if regularpackages is None:
-                logger.error("No 'regularpackages' element found in config_player.xml.")
-                return
+            return
 
-            regularpackages.childrens.clear()
+        user_config_path = user_config_path.resolve()
+        if not user_config_path.is_file():
+            logger.error(f"Resolved path is not a valid file: {user_config_path}")
+            return
 
-            active_mod_id = set([mod.id for mod in ModManager.active_mods])
-            for mod in ModManager.active_mods:
-                mod_path = mod.get_str_path()
-                regularpackages.add_child(XMLComment(mod.name))
-                regularpackages.add_child(
-                    XMLElement("package", {"path": f"{mod_path}/filelist.xml"})
-                )
+        xml_obj = XMLBuilder.load(user_config_path, lossless=True)
+        if xml_obj is None:
+            logger.error(f"Invalid config_player.xml\n|Path: {user_config_path}")
+            return
 
-            del active_mod_id
+        regularpackages = next(
+            (item for item in xml_obj.find_only_elements("regularpackages")), None
+        )
+        if regularpackages is None:
+            logger.error("No 'regularpackages' element found in config_player.xml.")
+            return
 
-            XMLBuilder.save(xml_obj, user_config_path)
-            if mod.has_toggle_content:
-                PartsManager.rollback_changes_no_thread(mod)
+        regularpackages.clear_childrens()
+
+        for mod in ModManager.active_mods:
+            mod_path = mod.get_str_path()
+            regularpackages.add_child(XMLComment(mod.name))
+            regularpackages.add_child(
+                XMLElement("package", {"path": f"{mod_path}/filelist.xml"})
+            )
+
+        XMLBuilder.save(xml_obj, user_config_path)
+
+        # A running game still needs the toggles, they are rolled back when it exits
+        if not GameLauncher.is_running():
+            ModManager.rollback_toggles()
+
+        # Taken last, so the stats match the config and mod files as left on disk
+        SessionSnapshot.save(ModManager.active_mods, ModManager.inactive_mods)
 
     @staticmethod
     def process_errors():
         active_mods_ids = {mod.id for mod in ModManager.active_mods}
-        bind_id = {}
         for mod in ModManager.active_mods:
             mod.update_meta_errors()
             for dep in mod.metadata.dependencies:
@@ -414,80 +523,68 @@ class ModManager:
                             )
                         )
 
+        added_by: Dict[str, List[ModUnit]] = {}
         for mod in ModManager.active_mods:
-            for over_id in mod.override_id:
-                if over_id not in bind_id:
-                    bind_id[over_id] = (mod.name, mod.id)
+            for add_id in mod.add_id:
+                added_by.setdefault(add_id, []).append(mod)
+
+        from Code.analysis import VanillaIndex
 
+        # Called on the GUI thread, the generic text is used until the index is there
+        vanilla_ids = VanillaIndex.get_nowait()
         for mod in ModManager.active_mods:
             for over_id in mod.override_id:
-                if over_id in bind_id:
-                    mod.metadata.warnings.append(
-                        loc.get_string(
-                            "mod-override-id",
-                            mod_name=bind_id[over_id][0],
-                            mod_id=bind_id[over_id][1],
-                            key_id=over_id,
-                        )
+                adder = next(
+                    (other for other in added_by.get(over_id, ()) if other is not mod),
+                    None,
+                )
+                if adder is not None:
+                    warning = loc.get_string(
+                        "mod-override-mod",
+                        mod_name=adder.name,
+                        mod_id=adder.id,
+                        key_id=over_id,
                     )
 
+                elif vanilla_ids is None:
+                    warning = loc.get_string("mod-override-id", key_id=over_id)
+
+                elif over_id in vanilla_ids:
+                    warning = loc.get_string("mod-override-vanilla", key_id=over_id)
+
+                else:
+                    warning = loc.get_string("mod-override-unknown", key_id=over_id)
+
+                mod.metadata.warnings.append(warning)
+
     @staticmethod
-    def sort():
+    def _dependency_edges() -> Set[Edge]:
+        """Load order constraints of the active mods, "first id before second".
+
+        Expects the active set to be resolved already, see `resolve_dependencies`.
+        """
         mods = ModManager.active_mods
-        id_to_mod = {mod.id: mod for mod in mods}
         id_to_name = {mod.id: mod.name for mod in mods}
-        active_mod_ids = set(id_to_mod.keys())
-        ban_ids = set()
+        active_mod_ids = set(id_to_name.keys())
 
-        dependency_graph = defaultdict(list)
-        in_degree = defaultdict(int)
+        edges: Set[Edge] = set()
         added_ids = {}
 
         for mod in mods:
             for dep in mod.metadata.dependencies:
+                if dep.type == "conflict" or dep.id not in active_mod_ids:
+                    continue
+
                 if dep.condition and not process_condition(
                     dep.condition, active_mod_ids=active_mod_ids
                 ):
                     continue
 
-                dep_id = dep.id
-
-                if dep.type == "conflict":
-                    if dep_id in id_to_mod:
-                        ban_ids.add(dep_id)
-                        logger.error(
-                            f"Conflict detected between '{mod.name}' and '{id_to_name.get(dep_id, dep_id)}'."
-                        )
-                    continue
-
-                if dep_id not in id_to_mod:
-                    if not ModManager.activate_mod(dep_id):
-                        logger.warning(
-                            f"Dependency '{dep_id}' specified in mod '{mod.name}' not found among active mods."
-                        )
-                        continue
-                    else:
-                        if dep_id in ban_ids:
-                            logger.error(
-                                f"Conflict detected between '{mod.name}' and '{id_to_name.get(dep_id, dep_id)}'."
-                            )
-                            continue
-
-                        on_mod = ModManager.get_mod_by_id(dep_id)
-                        id_to_mod[on_mod.id] = on_mod  # type: ignore
-                        id_to_name[on_mod.id] = on_mod.name  # type: ignore
-                        active_mod_ids.add(on_mod.id)  # type: ignore
-
                 if dep.type == "patch":
-                    dependency_graph[mod.id].append(dep_id)
-                    in_degree[dep_id] += 1
+                    edges.add((mod.id, dep.id))
 
                 elif dep.type == "requirement":
-                    dependency_graph[dep_id].append(mod.id)
-                    in_degree[mod.id] += 1
-
-                elif dep.type == "requiredAnyOrder":
-                    pass
+                    edges.add((dep.id, mod.id))
 
         for mod in mods:
             for add_id in mod.add_id:
@@ -504,38 +601,70 @@ class ModManager:
                     if override_id in added_ids:
                         adder_mod_id = added_ids[override_id]
                         if adder_mod_id != mod.id:
-                            dependency_graph[adder_mod_id].append(mod.id)
-                            in_degree[mod.id] += 1
+                            edges.add((adder_mod_id, mod.id))
 
-        queue = deque(
-            sorted(
-                [mod_id for mod_id in id_to_mod if in_degree[mod_id] == 0],
-                key=lambda id: id_to_name[id],
-            )
-        )
+        return edges
+
+    @staticmethod
+    def resolve_dependencies() -> bool:
+        """Activates what the active mods need and drops conflicting mods.
 
-        sorted_mods: List[ModUnit] = []
-        while queue:
-            current_id = queue.popleft()
-            current_mod = id_to_mod[current_id]
-            sorted_mods.append(current_mod)
-
-            for neighbor_id in sorted(
-                dependency_graph[current_id], key=lambda id_: id_to_name[id_]
-            ):
-                in_degree[neighbor_id] -= 1
-                if in_degree[neighbor_id] == 0:
-                    queue.append(neighbor_id)
-
-        if len(sorted_mods) != len(mods):
-            unresolved_mods = set(id_to_mod.keys()) - set(mod.id for mod in sorted_mods)
-            unresolved_names = [id_to_name[mod_id] for mod_id in unresolved_mods]
+        False if the conflicts could not be solved, nothing is changed then.
+        """
+        resolution = DependencyResolver(
+            ModManager.active_mods + ModManager.inactive_mods
+        ).resolve([mod.id for mod in ModManager.active_mods])
+
+        for line in resolution.explain():
+            if resolution.ok:
+                logger.warning(line)
+
+            else:
+                logger.error(line)
+
+        if not resolution.ok:
+            return False
+
+        for mod_id in resolution.deactivate:
+            ModManager.deactivate_mod(mod_id)
+
+        for mod_id in resolution.activate:
+            ModManager.activate_mod(mod_id)
+
+        return True
+
+    @staticmethod
+    def sort() -> bool:
+        """Fixes the load order with as few moves as possible.
+
+        The current order, including manual changes, is the starting point:
+        only mods that break a dependency and the mods chained to them move,
+        see `DependencyGraph`.
+        """
+        mods = ModManager.active_mods
+        if len({mod.id for mod in mods}) != len(mods):
+            logger.error("The same mod is active more than once, sort skipped")
+            return False
+
+        if not ModManager.resolve_dependencies():
+            return False
+
+        edges = ModManager._dependency_edges()
+        id_to_mod = {mod.id: mod for mod in mods}
+
+        rejected = ModManager._graph.sync([mod.id for mod in mods], edges)
+        if rejected:
+            unresolved_names = sorted(
+                {id_to_mod[mod_id].name for edge in rejected for mod_id in edge}
+            )
             logger.error(
                 f"Unresolved dependencies or cycles detected for mods: {', '.join(unresolved_names)}"
             )
-            return
+            return False
 
+        sorted_mods = [id_to_mod[mod_id] for mod_id in ModManager._graph.order()]
         for i, mod in enumerate(sorted_mods, 1):
             mod.load_order = i
 
-        ModManager.active_mods = sorted_mods
+        ModManager.active_mods[:] = sorted_mods
+        return True
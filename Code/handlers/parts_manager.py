@@ -71,7 +71,7 @@ class PartsManager:
     def _by_xml(
         file_path: Path, active_mod_ids: Set[str] = set(), is_fix: bool = False
     ):
-        xml_obj = XMLBuilder.load(file_path)
+        xml_obj = XMLBuilder.load(file_path, lossless=True)
         if xml_obj is None:
             return
 
@@ -136,7 +136,7 @@ class PartsManager:
         mod_path: Path, active_mod_ids: Set[str] = set(), is_fix: bool = False
     ):
         xml_obj = XMLBuilder.load((mod_path / "modparts.xml"))
-        xml_file_list = XMLBuilder.load((mod_path / "filelist.xml"))
+        xml_file_list = XMLBuilder.load((mod_path / "filelist.xml"), lossless=True)
 
         if not all((xml_obj, xml_file_list)):
             return
@@ -0,0 +1,179 @@
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package.dataclasses import ModUnit
+
+logger = logging.getLogger(__name__)
+
+# Bump when ModUnit or the parsing of mods changes
+SNAPSHOT_VERSION = 2
+
+StatKey = Optional[Tuple[int, int]]
+
+
+class SessionSnapshot:
+    """Built mod lists saved at exit and restored at the next start.
+
+    The snapshot stores the stat (mtime, size) of config_player.xml, the mod
+    folders, and of every XML file and subdirectory of InternalLibrary and of
+    each built mod, the files `ModUnit.build` reads. A Lua, C# or XML file
+    that is added, removed or renamed changes the mtime of its folder. The
+    folders are walked when the snapshot is saved; restoring only stats the
+    recorded paths again, no folder is listed and no XML is parsed. If
+    anything differs the mods are loaded from scratch as usual.
+
+    Limits: an edit that keeps both the mtime and the size of a file is not
+    seen, and neither is a change to a non-XML file in place, which
+    `ModUnit` does not read. Mods in the mod folders that failed to build
+    only have their folder, filelist.xml and metadata.xml tracked. Changes
+    to how mods are parsed need a `SNAPSHOT_VERSION` bump.
+    """
+
+    MOD_FILES = ("filelist.xml", "metadata.xml")
+
+    @staticmethod
+    def get_snapshot_path() -> Path:
+        return AppConfig.get_hash_path() / "session.pickle"
+
+    @staticmethod
+    def _stat(path: Path) -> StatKey:
+        try:
+            stat = os.stat(path)
+
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _settings() -> Tuple[Any, ...]:
+        return (
+            SNAPSHOT_VERSION,
+            AppConfig.version,
+            AppConfig.get("barotrauma_dir", None),
+            AppConfig.get("steam_mod_dir", None),
+        )
+
+    @staticmethod
+    def _tracked_paths(
+        game_path: Path, active: List[ModUnit], inactive: List[ModUnit]
+    ) -> List[Path]:
+        """Everything whose change could change the loaded mods.
+
+        Listing the folders happens only when the snapshot is saved, a new or
+        removed mod changes the mtime of the folder that contains it.
+        """
+        roots = [game_path / "LocalMods"]
+        steam_mod_dir = AppConfig.get("steam_mod_dir", None)
+        if steam_mod_dir:
+            roots.append(Path(steam_mod_dir))
+
+        # Metadata of Workshop mods that do not ship a metadata.xml
+        internal_library = AppConfig.get_data_root_path() / "InternalLibrary"
+        paths = [game_path / "config_player.xml", internal_library, *roots]
+        paths.extend(SessionSnapshot._tree_paths(internal_library))
+
+        built = {mod.path for mod in active + inactive}
+        mod_dirs = set(built)
+        for folder in roots:
+            try:
+                with os.scandir(folder) as entries:
+                    mod_dirs.update(
+                        Path(entry.path)
+                        for entry in entries
+                        if entry.is_dir() and not entry.name.startswith(".")
+                    )
+
+            except OSError:
+                continue
+
+        for mod_dir in sorted(mod_dirs):
+            paths.append(mod_dir)
+            paths.extend(mod_dir / name for name in SessionSnapshot.MOD_FILES)
+            if mod_dir in built:
+                paths.extend(SessionSnapshot._tree_paths(mod_dir))
+
+        return paths
+
+    @staticmethod
+    def _tree_paths(folder: Path) -> List[Path]:
+        """Subdirectories and XML files below `folder`, the ones `ModUnit.build`
+        reads or checks for.
+        """
+        paths = []
+        for root, dirs, files in os.walk(folder):
+            root_path = Path(root)
+            paths.extend(root_path / name for name in dirs)
+            paths.extend(
+                root_path / name
+                for name in files
+                if name.lower().endswith(".xml")
+                and not (
+                    root_path == folder and name.lower() in SessionSnapshot.MOD_FILES
+                )
+            )
+
+        return paths
+
+    @staticmethod
+    def save(active: List[ModUnit], inactive: List[ModUnit]) -> None:
+        game_path = AppConfig.get_game_path()
+        if game_path is None or not (active or inactive):
+            return
+
+        paths = SessionSnapshot._tracked_paths(game_path, active, inactive)
+        data: Dict[str, Any] = {
+            "settings": SessionSnapshot._settings(),
+            "stats": [(str(path), SessionSnapshot._stat(path)) for path in paths],
+            "active": active,
+            "inactive": inactive,
+        }
+
+        snapshot_path = SessionSnapshot.get_snapshot_path()
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(tmp_path, snapshot_path)
+
+        except Exception as err:
+            logger.error(
+                f"Error writing session snapshot\n|Error: {err}\n|Path: {snapshot_path}"
+            )
+
+        else:
+            logger.debug(f"Session snapshot saved, {len(paths)} paths tracked")
+
+    @staticmethod
+    def restore() -> Optional[Tuple[List[ModUnit], List[ModUnit]]]:
+        """Active and inactive mods of the last session, None if anything changed."""
+        snapshot_path = SessionSnapshot.get_snapshot_path()
+        if not snapshot_path.exists():
+            return None
+
+        try:
+            with open(snapshot_path, "rb") as file:
+                data = pickle.load(file)
+
+        except Exception as err:
+            logger.warning(
+                f"Broken session snapshot, mods are reloaded\n|Error: {err}\n|Path: {snapshot_path}"
+            )
+            return None
+
+        if data.get("settings") != SessionSnapshot._settings():
+            logger.debug("Session snapshot is from other settings or version")
+            return None
+
+        for path, stat_key in data["stats"]:
+            if SessionSnapshot._stat(Path(path)) != stat_key:
+                logger.debug(f"Session snapshot is stale\n|Path: {path}")
+                return None
+
+        return data["active"], data["inactive"]
@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import marshal
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# A placeholder is stored as (kind, name, raw): kind is "form", "sex" or ""
+# for plain substitutions, raw is the original "{...}" text kept for misses.
+Placeholder = Tuple[str, str, str]
+Template = Union[str, Tuple[Union[str, Placeholder], ...]]
+
+CATALOG_VERSION = 1
+
+_PLACEHOLDER_RE = re.compile(r"\{([^{}]*)\}")
+
+
+def compile_template(text: str) -> Template:
+    """Splits a localization string into literal and placeholder segments.
+
+    Strings without placeholders stay plain `str`, so the common case costs
+    nothing when formatting.
+    """
+    if "{" not in text:
+        return text
+
+    segments: List[Union[str, Placeholder]] = []
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(text):
+        if match.start() > position:
+            segments.append(text[position : match.start()])
+
+        name = match.group(1)
+        if name.startswith("form-"):
+            segments.append(("form", name[5:], match.group(0)))
+
+        elif name.startswith("sex-"):
+            segments.append(("sex", name[4:], match.group(0)))
+
+        else:
+            segments.append(("", name, match.group(0)))
+
+        position = match.end()
+
+    if not segments:
+        return text
+
+    if position < len(text):
+        segments.append(text[position:])
+
+    return tuple(segments)
+
+
+def template_text(template: Template) -> str:
+    if isinstance(template, str):
+        return template
+
+    return "".join(
+        segment if isinstance(segment, str) else segment[2] for segment in template
+    )
+
+
+def remove_comment(line: str) -> str:
+    """Удаляет комментарий из строки, если # не экранирован.
+
+    Args:
+        line (str): Строка с возможным комментарием.
+
+    Returns:
+        str: Строка без комментария.
+    """
+    if r"\#" in line:
+        line = line.replace(r"\#", "__TEMP_HASH__")
+
+    line = line.split("#", 1)[0].strip()
+
+    return line.replace("__TEMP_HASH__", "#")
+
+
+def parse_loc_file(file_path: Path) -> Dict[str, str]:
+    """Парсит файл локализации (.loc) в словарь ключ -> строка.
+
+    Args:
+        file_path (Path): Путь к файлу локализации (.loc).
+
+    Returns:
+        Dict[str, str]: Переводы из файла в порядке объявления.
+    """
+    translations: Dict[str, str] = {}
+    with file_path.open("r", encoding="utf-8") as file:
+        current_key: Optional[str] = None
+        for line in file:
+            line = line.strip()
+
+            if "#" in line:
+                line = remove_comment(line)
+
+            if "=" in line and not line.startswith("."):
+                current_key, value = line.split("=", 1)
+                translations[current_key.strip()] = value.strip()
+
+            elif line.startswith(".") and current_key:
+                sub_key, sub_value = line.split("=", 1)
+                translations[sub_key.strip()] = sub_value.strip()
+
+    return translations
+
+
+class LocCatalog:
+    """Precompiled translations of one language.
+
+    The catalog file keeps a key -> namespace index plus one marshal blob per
+    `.loc` file (namespace). Blobs are only unpacked when a key from that
+    namespace is first requested. The file is rebuilt when the set of `.loc`
+    files, their sizes or modification times change.
+    """
+
+    def __init__(
+        self,
+        index: Dict[str, str],
+        namespaces: Dict[str, bytes],
+    ) -> None:
+        self._index = index
+        self._namespaces = namespaces
+        self._templates: Dict[str, Template] = {}
+        self._loaded: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(folder: Path) -> Tuple[str, List[Path]]:
+        files = sorted(folder.rglob("*.loc"))
+        digest = hashlib.sha1(f"{CATALOG_VERSION}:{marshal.version}".encode())
+        for file_path in files:
+            stat = file_path.stat()
+            digest.update(
+                f"{file_path.relative_to(folder).as_posix()}:{stat.st_size}:{stat.st_mtime_ns};".encode()
+            )
+
+        return digest.hexdigest(), files
+
+    @staticmethod
+    def compile(folder: Path, files: List[Path]) -> "LocCatalog":
+        index: Dict[str, str] = {}
+        compiled: Dict[str, Dict[str, Template]] = {}
+
+        # Files are read in sorted order, a later file wins on duplicate keys
+        for file_path in files:
+            namespace = file_path.relative_to(folder).with_suffix("").as_posix()
+            templates = compiled.setdefault(namespace, {})
+            for key, value in parse_loc_file(file_path).items():
+                templates[key] = compile_template(value)
+                index[key] = namespace
+
+        namespaces = {
+            namespace: marshal.dumps(templates)
+            for namespace, templates in compiled.items()
+        }
+        return LocCatalog(index, namespaces)
+
+    @staticmethod
+    def load(folder: Path, cache_path: Path) -> "LocCatalog":
+        """Loads the catalog for `folder`, recompiling it when it is stale."""
+        file_hash, files = LocCatalog.fingerprint(folder)
+
+        if cache_path.exists():
+            try:
+                with open(cache_path, "rb") as file:
+                    data = marshal.load(file)
+
+                if (
+                    data.get("version") == CATALOG_VERSION
+                    and data.get("hash") == file_hash
+                ):
+                    return LocCatalog(data["index"], data["namespaces"])
+
+                logger.debug(f"Localization catalog is stale\n|Path: {cache_path}")
+
+            except Exception as err:
+                logger.warning(
+                    f"Broken localization catalog, rebuilding\n|Error: {err}\n|Path: {cache_path}"
+                )
+
+        catalog = LocCatalog.compile(folder, files)
+        catalog.save(cache_path, file_hash)
+        return catalog
+
+    def save(self, cache_path: Path, file_hash: str) -> None:
+        data = {
+            "version": CATALOG_VERSION,
+            "hash": file_hash,
+            "index": self._index,
+            "namespaces": self._namespaces,
+        }
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as file:
+                marshal.dump(data, file)
+
+            tmp_path.replace(cache_path)
+
+        except Exception as err:
+            logger.error(
+                f"Error writing localization catalog\n|Error: {err}\n|Path: {cache_path}"
+            )
+
+    @property
+    def namespaces(self) -> List[str]:
+        return list(self._namespaces)
+
+    def load_namespace(self, namespace: str) -> None:
+        with self._lock:
+            if namespace in self._loaded:
+                return
+
+            templates: Dict[str, Template] = marshal.loads(self._namespaces[namespace])
+            for key, template in templates.items():
+                # A key defined in several files belongs to the last one
+                if self._index.get(key) == namespace:
+                    self._templates[key] = template
+
+            self._loaded.add(namespace)
+
+    def get(self, key: str) -> Optional[Template]:
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+
+        namespace = self._index.get(key)
+        if namespace is None or namespace in self._loaded:
+            return None
+
+        self.load_namespace(namespace)
+        return self._templates.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+
+def compile_all(localization_root: Path, cache_root: Path) -> None:
+    for folder in sorted(localization_root.iterdir()):
+        if folder.is_dir():
+            LocCatalog.load(folder, cache_root / f"{folder.name}.catalog")
+            print(f"Compiled: {folder.name}")
+
+
+if __name__ == "__main__":
+    # python -m Code.loc.catalog
+    from Code.app_vars import AppConfig
+
+    compile_all(
+        AppConfig.get_data_root_path() / "localization",
+        AppConfig.get_hash_path() / "loc",
+    )
@@ -1,8 +1,16 @@
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from Code.app_vars import AppConfig
 
+from .catalog import (
+    LocCatalog,
+    Template,
+    compile_template,
+    parse_loc_file,
+    template_text,
+)
+
 """
 Пример .loc
 main-app-name={form-apple} {sex-apple} # комментарий
@@ -14,22 +22,44 @@ main-app-name={form-apple} {sex-apple} # комментарий
     .neuter-apple=Оно
 """
 
+_MISSING = object()
+
 
 class Localization:
-    _translations: Dict[str, str] = {}
+    _translations: Dict[str, Template] = {}
+    _catalog: Optional[LocCatalog] = None
 
     @classmethod
     def init(cls) -> None:
-        localization_path = (
-            AppConfig.get_data_root_path()
-            / "localization"
-            / AppConfig.get("lang", "eng")  # type: ignore
-        )
-        cls.load_translations(localization_path)
+        cls.load_language(AppConfig.get("lang", "eng"))  # type: ignore
+
+    @staticmethod
+    def get_catalog_path(lang: str) -> Path:
+        return AppConfig.get_hash_path() / "loc" / f"{lang}.catalog"
+
+    @classmethod
+    def load_language(cls, lang: str, preload: bool = False) -> None:
+        """Подключает скомпилированный каталог языка, пересобирая его при изменении .loc файлов.
+
+        Каталог подменяется одним присваиванием, поэтому метод можно вызывать
+        из фонового потока, пока интерфейс читает строки.
+
+        Args:
+            lang (str): Код языка (имя папки в Data/localization).
+            preload (bool): Сразу распаковать все пространства имён каталога.
+        """
+        localization_path = AppConfig.get_data_root_path() / "localization" / lang
+        catalog = LocCatalog.load(localization_path, cls.get_catalog_path(lang))
+        if preload:
+            for namespace in catalog.namespaces:
+                catalog.load_namespace(namespace)
+
+        cls._catalog = catalog
 
     @classmethod
     def clear_load_translation(cls) -> None:
         cls._translations.clear()
+        cls._catalog = None
 
     @classmethod
     def load_translations(cls, folder_path: str | Path) -> None:
@@ -49,38 +79,16 @@ class Localization:
         Args:
             file_path (Path): Путь к файлу локализации (.loc).
         """
-        with file_path.open("r", encoding="utf-8") as file:
-            current_key: Optional[str] = None
-            for line in file:
-                line = line.strip()
-
-                if "#" in line:
-                    line = cls._remove_comment(line)
+        for key, value in parse_loc_file(file_path).items():
+            cls._translations[key] = compile_template(value)
 
-                if "=" in line and not line.startswith("."):
-                    current_key, value = line.split("=", 1)
-                    cls._translations[current_key.strip()] = value.strip()
-
-                elif line.startswith(".") and current_key:
-                    sub_key, sub_value = line.split("=", 1)
-                    cls._translations[sub_key.strip()] = sub_value.strip()
-
-    @staticmethod
-    def _remove_comment(line: str) -> str:
-        """Удаляет комментарий из строки, если # не экранирован.
-
-        Args:
-            line (str): Строка с возможным комментарием.
-
-        Returns:
-            str: Строка без комментария.
-        """
-        if r"\#" in line:
-            line = line.replace(r"\#", "__TEMP_HASH__")
-
-        line = line.split("#", 1)[0].strip()
+    @classmethod
+    def _get_template(cls, key: str) -> Optional[Template]:
+        template = cls._translations.get(key)
+        if template is None and cls._catalog is not None:
+            template = cls._catalog.get(key)
 
-        return line.replace("__TEMP_HASH__", "#")
+        return template
 
     @staticmethod
     def _select_form(count: int, base_key: str) -> str:
@@ -104,7 +112,7 @@ class Localization:
 
     @classmethod
     def has_string(cls, key: str) -> bool:
-        text = cls._translations.get(key)
+        text = cls._get_template(key)
         if text:
             return True
         return False
@@ -128,27 +136,56 @@ class Localization:
                 key2='custom string'
             )
         """
-        text: str = cls._translations.get(key, f"[Missing key: {key}]")
-
-        for sub_key, value in kwargs.items():
-            if isinstance(value, dict):
-                count: Optional[int] = value.get("count", None)
-                if count is not None:
-                    form_key: str = Localization._select_form(count, sub_key)
-                    form_value: str = cls._translations.get(
-                        form_key, f"[Missing form: {form_key}]"
+        template = cls._get_template(key)
+        if template is None:
+            return f"[Missing key: {key}]"
+
+        if isinstance(template, str):
+            return template
+
+        parts: List[str] = []
+        for segment in template:
+            if isinstance(segment, str):
+                parts.append(segment)
+                continue
+
+            kind, sub_key, raw = segment
+            value = kwargs.get(sub_key, _MISSING)
+            if value is _MISSING:
+                parts.append(raw)
+
+            elif kind == "form":
+                count = value.get("count", None) if isinstance(value, dict) else None
+                if count is None:
+                    parts.append(raw)
+
+                else:
+                    form_key = Localization._select_form(count, sub_key)
+                    form_value = cls._get_template(form_key)
+                    parts.append(
+                        f"[Missing form: {form_key}]"
+                        if form_value is None
+                        else template_text(form_value)
                     )
-                    text = text.replace(f"{{form-{sub_key}}}", form_value)
 
-                gender: Optional[str] = value.get("gender", None)
-                if gender is not None:
-                    gender_key: str = f"{gender}-{sub_key}"
-                    gender_value: str = cls._translations.get(
-                        gender_key, f"[Missing gender: {gender_key}]"
+            elif kind == "sex":
+                gender = value.get("gender", None) if isinstance(value, dict) else None
+                if gender is None:
+                    parts.append(raw)
+
+                else:
+                    gender_key = f"{gender}-{sub_key}"
+                    gender_value = cls._get_template(gender_key)
+                    parts.append(
+                        f"[Missing gender: {gender_key}]"
+                        if gender_value is None
+                        else template_text(gender_value)
                     )
-                    text = text.replace(f"{{sex-{sub_key}}}", gender_value)
+
+            elif isinstance(value, dict):
+                parts.append(raw)
 
             else:
-                text = text.replace(f"{{{sub_key}}}", str(value))
+                parts.append(str(value))
 
-        return text
+        return "".join(parts)
@@ -0,0 +1 @@
+from .log_index import LogHit, LogIndex
@@ -0,0 +1,266 @@
+import logging
+import mmap
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Code.app_vars import AppConfig
+from Code.package import ModUnit
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LogHit:
+    file: Path
+    offset: int
+    line: str
+
+
+@dataclass
+class _FileState:
+    offset: int
+    mtime_ns: int
+    head: bytes
+
+
+class LogIndex:
+    """Indexes error lines of the game's logs and crash reports.
+
+    Files are mapped with mmap and searched for error keywords, only the
+    matching lines are decoded. Every hit is indexed by the mod folder names
+    and content IDs it mentions, so "which mods do these errors point at" is a
+    set of dict lookups against the loaded mods. Files are re-read only from
+    the last indexed offset unless they were truncated or replaced.
+    """
+
+    LOG_PATTERNS = (
+        "crashreport*.log",
+        "*.log",
+        "ConsoleLogs/*.txt",
+        "ServerLogs/*.txt",
+    )
+
+    MAX_LINE_LENGTH = 1000
+    MAX_HITS = 200_000
+
+    # mmap.find is far faster than a case-insensitive regex over the whole
+    # file, so candidate lines are located by the case-stable part of each
+    # keyword and confirmed with `_ERROR_WORD_RE` on the decoded line
+    _KEYWORD_TAILS = (
+        b"rror",
+        b"RROR",
+        b"xception",
+        b"XCEPTION",
+        b"ailed",
+        b"AILED",
+        b"ould not",
+        b"OULD NOT",
+        b"ouldn't",
+        b"OULDN'T",
+        b"nvalid",
+        b"NVALID",
+        b"issing",
+        b"ISSING",
+    )
+    _ERROR_WORD_RE = re.compile(
+        r"error|exception|failed|could not|couldn't|invalid|missing", re.IGNORECASE
+    )
+    # Folder of a mod in LocalMods, WorkshopMods/Installed or the Steam workshop
+    _MOD_DIR_RE = re.compile(
+        r"(?:LocalMods|Installed|602960|%ModDir:)[/\\]?([^/\\\r\n\"'%:]+)",
+        re.IGNORECASE,
+    )
+    _CONTENT_ID_RE = re.compile(
+        r"(?:identifier|id)[\s:=\"']+([\w.\-]+)|\"([\w.\-]+)\"", re.IGNORECASE
+    )
+
+    _lock = threading.Lock()
+    _files: Dict[Path, _FileState] = {}
+    _hits: List[LogHit] = []
+    _by_mod_dir: Dict[str, List[int]] = defaultdict(list)
+    _by_content_id: Dict[str, List[int]] = defaultdict(list)
+
+    @classmethod
+    def find_log_files(cls, game_path: Path) -> List[Path]:
+        files = set()
+        for pattern in cls.LOG_PATTERNS:
+            files.update(path for path in game_path.glob(pattern) if path.is_file())
+
+        return sorted(files)
+
+    @classmethod
+    def refresh(cls, game_path: Optional[Path] = None) -> int:
+        """Indexes new lines of all log files, returns the number of new hits."""
+        game_path = game_path or AppConfig.get_game_path()
+        if game_path is None:
+            return 0
+
+        added = 0
+        with cls._lock:
+            files = cls.find_log_files(game_path)
+            for missing in set(cls._files) - set(files):
+                cls._drop_file(missing)
+
+            for file_path in files:
+                try:
+                    added += cls._index_file(file_path)
+
+                except OSError as err:
+                    logger.warning(f"Failed to read log: {err}\n|Path: {file_path}")
+
+        logger.debug(f"Indexed {added} new log errors")
+        return added
+
+    @classmethod
+    def _index_file(cls, file_path: Path) -> int:
+        stat = file_path.stat()
+        state = cls._files.get(file_path)
+
+        with open(file_path, "rb") as file:
+            head = file.read(64)
+            if state is not None and (
+                stat.st_size < state.offset or not head.startswith(state.head)
+            ):
+                # Truncated or replaced, all hits of the old file are dropped
+                cls._drop_file(file_path)
+                state = None
+
+            if state is not None and state.mtime_ns == stat.st_mtime_ns:
+                return 0
+
+            start = state.offset if state is not None else 0
+            if stat.st_size <= start:
+                return 0
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                # A line still being written is indexed on the next refresh
+                end = view.rfind(b"\n", start) + 1
+                if end <= start:
+                    return 0
+
+                added = cls._scan(file_path, view, start, end)
+
+        cls._files[file_path] = _FileState(end, stat.st_mtime_ns, head[: min(64, end)])
+        return added
+
+    @classmethod
+    def _scan(cls, file_path: Path, view: mmap.mmap, start: int, end: int) -> int:
+        lines = set()
+        for tail in cls._KEYWORD_TAILS:
+            position = view.find(tail, start, end)
+            while position != -1:
+                newline = view.rfind(b"\n", start, position)
+                line_start = newline + 1 if newline != -1 else start
+                line_end = view.find(b"\n", position, end)
+                if line_end == -1:
+                    # Last line of the range without a newline
+                    line_end = end
+
+                lines.add((line_start, line_end))
+                # The rest of the line is already taken
+                position = view.find(tail, line_end, end)
+
+        added = 0
+        for line_start, line_end in sorted(lines):
+            if len(cls._hits) >= cls.MAX_HITS:
+                logger.warning("Log index is full, remaining errors are skipped")
+                break
+
+            line_end = min(line_end, line_start + cls.MAX_LINE_LENGTH)
+            line = view[line_start:line_end].decode("utf-8", "replace").strip()
+            if not cls._ERROR_WORD_RE.search(line):
+                continue
+
+            cls._add_hit(LogHit(file_path, line_start, line))
+            added += 1
+
+        return added
+
+    @classmethod
+    def _add_hit(cls, hit: LogHit) -> None:
+        index = len(cls._hits)
+        cls._hits.append(hit)
+
+        for mod_dir in {name.lower() for name in cls._MOD_DIR_RE.findall(hit.line)}:
+            cls._by_mod_dir[mod_dir].append(index)
+
+        content_ids = {
+            (named or quoted).lower()
+            for named, quoted in cls._CONTENT_ID_RE.findall(hit.line)
+        }
+        for content_id in content_ids:
+            cls._by_content_id[content_id].append(index)
+
+    @classmethod
+    def _drop_file(cls, file_path: Path) -> None:
+        kept = [hit for hit in cls._hits if hit.file != file_path]
+        cls._files.pop(file_path, None)
+        cls._hits = []
+        cls._by_mod_dir.clear()
+        cls._by_content_id.clear()
+        # Re-indexing kept lines is cheap compared to rescanning their files
+        for hit in kept:
+            cls._add_hit(hit)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._files.clear()
+            cls._hits.clear()
+            cls._by_mod_dir.clear()
+            cls._by_content_id.clear()
+
+    @classmethod
+    def referenced_mods(
+        cls, mods: Iterable[ModUnit]
+    ) -> List[Tuple[ModUnit, List[LogHit]]]:
+        """Mods mentioned by indexed errors, most mentioned first.
+
+        A hit counts for a mod when it names the mod's folder or one of the
+        content IDs the mod adds or overrides.
+        """
+        result = []
+        with cls._lock:
+            for mod in mods:
+                indexes = set(cls._by_mod_dir.get(mod.path.name.lower(), ()))
+                for content_id in mod.add_id | mod.override_id:
+                    # Parsed IDs are "prefix.identifier", logs name the identifier
+                    content_id = content_id.lower()
+                    indexes.update(cls._by_content_id.get(content_id, ()))
+                    indexes.update(
+                        cls._by_content_id.get(content_id.split(".", 1)[-1], ())
+                    )
+
+                if indexes:
+                    result.append((mod, [cls._hits[i] for i in sorted(indexes)]))
+
+        result.sort(key=lambda item: len(item[1]), reverse=True)
+        return result
+
+    @classmethod
+    def hits_for_content_id(cls, content_id: str) -> List[LogHit]:
+        with cls._lock:
+            return [
+                cls._hits[i] for i in cls._by_content_id.get(content_id.lower(), ())
+            ]
+
+    @classmethod
+    def search(cls, text: str, limit: int = 500) -> List[LogHit]:
+        text = text.lower()
+        with cls._lock:
+            result = []
+            for hit in cls._hits:
+                if text in hit.line.lower():
+                    result.append(hit)
+                    if len(result) >= limit:
+                        break
+
+            return result
+
+    @classmethod
+    def hit_count(cls) -> int:
+        return len(cls._hits)
@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Set
 
 from Code.app_vars import AppConfig
+from Code.profiler import StartupProfiler
 from Code.xml_object import XMLBuilder
 
 from .id_parser import extract_ids
@@ -185,9 +186,24 @@ class ModUnit(Identifier):
 
     @staticmethod
     def build(path: (Path | str)) -> Optional["ModUnit"]:
-        try:
-            path = Path(path)
+        path = Path(path)
+        with StartupProfiler.span(f"mod:{path.name}", "mod") as span:
+            mod = ModUnit._build(path)
+            if span is not None and mod is not None:
+                span.meta.update(
+                    {
+                        "mod_name": mod.name,
+                        "mod_id": mod.id,
+                        "add_ids": len(mod.add_id),
+                        "override_ids": len(mod.override_id),
+                    }
+                )
+
+            return mod
 
+    @staticmethod
+    def _build(path: Path) -> Optional["ModUnit"]:
+        try:
             obj = ModUnit.create_empty()
 
             if "LocalMods" in path.parts:
@@ -230,7 +246,8 @@ class ModUnit(Identifier):
         if not file_list_path.exists():
             raise ValueError(f"{file_list_path} don't exsist")
 
-        xml_obj = XMLBuilder.load(file_list_path)
+        # Only the root attributes are needed, the file list itself is skipped
+        xml_obj = XMLBuilder.load_header(file_list_path)
         if xml_obj is None:
             raise ValueError(f"{file_list_path} invalid xml struct")
 
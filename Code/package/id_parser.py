@@ -1,6 +1,6 @@
 import logging
 from dataclasses import dataclass
-from typing import List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from Code.xml_object import XMLElement
 
@@ -11,14 +11,31 @@ logger = logging.getLogger(__name__)
 class IDParserUnit:
     add_id: Set[str]
     override_id: Set[str]
+    # ID -> (element, is_override) for every place it is defined, only filled
+    # when requested from `extract_ids`
+    elements: Optional[Dict[str, List[Tuple[XMLElement, bool]]]] = None
 
     @staticmethod
     def create_empty() -> "IDParserUnit":
         return IDParserUnit(set(), set())
 
+    def add(self, content_id: str, is_override: bool, element: XMLElement) -> None:
+        if is_override:
+            self.override_id.add(content_id)
+
+        else:
+            self.add_id.add(content_id)
+
+        if self.elements is not None:
+            self.elements.setdefault(content_id, []).append((element, is_override))
 
-def extract_ids(obj: Optional[XMLElement]) -> IDParserUnit:
+
+def extract_ids(
+    obj: Optional[XMLElement], track_elements: bool = False
+) -> IDParserUnit:
     parsed_ids = IDParserUnit.create_empty()
+    if track_elements:
+        parsed_ids.elements = {}
 
     if not obj or obj.tag.lower() in ["infotext", "infotexts"]:
         return parsed_ids
@@ -63,11 +80,7 @@ def _special_id_rule(name: str):
         id_parser_unit: IDParserUnit,
         current_context: Optional[str],
     ):
-        if is_override:
-            id_parser_unit.override_id.add(name)
-
-        else:
-            id_parser_unit.add_id.add(name)
+        id_parser_unit.add(name, is_override, obj)
 
     return _rule
 
@@ -83,11 +96,7 @@ def _id_rule(prefix: str, id_field: str = "identifier"):
         identifier = obj.attributes.get(id_field, obj.tag)
         full_id = f"{prefix}.{identifier}"
 
-        if is_override:
-            id_parser_unit.override_id.add(full_id)
-
-        else:
-            id_parser_unit.add_id.add(full_id)
+        id_parser_unit.add(full_id, is_override, obj)
 
     return _rule
 
@@ -256,10 +265,7 @@ def _parse_object(
 def _handle_animation(obj: XMLElement, is_override: bool, id_parser_unit: IDParserUnit):
     animation_id = _detect_animation(obj)
     if animation_id:
-        if is_override:
-            id_parser_unit.override_id.add(animation_id)
-        else:
-            id_parser_unit.add_id.add(animation_id)
+        id_parser_unit.add(animation_id, is_override, obj)
 
     else:
         logger.warning(f"No rule found for object: {obj.tag} | {obj.tag.lower()}")
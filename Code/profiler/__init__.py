@@ -0,0 +1 @@
+from .startup_profiler import ProfileSpan, StartupProfiler
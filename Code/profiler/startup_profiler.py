@@ -0,0 +1,216 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Literal, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileSpan:
+    name: str
+    category: str
+    thread: str
+    parent: Optional[int]
+    start: float
+    wall: float = 0.0
+    cpu: float = 0.0
+    process_cpu: float = 0.0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "thread": self.thread,
+            "parent": self.parent,
+            "start": round(self.start, 6),
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "process_cpu": round(self.process_cpu, 6),
+            "meta": self.meta,
+        }
+
+
+class StartupProfiler:
+    """Collects named timing spans while the program starts up.
+
+    Disabled by default: `span` costs a single attribute check until `enable`
+    is called, so instrumentation can stay in hot paths such as `ModUnit.build`.
+    Spans opened in worker threads are attached to the innermost span that is
+    open on the thread which called `enable`.
+    """
+
+    _enabled: bool = False
+    _spans: List[ProfileSpan] = []
+    _lock = threading.Lock()
+    _local = threading.local()
+    _main_stack: List[int] = []
+    _origin: float = 0.0
+    _profile: Optional[Any] = None
+
+    @classmethod
+    def enable(cls, use_cprofile: bool = False) -> None:
+        cls._spans = []
+        cls._main_stack = []
+        cls._local.stack = cls._main_stack
+        cls._origin = time.perf_counter()
+        cls._enabled = True
+
+        if use_cprofile:
+            import cProfile
+
+            cls._profile = cProfile.Profile()
+            cls._profile.enable()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._enabled
+
+    @classmethod
+    def stop(cls) -> None:
+        cls._enabled = False
+        if cls._profile is not None:
+            cls._profile.disable()
+
+    @classmethod
+    def _stack(cls) -> List[int]:
+        stack = getattr(cls._local, "stack", None)
+        if stack is None:
+            stack = cls._local.stack = []
+
+        return stack
+
+    @classmethod
+    @contextmanager
+    def span(
+        cls, name: str, category: str = "phase"
+    ) -> Generator[Optional[ProfileSpan], None, None]:
+        if not cls._enabled:
+            yield None
+            return
+
+        stack = cls._stack()
+        if stack:
+            parent = stack[-1]
+
+        else:
+            parent = cls._main_stack[-1] if cls._main_stack else None
+
+        span = ProfileSpan(
+            name=name,
+            category=category,
+            thread=threading.current_thread().name,
+            parent=parent,
+            start=time.perf_counter() - cls._origin,
+        )
+        with cls._lock:
+            span_index = len(cls._spans)
+            cls._spans.append(span)
+
+        stack.append(span_index)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        process_cpu_start = time.process_time()
+        try:
+            yield span
+
+        finally:
+            span.wall = time.perf_counter() - wall_start
+            span.cpu = time.thread_time() - cpu_start
+            span.process_cpu = time.process_time() - process_cpu_start
+            stack.pop()
+
+    @classmethod
+    def build_report(cls, top_functions: int = 50) -> Dict[str, Any]:
+        with cls._lock:
+            spans = list(cls._spans)
+
+        roots = [span for span in spans if span.parent is None]
+        mods = sorted(
+            (span for span in spans if span.category == "mod"),
+            key=lambda span: span.wall,
+            reverse=True,
+        )
+
+        report: Dict[str, Any] = {
+            "total_wall": round(sum(span.wall for span in roots), 6),
+            "spans": [span.to_dict() for span in spans],
+            "mods": [
+                {"name": span.name, "wall": round(span.wall, 6), **span.meta}
+                for span in mods
+            ],
+        }
+
+        if cls._profile is not None:
+            report["cprofile"] = cls._cprofile_summary(top_functions)
+
+        return report
+
+    @classmethod
+    def _cprofile_summary(cls, limit: int) -> List[Dict[str, Any]]:
+        import pstats
+
+        stats = pstats.Stats(cls._profile)  # type: ignore
+        rows = []
+        for func, (_, ncalls, tottime, cumtime, _) in stats.stats.items():  # type: ignore
+            file_name, line, func_name = func
+            rows.append(
+                {
+                    "function": f"{file_name}:{line}({func_name})",
+                    "calls": ncalls,
+                    "tottime": round(tottime, 6),
+                    "cumtime": round(cumtime, 6),
+                }
+            )
+
+        rows.sort(key=lambda row: row["cumtime"], reverse=True)
+        return rows[:limit]
+
+    @classmethod
+    def build_folded(cls) -> List[str]:
+        """Returns the spans as folded stacks (`a;b;c <self microseconds>`),
+        the input format of flamegraph.pl, speedscope and inferno."""
+        with cls._lock:
+            spans = list(cls._spans)
+
+        child_wall = [0.0] * len(spans)
+        for span in spans:
+            if span.parent is not None and spans[span.parent].thread == span.thread:
+                child_wall[span.parent] += span.wall
+
+        lines = []
+        for index, span in enumerate(spans):
+            names = [span.name.replace(";", ":")]
+            parent = span.parent
+            while parent is not None:
+                names.append(spans[parent].name.replace(";", ":"))
+                parent = spans[parent].parent
+
+            self_time = max(span.wall - child_wall[index], 0.0)
+            lines.append(f"{';'.join(reversed(names))} {int(self_time * 1_000_000)}")
+
+        return lines
+
+    @classmethod
+    def dump(cls, path: Path | str, fmt: Literal["json", "folded"] = "json") -> None:
+        path = Path(path)
+        try:
+            if fmt == "folded":
+                path.write_text("\n".join(cls.build_folded()) + "\n", encoding="utf-8")
+
+            else:
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(cls.build_report(), file, indent=4)
+
+            if cls._profile is not None:
+                cls._profile.dump_stats(str(path.with_suffix(".prof")))
+
+            logger.info(f"Startup profile written\n|Path: {path}")
+
+        except Exception as err:
+            logger.error(f"Error writing startup profile\n|Error: {err}\n|Path: {path}")
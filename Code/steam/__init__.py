@@ -0,0 +1 @@
+from .library import SteamLibrary, WorkshopItem
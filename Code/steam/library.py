@@ -0,0 +1,207 @@
+import logging
+import os
+import platform
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import vdf
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkshopItem:
+    item_id: str
+    size: int
+    time_updated: int
+    manifest: str
+
+
+class SteamLibrary:
+    """Resolves Barotrauma paths from Steam's own bookkeeping files.
+
+    `libraryfolders.vdf` lists every library, `appmanifest_602960.acf` names
+    the install folder and `appworkshop_602960.acf` describes downloaded
+    workshop items, so nothing has to be searched on disk.
+    """
+
+    APP_ID = "602960"
+
+    @staticmethod
+    def roots() -> List[Path]:
+        system = platform.system()
+        home = Path.home()
+
+        if system == "Windows":
+            roots = [
+                Path("C:\\Program Files (x86)\\Steam"),
+                Path("C:\\Program Files\\Steam"),
+            ]
+            registry_root = SteamLibrary._root_from_registry()
+            if registry_root is not None:
+                roots.insert(0, registry_root)
+
+        elif system == "Linux":
+            roots = [
+                home / ".steam" / "steam",
+                home / ".steam" / "root",
+                home / ".local" / "share" / "Steam",
+                home
+                / ".var"
+                / "app"
+                / "com.valvesoftware.Steam"
+                / ".local"
+                / "share"
+                / "Steam",
+                home / "snap" / "steam" / "common" / ".local" / "share" / "Steam",
+            ]
+
+        elif system == "Darwin":
+            roots = [home / "Library" / "Application Support" / "Steam"]
+
+        else:
+            raise RuntimeError("Unknown operating system")
+
+        return SteamLibrary._unique(root for root in roots if root.is_dir())
+
+    @staticmethod
+    def _root_from_registry() -> Optional[Path]:
+        try:
+            import winreg
+
+            with winreg.OpenKey(  # type: ignore
+                winreg.HKEY_CURRENT_USER,  # type: ignore
+                r"Software\Valve\Steam",
+            ) as key:
+                value, _ = winreg.QueryValueEx(key, "SteamPath")  # type: ignore
+                return Path(value)
+
+        except Exception:
+            return None
+
+    @staticmethod
+    def _unique(paths) -> List[Path]:
+        seen = set()
+        result = []
+        for path in paths:
+            key = os.path.normcase(os.path.realpath(path))
+            if key not in seen:
+                seen.add(key)
+                result.append(path)
+
+        return result
+
+    @staticmethod
+    def library_folders() -> List[Path]:
+        """All Steam libraries, the ones that report Barotrauma first."""
+        with_game: List[Path] = []
+        other: List[Path] = []
+
+        for root in SteamLibrary.roots():
+            other.append(root)
+            data = vdf.load(root / "steamapps" / "libraryfolders.vdf")
+            folders = vdf.find(data, "libraryfolders")
+            if not isinstance(folders, dict):
+                continue
+
+            for entry in folders.values():
+                # Old format: "1" "D:\\SteamLibrary", new format: "1" { "path" ... }
+                if isinstance(entry, str):
+                    if os.path.isabs(entry):
+                        other.append(Path(entry))
+
+                    continue
+
+                path = vdf.find(entry, "path")
+                if not isinstance(path, str):
+                    continue
+
+                apps = vdf.find(entry, "apps")
+                if isinstance(apps, dict) and SteamLibrary.APP_ID in apps:
+                    with_game.append(Path(path))
+
+                else:
+                    other.append(Path(path))
+
+        return SteamLibrary._unique(with_game + other)
+
+    @staticmethod
+    def app_library() -> Optional[Path]:
+        for library in SteamLibrary.library_folders():
+            manifest = library / "steamapps" / f"appmanifest_{SteamLibrary.APP_ID}.acf"
+            if manifest.is_file():
+                return library
+
+        return None
+
+    @staticmethod
+    def app_manifest(library: Optional[Path] = None) -> Optional[vdf.VDFNode]:
+        library = library or SteamLibrary.app_library()
+        if library is None:
+            return None
+
+        data = vdf.load(
+            library / "steamapps" / f"appmanifest_{SteamLibrary.APP_ID}.acf"
+        )
+        state = vdf.find(data, "AppState")
+        return state if isinstance(state, dict) else None
+
+    @staticmethod
+    def game_path() -> Optional[Path]:
+        library = SteamLibrary.app_library()
+        if library is None:
+            return None
+
+        install_dir = vdf.find(SteamLibrary.app_manifest(library), "installdir")
+        if not isinstance(install_dir, str):
+            install_dir = "Barotrauma"
+
+        return library / "steamapps" / "common" / install_dir
+
+    @staticmethod
+    def workshop_content_path() -> Optional[Path]:
+        library = SteamLibrary.app_library()
+        if library is None:
+            return None
+
+        return library / "steamapps" / "workshop" / "content" / SteamLibrary.APP_ID
+
+    @staticmethod
+    def workshop_items() -> Dict[str, WorkshopItem]:
+        """Installed workshop items with their size and last update time.
+
+        Both values come from `appworkshop_602960.acf`, so changed items can be
+        detected without walking the mod folders.
+        """
+        library = SteamLibrary.app_library()
+        if library is None:
+            return {}
+
+        data = vdf.load(
+            library
+            / "steamapps"
+            / "workshop"
+            / f"appworkshop_{SteamLibrary.APP_ID}.acf"
+        )
+        installed = vdf.find(data, "AppWorkshop", "WorkshopItemsInstalled")
+        if not isinstance(installed, dict):
+            return {}
+
+        items = {}
+        for item_id, info in installed.items():
+            if not isinstance(info, dict):
+                continue
+
+            try:
+                items[item_id] = WorkshopItem(
+                    item_id=item_id,
+                    size=int(vdf.find(info, "size") or 0),
+                    time_updated=int(vdf.find(info, "timeupdated") or 0),
+                    manifest=str(vdf.find(info, "manifest") or ""),
+                )
+
+            except ValueError:
+                logger.debug(f"Malformed workshop item entry: {item_id}")
+
+        return items
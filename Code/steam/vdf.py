@@ -0,0 +1,127 @@
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+VDFNode = Dict[str, Union[str, "VDFNode"]]
+
+# Quoted string (with escapes), a bare word, braces or a [$CONDITION] suffix
+_TOKEN_RE = re.compile(
+    r'\s+|//[^\n]*|"((?:[^"\\]|\\.)*)"|(\{)|(\})|(\[[^\]]*\])|([^\s{}"\[\]]+)'
+)
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+_ESCAPE_RE = re.compile(r"\\(.)")
+
+
+class VDFError(Exception):
+    pass
+
+
+def _unescape(value: str) -> str:
+    if "\\" not in value:
+        return value
+
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def loads(text: str) -> VDFNode:
+    """Parses Valve's text KeyValues format (.vdf / .acf files).
+
+    Conditional suffixes like `[$WIN32]` are ignored, a repeated key keeps its
+    last value.
+    """
+    root: VDFNode = {}
+    stack = [root]
+    key: Optional[str] = None
+    position = 0
+    length = len(text)
+
+    while position < length:
+        match = _TOKEN_RE.match(text, position)
+        if match is None:
+            raise VDFError(f"Unexpected character at offset {position}")
+
+        position = match.end()
+        quoted, opening, closing, _condition, bare = match.groups()
+
+        if opening:
+            if key is None:
+                raise VDFError(f"Block without key at offset {match.start()}")
+
+            node: VDFNode = {}
+            stack[-1][key] = node
+            stack.append(node)
+            key = None
+
+        elif closing:
+            if len(stack) == 1 or key is not None:
+                raise VDFError(f"Unexpected '}}' at offset {match.start()}")
+
+            stack.pop()
+
+        elif quoted is not None or bare is not None:
+            token = _unescape(quoted) if quoted is not None else bare
+            if key is None:
+                key = token
+
+            else:
+                stack[-1][key] = token
+                key = None
+
+    if len(stack) != 1 or key is not None:
+        raise VDFError("Unexpected end of file")
+
+    return root
+
+
+_cache: Dict[Path, Tuple[int, int, VDFNode]] = {}
+_cache_lock = threading.Lock()
+
+
+def load(path: Path) -> Optional[VDFNode]:
+    """Reads a VDF file, reusing the parsed tree while the file is unchanged."""
+    try:
+        stat = path.stat()
+
+    except OSError:
+        return None
+
+    with _cache_lock:
+        cached = _cache.get(path)
+
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    try:
+        data = loads(path.read_text(encoding="utf-8", errors="replace"))
+
+    except (OSError, VDFError) as err:
+        logger.warning(f"Failed to read VDF file: {err}\n|Path: {path}")
+        return None
+
+    with _cache_lock:
+        _cache[path] = (stat.st_mtime_ns, stat.st_size, data)
+
+    return data
+
+
+def find(node: Any, *keys: str) -> Any:
+    """Case-insensitive lookup of a nested key path, Steam does not keep key case."""
+    for key in keys:
+        if not isinstance(node, dict):
+            return None
+
+        if key in node:
+            node = node[key]
+            continue
+
+        key_lower = key.lower()
+        node = next(
+            (value for name, value in node.items() if name.lower() == key_lower),
+            None,
+        )
+
+    return node
@@ -1,10 +1,33 @@
+import codecs
+import functools
 import logging
+import mmap
+import os
 import re
 from pathlib import Path
-from typing import Dict, Generator, List, Optional, Tuple, Union
+from typing import Callable, Dict, Generator, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r"\s+")
+_ATTRIBUTE_RE = re.compile(r'(\w[\w-]*)\s*=\s*(".*?"|\'.*?\'|\S+)')
+# Indentation written by `XMLElement.dump`, in steps of 4 spaces
+_INDENT_RE = re.compile(r"^(?:    )+", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int = 0) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+def _decode(raw: bytes, encoding: str = "utf-8") -> str:
+    """Decodes like a file opened in text mode, with universal newlines."""
+    text = raw.decode(encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return text
+
 
 class XMLParserException(Exception):
     def __init__(
@@ -33,6 +56,50 @@ class XMLBaseStruct:
     def __init__(self) -> None:
         self.parent: Optional[XMLElement] = None
         self.index: Optional[int] = None
+        # Set for documents loaded with `XMLBuilder.load(..., lossless=True)`:
+        # byte range of the node in the source and its state right after parsing
+        self.span: Optional[Tuple[int, int]] = None
+        self._origin: Optional[tuple] = None
+
+    def _state(self) -> tuple:
+        raise NotImplementedError
+
+    def _children(self) -> tuple:
+        return ()
+
+    def _mark_origin(self) -> None:
+        stack: List[XMLBaseStruct] = [self]
+        while stack:
+            node = stack.pop()
+            node._origin = (node._state(), node._children())
+            stack.extend(node._children())
+
+    def is_modified(self) -> bool:
+        """Whether the node or anything below it changed since it was parsed.
+
+        Nodes that were not parsed in lossless mode always count as modified.
+        """
+        stack: List[XMLBaseStruct] = [self]
+        while stack:
+            node = stack.pop()
+            if node._origin != (node._state(), node._children()):
+                return True
+
+            stack.extend(node._children())
+
+        return False
+
+    def source_text(self) -> Optional[str]:
+        """The original markup of the node, if its document keeps the source."""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+
+        source = getattr(root, "source", None)
+        if self.span is None or source is None:
+            return None
+
+        return _decode(source[self.span[0] : self.span[1]])
 
 
 class XMLComment(XMLBaseStruct):
@@ -46,6 +113,12 @@ class XMLComment(XMLBaseStruct):
         indent_str = "" if single_line else indent_char * indent
         return f"{indent_str}<!-- {self.content} -->"
 
+    def iter_dump(self, *args) -> Generator[str, None, None]:
+        yield self.dump(*args)
+
+    def _state(self) -> tuple:
+        return (self.content,)
+
     def to_element(self) -> "XMLElement":
         xml_obj = XMLElement.build_element(self.content)
         if xml_obj is None:
@@ -54,6 +127,11 @@ class XMLComment(XMLBaseStruct):
                 content=self.content,
             )
 
+        if self.span is not None:
+            # Written back as the commented out text unless it is edited
+            xml_obj._raw = self.content
+            xml_obj._mark_origin()
+
         return xml_obj
 
     def __repr__(self):
@@ -61,18 +139,27 @@ class XMLComment(XMLBaseStruct):
 
 
 class XMLElement(XMLBaseStruct):
+    # Chunks joined per item yielded by `iter_dump`
+    DUMP_BATCH = 1024
+
     def __init__(self, tag: str, attributes: Optional[Dict[str, str]] = None):
         super().__init__()
         self.tag = tag
         self.attributes: Dict[str, str] = attributes if attributes is not None else {}
         self.childrens: List[Union["XMLElement", XMLComment]] = []
         self.content: str = ""
+        # Raw bytes of a losslessly loaded document, kept on the root only
+        self.source: Optional[bytes] = None
+        self._raw: Optional[str] = None
 
     def add_child(self, child: Union["XMLElement", XMLComment]):
         child.parent = self
         child.index = len(self.childrens)
         self.childrens.append(child)
 
+    def clear_childrens(self) -> None:
+        self.childrens.clear()
+
     @property
     def count_of_childrens(self):
         return len(self.childrens)
@@ -93,9 +180,17 @@ class XMLElement(XMLBaseStruct):
         if not isinstance(new_child, (XMLComment, XMLElement)):
             return False
 
+        new_child.parent = self
+        new_child.index = index
         self.childrens[index] = new_child
         return True
 
+    def _state(self) -> tuple:
+        return (self.tag, tuple(self.attributes.items()), self.content)
+
+    def _children(self) -> tuple:
+        return tuple(self.childrens)
+
     def get_attribute_ignore_case(self, key: str, default=None):
         key_lower = key.lower()
         for attr_key, attr_value in self.attributes.items():
@@ -125,44 +220,96 @@ class XMLElement(XMLBaseStruct):
         single_line: bool = False,
         inline_content: bool = False,
     ) -> str:
-        indent_str = "" if single_line else indent_char * indent
-        attrs = " ".join(f'{key}="{value}"' for key, value in self.attributes.items())
-        opening_tag = f"<{self.tag}{(' ' + attrs) if attrs else ''}>"
+        return "".join(self.iter_dump(indent, indent_char, single_line, inline_content))
+
+    def iter_dump(
+        self,
+        indent: int = 0,
+        indent_char: str = " ",
+        single_line: bool = False,
+        inline_content: bool = False,
+    ) -> Generator[str, None, None]:
+        """Yields the output of `dump` in chunks of about `DUMP_BATCH` parts.
+
+        The tree is walked with a stack of child iterators, so nothing is
+        concatenated per level and the depth of the tree does not add to the
+        cost of a node. Only elements with children are pushed, leaves are
+        written as they are reached.
+        """
+        newline = "" if single_line else "\n"
+        parts: List[str] = []
+        write = parts.append
+
+        def open_node(node: XMLElement, level: int) -> bool:
+            """Writes a leaf whole or the opening of a node with children."""
+            indent_str = "" if single_line else indent_char * level
+            attrs = " ".join(
+                f'{key}="{value}"' for key, value in node.attributes.items()
+            )
+            opening_tag = f"<{node.tag}{(' ' + attrs) if attrs else ''}>"
+
+            if not node.childrens and not node.content:
+                write(f"{indent_str}<{node.tag}{(' ' + attrs) if attrs else ''} />")
+                return False
 
-        if not self.childrens and not self.content:
-            return f"{indent_str}<{self.tag}{(' ' + attrs) if attrs else ''} />"
+            if not node.childrens and inline_content and node.content:
+                write(f"{indent_str}{opening_tag}{node.content}</{node.tag}>")
+                return False
 
-        if not self.childrens and inline_content and self.content:
-            return f"{indent_str}{opening_tag}{self.content}</{self.tag}>"
+            if not node.content:
+                write(f"{indent_str}{opening_tag}{newline}")
 
-        result = f"{indent_str}{opening_tag}"
-        if not single_line:
-            result += "\n"
+            elif single_line:
+                write(f"{opening_tag}{node.content}")
 
-        if self.content:
-            content_str = f"{self.content}"
-            if not single_line:
-                content_str = indent_char * (indent + 4) + content_str + "\n"
+            else:
+                content_indent = indent_char * (level + 4)
+                write(f"{indent_str}{opening_tag}\n{content_indent}{node.content}\n")
+
+            # An element with content but no children still gets a closing tag
+            stack.append((iter(node.childrens), level, f"{indent_str}</{node.tag}>"))
+            return True
+
+        # (remaining children, level of the node, closing tag of the node)
+        stack: List[Tuple[Iterator[Union[XMLElement, XMLComment]], int, str]] = []
+        open_node(self, indent)
 
-            result += content_str
+        while stack:
+            if len(parts) >= self.DUMP_BATCH:
+                yield "".join(parts)
+                parts.clear()
 
-        for child in self.childrens:
-            child_str = child.dump(indent + 4, indent_char, single_line, inline_content)
-            if not single_line:
-                child_str += "\n"
+            children, level, closing_tag = stack[-1]
+            child_level = level + 4
+            for child in children:
+                if isinstance(child, XMLComment):
+                    write(child.dump(child_level, indent_char, single_line) + newline)
 
-            result += child_str
+                elif open_node(child, child_level):
+                    # The rest of `children` continues once the child is closed
+                    break
 
-        closing_tag = f"</{self.tag}>"
-        if not single_line:
-            result += indent_char * indent
+                else:
+                    write(newline)
+
+                if len(parts) >= self.DUMP_BATCH:
+                    break
 
-        result += closing_tag
+            else:
+                stack.pop()
+                write(closing_tag)
+                if stack:
+                    write(newline)
 
-        return result
+        if parts:
+            yield "".join(parts)
 
     def to_comment(self) -> XMLComment:
-        element_str = self.dump(single_line=True, inline_content=True)
+        # Lossless documents comment out the element exactly as it was written
+        element_str = self.source_text()
+        if element_str is None:
+            element_str = self.dump(single_line=True, inline_content=True)
+
         return XMLComment(element_str)
 
     @staticmethod
@@ -246,24 +393,9 @@ class XMLElement(XMLBaseStruct):
                         )
 
                     is_self_closing = content[tag_end - 1] == "/"
-                    tag_content = content[tag_start:tag_end].strip()
-                    if is_self_closing:
-                        tag_content = tag_content[:-1].strip()
-
-                    parts = re.split(r"\s+", tag_content, maxsplit=1)
-                    tag_name = parts[0]
-                    attributes = {}
-                    if len(parts) > 1:
-                        attr_str = parts[1]
-                        attr_regex = re.compile(r'(\w[\w-]*)\s*=\s*(".*?"|\'.*?\'|\S+)')
-                        for match in attr_regex.finditer(attr_str):
-                            key, value = match.groups()
-                            if value[0] in "\"'":
-                                value = value[1:-1]
-
-                            attributes[key] = value
-
-                    element = XMLElement(tag_name, attributes)
+                    element = XMLElement._parse_start_tag(
+                        content[tag_start:tag_end], is_self_closing
+                    )
                     if is_self_closing:
                         if stack:
                             stack[-1].add_child(element)
@@ -300,96 +432,348 @@ class XMLElement(XMLBaseStruct):
         return root
 
     @staticmethod
-    def _match_name_and_attributes(
-        element: "XMLElement", pattern: str, exact_match: bool
-    ) -> bool:
+    def _parse_start_tag(tag_content: str, is_self_closing: bool) -> "XMLElement":
+        tag_content = tag_content.strip()
+        if is_self_closing:
+            tag_content = tag_content[:-1].strip()
+
+        parts = _WHITESPACE_RE.split(tag_content, maxsplit=1)
+        tag_name = parts[0]
+        attributes = {}
+        if len(parts) > 1:
+            for match in _ATTRIBUTE_RE.finditer(parts[1]):
+                key, value = match.groups()
+                if value[0] in "\"'":
+                    value = value[1:-1]
+
+                attributes[key] = value
+
+        return XMLElement(tag_name, attributes)
+
+    @staticmethod
+    def build_element_from_bytes(
+        buffer: Union[bytes, mmap.mmap], keep_spans: bool = False
+    ) -> Optional["XMLElement"]:
+        """Same result as `build_element`, parsed straight from UTF-8 bytes.
+
+        Markup characters are ASCII and never part of a multi-byte sequence, so
+        they are searched in the raw buffer and only tag, comment and text
+        slices are decoded. Malformed documents are handed to `build_element`
+        to raise the usual `XMLParserException`.
+
+        With `keep_spans` every node records its byte range and the root keeps
+        the buffer, see `XMLBuilder.save`.
+        """
+        stack: List[XMLElement] = []
+        root = None
+
+        size = len(buffer)
+        i = len(codecs.BOM_UTF8) if buffer[:3] == codecs.BOM_UTF8 else 0
+
+        while i < size:
+            if buffer[i] != 0x3C:  # "<"
+                next_tag_pos = buffer.find(b"<", i)
+                if next_tag_pos == -1:
+                    next_tag_pos = size
+
+                # Whitespace between tags is never decoded
+                if stack and buffer[i:next_tag_pos].strip():
+                    text_content = _decode(buffer[i:next_tag_pos]).strip()
+                    if text_content:
+                        stack[-1].content += text_content
+
+                i = next_tag_pos
+                continue
+
+            marker = buffer[i + 1 : i + 4]
+            if marker[:1] == b"?":
+                pi_end = buffer.find(b"?>", i + 2)
+                if pi_end == -1:
+                    break
+
+                i = pi_end + 2
+
+            elif marker == b"!--":
+                end_comment = buffer.find(b"-->", i + 4)
+                if end_comment == -1:
+                    break
+
+                if stack:
+                    comment_text = _decode(buffer[i + 4 : end_comment])
+                    comment = XMLComment(comment_text.strip())
+                    if keep_spans:
+                        comment.span = (i, end_comment + 3)
+
+                    stack[-1].add_child(comment)
+
+                i = end_comment + 3
+
+            elif marker[:1] == b"/":
+                tag_end = buffer.find(b">", i + 2)
+                if tag_end == -1:
+                    break
+
+                tag_name = _decode(buffer[i + 2 : tag_end]).strip()
+                if not stack or stack[-1].tag != tag_name:
+                    break
+
+                closed_element = stack.pop()
+                if keep_spans:
+                    closed_element.span = (closed_element.span[0], tag_end + 1)  # type: ignore
+
+                if not stack:
+                    root = closed_element
+
+                else:
+                    stack[-1].add_child(closed_element)
+
+                i = tag_end + 1
+
+            else:
+                tag_end = buffer.find(b">", i + 1)
+                if tag_end == -1:
+                    break
+
+                is_self_closing = buffer[tag_end - 1] == 0x2F  # "/"
+                element = XMLElement._parse_start_tag(
+                    _decode(buffer[i + 1 : tag_end]), is_self_closing
+                )
+                if keep_spans:
+                    # The end of an open element is set by its closing tag
+                    element.span = (i, tag_end + 1)
+
+                if is_self_closing:
+                    if stack:
+                        stack[-1].add_child(element)
+
+                    else:
+                        root = element
+
+                else:
+                    stack.append(element)
+
+                i = tag_end + 1
+
+        if i < size or stack:
+            return XMLElement.build_element(_decode(bytes(buffer), "utf-8-sig"))
+
+        if keep_spans and root is not None:
+            root.source = bytes(buffer)
+            root._mark_origin()
+
+        return root
+
+    @staticmethod
+    def build_header_from_bytes(
+        buffer: Union[bytes, mmap.mmap], depth: int = 0
+    ) -> Tuple[Optional["XMLElement"], bool]:
+        """The root element with only the first `depth` levels below it built.
+
+        Scanning stops at the end of the root's start tag for `depth` 0, or at
+        its closing tag otherwise. Deeper elements are skipped without being
+        decoded and closing tags are not checked. The flag tells whether the
+        buffer held everything needed, a document cut off in the middle gives
+        the part read so far.
+        """
+        stack: List[XMLElement] = []
+        root = None
+        # Open elements, built or not
+        level = 0
+
+        size = len(buffer)
+        i = len(codecs.BOM_UTF8) if buffer[:3] == codecs.BOM_UTF8 else 0
+
+        while i < size:
+            if buffer[i] != 0x3C:  # "<"
+                next_tag_pos = buffer.find(b"<", i)
+                if next_tag_pos == -1:
+                    break
+
+                if stack and level == len(stack) and buffer[i:next_tag_pos].strip():
+                    text_content = _decode(buffer[i:next_tag_pos]).strip()
+                    if text_content:
+                        stack[-1].content += text_content
+
+                i = next_tag_pos
+                continue
+
+            marker = buffer[i + 1 : i + 4]
+            if marker[:1] == b"?":
+                pi_end = buffer.find(b"?>", i + 2)
+                if pi_end == -1:
+                    break
+
+                i = pi_end + 2
+
+            elif marker == b"!--":
+                end_comment = buffer.find(b"-->", i + 4)
+                if end_comment == -1:
+                    break
+
+                if stack and level == len(stack) and level <= depth:
+                    comment_text = _decode(buffer[i + 4 : end_comment])
+                    stack[-1].add_child(XMLComment(comment_text.strip()))
+
+                i = end_comment + 3
+
+            elif marker[:1] == b"/":
+                tag_end = buffer.find(b">", i + 2)
+                if tag_end == -1:
+                    break
+
+                level -= 1
+                if level < len(stack):
+                    stack.pop()
+
+                if level <= 0:
+                    return root, True
+
+                i = tag_end + 1
+
+            else:
+                tag_end = buffer.find(b">", i + 1)
+                if tag_end == -1:
+                    break
+
+                is_self_closing = buffer[tag_end - 1] == 0x2F  # "/"
+                if level == len(stack) and level <= depth:
+                    element = XMLElement._parse_start_tag(
+                        _decode(buffer[i + 1 : tag_end]), is_self_closing
+                    )
+                    if stack:
+                        stack[-1].add_child(element)
+
+                    else:
+                        root = element
+                        if depth == 0 or is_self_closing:
+                            return root, True
+
+                    if not is_self_closing:
+                        stack.append(element)
+
+                if not is_self_closing:
+                    level += 1
+
+                i = tag_end + 1
+
+        return root, False
+
+    @staticmethod
+    def _element_matcher(
+        pattern: str, exact_match: bool
+    ) -> Callable[["XMLElement"], bool]:
+        """Matches the tag or an attribute value, prepared once per query."""
         if exact_match:
-            element_name_lower = element.tag.lower()
             pattern_lower = pattern.lower()
-            return element_name_lower == pattern_lower or pattern_lower in (
-                value.lower() for value in element.attributes.values()
-            )
+            # str.lower() never shortens a string, longer values cannot match
+            max_length = len(pattern_lower)
 
-        compiled_pattern = re.compile(pattern, re.IGNORECASE)
-        return compiled_pattern.search(element.tag) is not None or any(
-            compiled_pattern.search(value) for value in element.attributes.values()
-        )
+            def match_exact(element: XMLElement) -> bool:
+                if element.tag.lower() == pattern_lower:
+                    return True
+
+                for value in element.attributes.values():
+                    if len(value) <= max_length and value.lower() == pattern_lower:
+                        return True
+
+                return False
+
+            return match_exact
+
+        search = _compile_pattern(pattern, re.IGNORECASE).search
+
+        def match_pattern(element: XMLElement) -> bool:
+            if search(element.tag) is not None:
+                return True
+
+            for value in element.attributes.values():
+                if search(value) is not None:
+                    return True
+
+            return False
+
+        return match_pattern
 
     @staticmethod
     def _match_comment(text: str, pattern: str, exact_match: bool) -> bool:
         if exact_match:
             return text == pattern
 
-        return re.search(pattern, text) is not None
+        return _compile_pattern(pattern).search(text) is not None
+
+    def _iter_tree(self) -> Generator[Union["XMLElement", XMLComment], None, None]:
+        """The element and everything below it in document order."""
+        yield self
+        stack: List[Iterator[Union[XMLElement, XMLComment]]] = [iter(self.childrens)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if isinstance(child, XMLElement) and child.childrens:
+                    stack.append(iter(child.childrens))
+                    break
+
+            else:
+                stack.pop()
+
+    def _iter_elements(self) -> Generator["XMLElement", None, None]:
+        for node in self._iter_tree():
+            if isinstance(node, XMLElement):
+                yield node
 
     def find(
         self, pattern: str, exact_match: bool = False
     ) -> Generator[Union["XMLElement", "XMLComment"], None, None]:
-        def match_element(element: "XMLElement"):
-            if XMLElement._match_name_and_attributes(element, pattern, exact_match):
-                yield element
-
-            for child in element.childrens:
-                if isinstance(child, XMLElement):
-                    yield from match_element(child)
-
-                elif isinstance(child, XMLComment) and XMLElement._match_comment(
-                    child.content, pattern, exact_match
-                ):
-                    yield child
+        match = XMLElement._element_matcher(pattern, exact_match)
+        for node in self._iter_tree():
+            if isinstance(node, XMLElement):
+                if match(node):
+                    yield node
 
-        yield from match_element(self)
+            elif XMLElement._match_comment(node.content, pattern, exact_match):
+                yield node
 
     def find_only_comments(
         self, pattern: str, exact_match: bool = False
     ) -> Generator["XMLComment", None, None]:
-        def match_element(element: "XMLElement"):
-            for child in element.childrens:
-                if isinstance(child, XMLElement):
-                    yield from match_element(child)
-
-                elif isinstance(child, XMLComment) and XMLElement._match_comment(
-                    child.content, pattern, exact_match
-                ):
-                    yield child
-
-        yield from match_element(self)
+        for node in self._iter_tree():
+            if isinstance(node, XMLComment) and XMLElement._match_comment(
+                node.content, pattern, exact_match
+            ):
+                yield node
 
     def find_only_elements(
         self, pattern: str, exact_match: bool = False
     ) -> Generator["XMLElement", None, None]:
-        def match_element(element: "XMLElement"):
-            if XMLElement._match_name_and_attributes(element, pattern, exact_match):
-                yield element
-
-            for child in element.childrens:
-                if isinstance(child, XMLElement):
-                    yield from match_element(child)
-
-        yield from match_element(self)
+        """Elements whose tag or an attribute value matches `pattern`."""
+        match = XMLElement._element_matcher(pattern, exact_match)
+        for node in self._iter_tree():
+            if isinstance(node, XMLElement) and match(node):
+                yield node
 
     def find_element_after_comment(
         self, pattern: str, exact_match: bool = False
     ) -> Generator["XMLElement", None, None]:
-        def match_element(element: "XMLElement"):
-            previous_was_comment = False
-            for child in element.childrens:
-                if isinstance(child, XMLComment) and XMLElement._match_comment(
-                    child.content, pattern, exact_match
-                ):
-                    previous_was_comment = True
-
-                elif isinstance(child, XMLElement):
-                    if previous_was_comment:
-                        yield child
-                        previous_was_comment = False
+        # (remaining children, whether the previous child was a matching comment)
+        stack: List[List] = [[iter(self.childrens), False]]
+        while stack:
+            frame = stack[-1]
+            for child in frame[0]:
+                if isinstance(child, XMLComment):
+                    frame[1] = XMLElement._match_comment(
+                        child.content, pattern, exact_match
+                    )
+                    continue
 
-                    yield from match_element(child)
+                if frame[1]:
+                    yield child
+                    frame[1] = False
 
-                else:
-                    previous_was_comment = False
+                if child.childrens:
+                    stack.append([iter(child.childrens), False])
+                    break
 
-        yield from match_element(self)
+            else:
+                stack.pop()
 
     def find_between_comments(
         self, comment1: str, comment2: str, exact_match: bool = False
@@ -430,10 +814,59 @@ class XMLElement(XMLBaseStruct):
 
 
 class XMLBuilder:
+    MMAP_THRESHOLD = 256 * 1024
+    HEADER_CHUNK = 4096
+
     @staticmethod
     def load(
-        path: Union[Path, str, None], encoding: str = "utf-8-sig"
+        path: Union[Path, str, None],
+        encoding: str = "utf-8-sig",
+        lossless: bool = False,
+    ) -> Union[XMLElement, None]:
+        """Parses an XML file, None if it is missing or empty.
+
+        `lossless` keeps the source of UTF-8 documents so `save` writes back
+        only the nodes that were changed and leaves the rest byte-identical.
+        """
+        if path is None:
+            return None
+
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        if codecs.lookup(encoding).name not in ("utf-8", "utf-8-sig"):
+            with open(path, "r", encoding=encoding) as file:
+                content = file.read()
+
+            return XMLElement.build_element(content)
+
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return None
+
+            if lossless:
+                return XMLElement.build_element_from_bytes(file.read(), keep_spans=True)
+
+            if size < XMLBuilder.MMAP_THRESHOLD:
+                return XMLElement.build_element_from_bytes(file.read())
+
+            # Large files are parsed from the page cache without a private copy
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return XMLElement.build_element_from_bytes(buffer)
+
+    @staticmethod
+    def load_header(
+        path: Union[Path, str, None], depth: int = 0
     ) -> Union[XMLElement, None]:
+        """Reads only the root element of a UTF-8 file and `depth` levels below.
+
+        Meant for files like filelist.xml where only the root attributes are
+        needed: with `depth` 0 the file is read in small, growing chunks until
+        the root's start tag is complete. Content past the requested levels is
+        not validated, use `load` for that.
+        """
         if path is None:
             return None
 
@@ -441,21 +874,147 @@ class XMLBuilder:
         if not path.exists():
             return None
 
-        with open(path, "r", encoding=encoding) as file:
-            content = file.read()
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return None
+
+            if depth > 0:
+                if size < XMLBuilder.MMAP_THRESHOLD:
+                    return XMLElement.build_header_from_bytes(file.read(), depth)[0]
+
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    return XMLElement.build_header_from_bytes(buffer, depth)[0]
 
-        return XMLElement.build_element(content)
+            buffer = b""
+            chunk_size = XMLBuilder.HEADER_CHUNK
+            while True:
+                chunk = file.read(chunk_size)
+                buffer += chunk
+                root, complete = XMLElement.build_header_from_bytes(buffer)
+                if complete or not chunk:
+                    return root
+
+                # A huge prolog or start tag is read in a few steps, not many
+                chunk_size *= 2
 
     @staticmethod
     def save(
         element: XMLElement, path: Union[Path, str], encoding: str = "utf-8"
     ) -> None:
         path = Path(path)
+        if element.source is not None and element._origin is not None:
+            XMLBuilder._save_spliced(element, path)
+            return
+
         try:
             with open(path, "w", encoding=encoding) as file:
-                file.write(element.dump())
+                file.writelines(element.iter_dump())
+
+        except Exception as err:
+            logger.error(
+                f"Error writing object to file\n|Error:{err}\n|Path: {path}\n|Obj: {element!r}"
+            )
+
+    @staticmethod
+    def _save_spliced(element: XMLElement, path: Path) -> None:
+        """Writes the source of `element` with only the changed nodes replaced.
+
+        A node whose own tag, attributes or content changed, or whose children
+        were added or removed, is re-rendered whole. Children replaced in place,
+        like comment <-> element toggles, are re-rendered one by one. Nothing is
+        written if the document did not change.
+        """
+        source: bytes = element.source  # type: ignore
+        edits: List[Tuple[int, int, XMLBaseStruct]] = []
+
+        stack: List[XMLBaseStruct] = [element]
+        while stack:
+            node = stack.pop()
+            state, children = node._origin  # type: ignore
+            if node._state() != state or len(node._children()) != len(children):
+                edits.append((*node.span, node))  # type: ignore
+                continue
+
+            for new, old in zip(node._children(), children):
+                if new is old:
+                    stack.append(new)
+
+                elif not XMLBuilder._same_structure(new, old):
+                    edits.append((*old.span, new))  # type: ignore
+
+        if not edits:
+            logger.debug(f"XML document is unchanged, not written\n|Path: {path}")
+            return
+
+        newline = "\r\n" if b"\r\n" in source else "\n"
+        edits.sort(key=lambda edit: edit[0])
+
+        chunks = []
+        position = 0
+        for start, end, node in edits:
+            chunks.append(source[position:start])
+            text = XMLBuilder._render(node, source, start)
+            if newline != "\n":
+                text = text.replace("\n", newline)
+
+            chunks.append(text.encode("utf-8"))
+            position = end
+
+        chunks.append(source[position:])
+
+        try:
+            with open(path, "wb") as file:
+                file.writelines(chunks)
 
         except Exception as err:
             logger.error(
                 f"Error writing object to file\n|Error:{err}\n|Path: {path}\n|Obj: {element!r}"
             )
+
+    @staticmethod
+    def _render(node: XMLBaseStruct, source: bytes, start: int) -> str:
+        if isinstance(node, XMLElement) and node._raw is not None:
+            if not node.is_modified():
+                return node._raw
+
+        text = node.dump()  # type: ignore
+        if not isinstance(node, XMLElement) or "\n" not in text:
+            return text
+
+        # Nested lines follow the indentation of the replaced node, with the
+        # step its original children used instead of the 4 spaces of `dump`
+        column = XMLBuilder._column(source, start)
+        step = "    "
+        if node._origin is not None:
+            spans = [child.span for child in node._origin[1] if child.span]
+            if spans:
+                child_column = XMLBuilder._column(source, spans[0][0])
+                if len(child_column) > len(column):
+                    step = child_column[len(column) :]
+
+        if step != "    ":
+            text = _INDENT_RE.sub(lambda match: step * (len(match[0]) // 4), text)
+
+        return text.replace("\n", "\n" + column)
+
+    @staticmethod
+    def _column(source: bytes, start: int) -> str:
+        """Whitespace in front of `start` on its line, empty if there is text."""
+        column = source[source.rfind(b"\n", 0, start) + 1 : start]
+        return _decode(column) if not column.strip() else ""
+
+    @staticmethod
+    def _same_structure(new: XMLBaseStruct, old: XMLBaseStruct) -> bool:
+        """Whether `new` would be written the same as `old` was parsed."""
+        if type(new) is not type(old):
+            return False
+
+        if new._state() != old._state():
+            return False
+
+        new_children, old_children = new._children(), old._children()
+        return len(new_children) == len(old_children) and all(
+            XMLBuilder._same_structure(new_child, old_child)
+            for new_child, old_child in zip(new_children, old_children)
+        )
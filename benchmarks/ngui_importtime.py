@@ -0,0 +1,98 @@
+"""Measures the import cost of the headless (--ngui --pbmt --sg) startup path.
+
+Runs `python -X importtime` on the modules that `main.py` loads before
+`args_no_gui` is called and reports the median total import time and the
+heaviest imports. Exits with code 1 if a GUI, networking or sqlite3 module is
+imported on that path.
+
+Usage:
+    python benchmarks/ngui_importtime.py [--runs N] [--top N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parents[1]
+
+# `import main` runs every module level import of main.py, but not the
+# `__main__` block, so the game is never started by the benchmark.
+IMPORT_SNIPPET = "import main"
+
+# sqlite3 comes with Code.analysis, which only the GUI and --batch need
+FORBIDDEN_MODULES = ("dearpygui", "tkinter", "requests", "urllib3", "sqlite3")
+
+
+def run_once() -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        raise SystemExit(f"Import failed with exit code {result.returncode}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs")
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imports shown")
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    cumulative: Dict[str, List[int]] = {}
+    imported: set = set()
+
+    for _ in range(args.runs):
+        rows = run_once()
+        # Top level imports are the ones without indentation in the name column
+        totals.append(sum(cum for name, _, cum in rows if not name.startswith("  ", 1)))
+        for name, _, cum in rows:
+            module = name.strip()
+            imported.add(module)
+            cumulative.setdefault(module, []).append(cum)
+
+    print(f"Runs: {args.runs}")
+    print(f"Median total import time: {statistics.median(totals) / 1000:.1f} ms")
+    print(f"Min total import time:    {min(totals) / 1000:.1f} ms")
+    print(f"Modules imported:         {len(imported)}")
+    print()
+    print(f"Top {args.top} imports by median cumulative time:")
+
+    heaviest = sorted(
+        cumulative.items(), key=lambda item: statistics.median(item[1]), reverse=True
+    )
+    for module, values in heaviest[: args.top]:
+        print(f"{statistics.median(values) / 1000:10.2f} ms  {module}")
+
+    leaked = sorted(
+        module for module in imported if module.split(".")[0] in FORBIDDEN_MODULES
+    )
+    if leaked:
+        print()
+        print("GUI / network / sqlite3 modules imported on the --ngui path:")
+        for module in leaked:
+            print(f"    {module}")
+
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Compares the streaming XML serializer with the old concatenating one.
+
+Builds a synthetic tree (or loads the given XML files) and times
+`XMLElement.dump`, `XMLBuilder.save` and a copy of the previous recursive
+`result += child_str` implementation. The outputs are checked to be identical.
+
+Usage:
+    python benchmarks/xml_dump.py [--depth N] [--width N] [--runs N] [FILE ...]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from Code.xml_object import XMLBuilder, XMLComment, XMLElement  # noqa: E402
+
+
+def legacy_dump(
+    element: XMLElement,
+    indent: int = 0,
+    indent_char: str = " ",
+    single_line: bool = False,
+    inline_content: bool = False,
+) -> str:
+    indent_str = "" if single_line else indent_char * indent
+    attrs = " ".join(f'{key}="{value}"' for key, value in element.attributes.items())
+    opening_tag = f"<{element.tag}{(' ' + attrs) if attrs else ''}>"
+
+    if not element.childrens and not element.content:
+        return f"{indent_str}<{element.tag}{(' ' + attrs) if attrs else ''} />"
+
+    if not element.childrens and inline_content and element.content:
+        return f"{indent_str}{opening_tag}{element.content}</{element.tag}>"
+
+    result = f"{indent_str}{opening_tag}"
+    if not single_line:
+        result += "\n"
+
+    if element.content:
+        content_str = f"{element.content}"
+        if not single_line:
+            content_str = indent_char * (indent + 4) + content_str + "\n"
+
+        result += content_str
+
+    for child in element.childrens:
+        if isinstance(child, XMLComment):
+            child_str = child.dump(indent + 4, indent_char, single_line)
+
+        else:
+            child_str = legacy_dump(
+                child, indent + 4, indent_char, single_line, inline_content
+            )
+
+        if not single_line:
+            child_str += "\n"
+
+        result += child_str
+
+    closing_tag = f"</{element.tag}>"
+    if not single_line:
+        result += indent_char * indent
+
+    result += closing_tag
+
+    return result
+
+
+def build_tree(depth: int, width: int) -> XMLElement:
+    root = XMLElement("Items", {"name": "benchmark"})
+    level = [root]
+    for depth_index in range(depth):
+        next_level = []
+        for parent in level:
+            for index in range(width):
+                if index % 4 == 0:
+                    parent.add_child(XMLComment(f"comment {depth_index}.{index}"))
+
+                child = XMLElement(
+                    "Item",
+                    {"identifier": f"item_{depth_index}_{index}", "category": "Misc"},
+                )
+                if depth_index == depth - 1:
+                    child.content = "Lorem ipsum dolor sit amet"
+
+                parent.add_child(child)
+                next_level.append(child)
+
+        level = next_level
+
+    return root
+
+
+def measure(func: Callable[[], object], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def save_legacy(element: XMLElement, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(legacy_dump(element))
+
+
+def bench(name: str, element: XMLElement, runs: int) -> None:
+    legacy = legacy_dump(element)
+    if element.dump() != legacy:
+        raise SystemExit(f"{name}: streaming output differs from the legacy output")
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".xml")
+    os.close(fd)
+    try:
+        rows = [
+            ("legacy dump", measure(lambda: legacy_dump(element), runs)),
+            ("dump", measure(element.dump, runs)),
+            ("legacy save", measure(lambda: save_legacy(element, tmp_path), runs)),
+            ("save", measure(lambda: XMLBuilder.save(element, tmp_path), runs)),
+        ]
+
+    finally:
+        os.remove(tmp_path)
+
+    print(f"{name}: {len(legacy) / 1024 / 1024:.2f} MB of XML")
+    for label, seconds in rows:
+        print(f"    {label:<12} {seconds * 1000:10.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--depth", type=int, default=4, help="Synthetic tree depth")
+    parser.add_argument("--width", type=int, default=20, help="Children per node")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("files", nargs="*", help="XML files to benchmark instead")
+    args = parser.parse_args()
+
+    trees: List = []
+    if args.files:
+        for file in args.files:
+            element = XMLBuilder.load(file)
+            if element is not None:
+                trees.append((file, element))
+
+    else:
+        trees.append(
+            (
+                f"synthetic depth={args.depth} width={args.width}",
+                build_tree(args.depth, args.width),
+            )
+        )
+        # A deep chain shows the per-level copies of the old implementation
+        chain = root = XMLElement("Chain")
+        for index in range(400):
+            child = XMLElement("Link", {"index": str(index)})
+            child.content = "x" * 200
+            chain.add_child(child)
+            chain = child
+
+        trees.append(("deep chain of 400 elements", root))
+
+    for name, element in trees:
+        bench(name, element, args.runs)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
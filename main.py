@@ -1,23 +1,24 @@
 import argparse
+import json
 import logging
 import os
 import platform
 import sys
-from tkinter import Tk, messagebox
 from traceback import TracebackException
-from typing import Any, Type
+from typing import Any, List, Optional, Type
 
 from colorama import Fore, Style, init
 
-from Code.app import App
-from Code.app.app_initializer import AppInitializer
 from Code.app_vars import AppConfig
-from Code.game import Game
+from Code.game import Game, GameLauncher
 from Code.handlers import ModManager
 from Code.loc import Localization as loc
+from Code.profiler import StartupProfiler
 
 
 def show_error_message(title, message):
+    from tkinter import Tk, messagebox
+
     root = Tk()
     root.withdraw()
     messagebox.showerror(title, message)
@@ -56,9 +57,11 @@ def initialize_components(debug: bool, *components: Type[Any]) -> None:
         logging.debug(f"Initializing {component.__name__}...")
         init_method = getattr(component, "init", None)
         if callable(init_method):
-            init_method(
-                debug
-            ) if "debug" in init_method.__code__.co_varnames else init_method()
+            with StartupProfiler.span(f"{component.__name__}.init"):
+                init_method(
+                    debug
+                ) if "debug" in init_method.__code__.co_varnames else init_method()
+
             logging.debug(f"{component.__name__} initialized successfully.")
 
         else:
@@ -92,16 +95,50 @@ def args_no_gui(
         Game.download_update_lua()
 
     if process_btm:
+        if not ModManager.active_mods and not ModManager.inactive_mods:
+            ModManager.load_mods()
+
         ModManager.save_mods()
 
-    if start_game:
-        Game.run_game(skip_intro=skip_intro)
+    if start_game and Game.run_game(skip_intro=skip_intro):
+        # Toggle rollback runs when the game exits, keep the process alive until then
+        GameLauncher.wait()
+
+
+def args_batch(commands: List[str], output: Optional[str]) -> int:
+    from Code.cli import HeadlessCommands
+
+    exit_code, report = HeadlessCommands.run(commands)
+    report_str = json.dumps(report, indent=4, ensure_ascii=False)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(report_str)
 
+    else:
+        print(report_str)
+
+    return exit_code
+
+
+def dump_startup_profile(path: Optional[str], fmt: str) -> None:
+    if path is None or not StartupProfiler.is_enabled():
+        return
+
+    StartupProfiler.stop()
+    StartupProfiler.dump(path, fmt)  # type: ignore
+
+
+def main(debug: bool, profile_path: Optional[str], profile_format: str) -> None:
+    # GUI modules pull in dearpygui, so they are imported only when the GUI runs
+    with StartupProfiler.span("import Code.app"):
+        from Code.app import App
+        from Code.app.app_initializer import AppInitializer
 
-def main(debug: bool) -> None:
     logging.debug("Starting program...")
     initialize_components(debug, AppConfig, loc, ModManager, AppInitializer)
     logging.debug("Initialization complete. Program is ready to run.")
+    dump_startup_profile(profile_path, profile_format)
 
     logging.debug("App instance created. Running app...")
     App.run()
@@ -138,8 +175,50 @@ if __name__ == "__main__":
             action="store_true",
             help="Enables processing of modifications to accept the work of disabled modules",
         )
+        parser.add_argument(
+            "--batch",
+            nargs="+",
+            choices=[
+                "load",
+                "sort",
+                "diagnose",
+                "filelists",
+                "apply",
+                "logs",
+                "overlaps",
+            ],
+            metavar="CMD",
+            help="Run headless mod commands (load, sort, diagnose, filelists, apply, logs, overlaps) in order and print a JSON report. load always runs first, each command runs once",
+        )
+        parser.add_argument(
+            "--output",
+            metavar="PATH",
+            help="Write the --batch JSON report to PATH instead of stdout",
+        )
+        parser.add_argument(
+            "--profile-startup",
+            nargs="?",
+            const="startup_profile.json",
+            default=None,
+            metavar="PATH",
+            help="Record startup phase timings and write a report to PATH",
+        )
+        parser.add_argument(
+            "--profile-format",
+            choices=["json", "folded"],
+            default="json",
+            help="Startup report format: JSON or flamegraph folded stacks",
+        )
+        parser.add_argument(
+            "--profile-cprofile",
+            action="store_true",
+            help="Also run cProfile during startup. Doesn't work without --profile-startup",
+        )
         args = parser.parse_args()
 
+        if args.profile_startup:
+            StartupProfiler.enable(args.profile_cprofile)
+
         configure_logging(args.debug)
 
         platform_name = platform.system()
@@ -153,11 +232,23 @@ if __name__ == "__main__":
             )
         del platform_name
 
-        if args.ngui:
-            args_no_gui(args.sg, args.apath, args.alua, args.si, args.pbmt)
+        if args.batch:
+            initialize_components(args.debug, AppConfig, loc)
+            with StartupProfiler.span("args_batch"):
+                exit_code = args_batch(args.batch, args.output)
+
+            dump_startup_profile(args.profile_startup, args.profile_format)
+            sys.exit(exit_code)
+
+        elif args.ngui:
+            initialize_components(args.debug, AppConfig, loc)
+            with StartupProfiler.span("args_no_gui"):
+                args_no_gui(args.sg, args.apath, args.alua, args.si, args.pbmt)
+
+            dump_startup_profile(args.profile_startup, args.profile_format)
 
         else:
-            main(args.debug)
+            main(args.debug, args.profile_startup, args.profile_format)
 
     except Exception:
         exc_type, exc_value, exc_tb = sys.exc_info()
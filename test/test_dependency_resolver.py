@@ -0,0 +1,76 @@
+"""
+DependencyResolver: conditional requirements give the same closure whatever
+order the selected mods are in.
+
+Run with: python -m pytest test/test_dependency_resolver.py (or python -m unittest)
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Code.handlers.dependency_resolver import DependencyResolver  # noqa: E402
+from Code.package.dataclasses import Dependencie, ModUnit  # noqa: E402
+
+
+def make_mods(
+    requirements: Dict[str, List[Tuple[str, Optional[str]]]],
+) -> List[ModUnit]:
+    mods = []
+    for name, requires in requirements.items():
+        mod = ModUnit.create_empty()
+        mod.name = name
+        mod.metadata.dependencies = [
+            Dependencie(dep_id, None, "requirement", {}, condition)
+            for dep_id, condition in requires
+        ]
+        mods.append(mod)
+
+    return mods
+
+
+class DependencyResolverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mods = make_mods(
+            {
+                "O": [("X", "ifhas(A)|ifhas(B)")],
+                "R": [("B", None)],
+                "A": [],
+                "B": [],
+                "X": [],
+            }
+        )
+
+    def test_condition_met_by_later_mod(self) -> None:
+        for order in (["O", "R"], ["R", "O"]):
+            with self.subTest(order=order):
+                resolution = DependencyResolver(self.mods).resolve(order)
+                self.assertEqual(sorted(resolution.activate), ["B", "X"])
+                self.assertTrue(resolution.ok)
+
+    def test_condition_not_met(self) -> None:
+        resolution = DependencyResolver(self.mods).resolve(["O"])
+        self.assertEqual(resolution.activate, [])
+
+    def test_all_conditions_needed(self) -> None:
+        mods = make_mods(
+            {
+                "O": [("X", "ifhas(A)&ifhas(B)")],
+                "R": [("B", None)],
+                "A": [],
+                "B": [],
+                "X": [],
+            }
+        )
+        for order in (["O", "R"], ["R", "O"], ["O", "R", "A"], ["A", "O", "R"]):
+            with self.subTest(order=order):
+                resolution = DependencyResolver(mods).resolve(order)
+                expected = ["B", "X"] if "A" in order else ["B"]
+                self.assertEqual(sorted(resolution.activate), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
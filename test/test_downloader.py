@@ -0,0 +1,200 @@
+"""
+Downloader against a local HTTP server: full download, 304 revalidation,
+resume after a dropped connection and restart when the part file is stale.
+
+Run with: python -m pytest test/test_downloader.py (or python -m unittest)
+"""
+
+import hashlib
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from Code.app_vars import AppConfig  # noqa: E402
+from Code.game import downloader  # noqa: E402
+from Code.game.downloader import Downloader  # noqa: E402
+
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # Set by the tests, shared by every request
+    content = b""
+    etag = '"v1"'
+    # Bytes of the body sent before the next full response is cut off
+    drop_after = None
+    # Answer range requests with 416
+    reject_ranges = False
+    # Answer range requests from the start of the file, still with 206
+    ignore_range_start = False
+    requests = []
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        cls = type(self)
+        cls.requests.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == cls.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        content = cls.content
+        range_header = self.headers.get("Range")
+        if range_header and cls.reject_ranges:
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{len(content)}")
+            self.end_headers()
+            return
+
+        if range_header and self.headers.get("If-Range") == cls.etag:
+            offset = int(range_header.split("=")[1].rstrip("-"))
+            if cls.ignore_range_start:
+                offset = 0
+
+            body = content[offset:]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {offset}-{len(content) - 1}/{len(content)}"
+            )
+
+        else:
+            body = content
+            self.send_response(200)
+
+        self.send_header("ETag", cls.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if cls.drop_after is not None:
+            self.wfile.write(body[: cls.drop_after])
+            self.wfile.flush()
+            cls.drop_after = None
+            self.close_connection = True
+            return
+
+        self.wfile.write(body)
+
+
+class DownloaderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/file.bin"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_path = Path(self.tmp.name)
+        self.path = tmp_path / "out" / "file.bin"
+
+        patches = (
+            mock.patch.object(
+                AppConfig, "get_hash_path", return_value=tmp_path / "hash"
+            ),
+            # Retries back off for seconds otherwise
+            mock.patch.object(downloader.time, "sleep"),
+        )
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        FixtureHandler.content = bytes(range(256)) * 4096  # 1 MiB
+        FixtureHandler.etag = '"v1"'
+        FixtureHandler.drop_after = None
+        FixtureHandler.reject_ranges = False
+        FixtureHandler.ignore_range_start = False
+        FixtureHandler.requests = []
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def assert_downloaded(self, result, content: bytes) -> None:
+        self.assertEqual(result.status, "downloaded")
+        self.assertEqual(self.path.read_bytes(), content)
+        self.assertEqual(result.size, len(content))
+        self.assertEqual(result.sha256, hashlib.sha256(content).hexdigest())
+        self.assertFalse(self.path.with_name(self.path.name + ".part").exists())
+
+    def test_full_download(self) -> None:
+        progress = []
+        result = Downloader.download(
+            self.url, self.path, lambda done, total: progress.append((done, total))
+        )
+
+        self.assert_downloaded(result, FixtureHandler.content)
+        total = len(FixtureHandler.content)
+        self.assertEqual(progress[0], (0, total))
+        self.assertEqual(progress[-1], (total, total))
+        self.assertEqual(FixtureHandler.requests[0].get("Accept-Encoding"), "identity")
+
+    def test_not_modified(self) -> None:
+        Downloader.download(self.url, self.path)
+        result = Downloader.download(self.url, self.path)
+
+        self.assertEqual(result.status, "not_modified")
+        self.assertEqual(
+            result.sha256, hashlib.sha256(FixtureHandler.content).hexdigest()
+        )
+        headers = FixtureHandler.requests[-1]
+        self.assertEqual(headers.get("If-None-Match"), '"v1"')
+        self.assertEqual(headers.get("If-Modified-Since"), LAST_MODIFIED)
+
+    def test_resume_after_drop(self) -> None:
+        FixtureHandler.drop_after = 300_000
+        result = Downloader.download(self.url, self.path)
+
+        self.assert_downloaded(result, FixtureHandler.content)
+        self.assertEqual(len(FixtureHandler.requests), 2)
+        resumed = FixtureHandler.requests[1]
+        self.assertEqual(resumed.get("Range"), "bytes=300000-")
+        self.assertEqual(resumed.get("If-Range"), '"v1"')
+
+    def test_restart_on_416(self) -> None:
+        FixtureHandler.drop_after = 300_000
+        FixtureHandler.reject_ranges = True
+        result = Downloader.download(self.url, self.path)
+
+        self.assert_downloaded(result, FixtureHandler.content)
+        ranges = [headers.get("Range") for headers in FixtureHandler.requests]
+        self.assertEqual(ranges, [None, "bytes=300000-", None])
+
+    def test_restart_on_wrong_range(self) -> None:
+        FixtureHandler.drop_after = 300_000
+        FixtureHandler.ignore_range_start = True
+        result = Downloader.download(self.url, self.path)
+
+        self.assert_downloaded(result, FixtureHandler.content)
+        ranges = [headers.get("Range") for headers in FixtureHandler.requests]
+        self.assertEqual(ranges, [None, "bytes=300000-", None])
+
+    def test_restart_on_changed_validator(self) -> None:
+        FixtureHandler.drop_after = 300_000
+        with mock.patch.object(Downloader, "RETRIES", 1):
+            self.assertEqual(Downloader.download(self.url, self.path).status, "failed")
+
+        # Remote file changed, If-Range no longer matches and 200 comes back
+        FixtureHandler.etag = '"v2"'
+        FixtureHandler.content = bytes(reversed(FixtureHandler.content))
+        result = Downloader.download(self.url, self.path)
+
+        self.assert_downloaded(result, FixtureHandler.content)
+        self.assertEqual(FixtureHandler.requests[-1].get("If-Range"), '"v1"')
+
+
+if __name__ == "__main__":
+    unittest.main()